@@ -1,24 +1,46 @@
+from phichartsearch.startup import lazy_import, timer as startup_timer
+# 只在主进程中统计导入耗时；进程池子进程会以 __mp_main__ 的名称重新执行本文件
+if __name__ == '__main__':
+    startup_timer.begin()
 import json
 import os
-import random
-import string
 import shutil
 import subprocess
-import tkinter as tk
-from tkinter import *
-from tkinter import ttk
-from tkinter import messagebox
-from tkinter import filedialog
-from PIL import Image, ImageDraw, ImageFont, ImageTk
-import wave
-import contextlib
-import sv_ttk
-import zipfile
+import threading
+import multiprocessing
+from phichartsearch.align import ALIGN_CANDIDATES, align_audio
+from phichartsearch.art import BUNDLED_FONT, create_chart_art
+from phichartsearch.chart import PARSER_MODES, analyseJsonChart, parser_description
+from phichartsearch.audio import is_audio_file, iter_batches, scan_audio
+from phichartsearch.engine import analyse_charts
+from phichartsearch.fileindex import chart_candidates
+from phichartsearch.index import AudioIndex, ChartIndex
+from phichartsearch.jsonbackend import BACKENDS
+from phichartsearch.progress import ProgressReporter
+from phichartsearch.project import create_info_txt, read_info_txt, update_info_txt
+from phichartsearch.scoring import PAGE_SIZE, RESULT_LIMIT, AudioLibrary, ChartLibrary, ResultPages, TopK, apply_alignment, audio_score
+from phichartsearch.watch import ProjectRegistry
+
+# 只在预览曲绘和打包工程时使用的模块，延迟到第一次使用时导入
+Image = lazy_import("PIL.Image")
+ImageTk = lazy_import("PIL.ImageTk")
+zipfile = lazy_import("zipfile")
 
 # 配置文件路径
 CONFIG_FILE = "chart_analyzer_config.json"
 # 程序文件夹配置
 program_folder = ""
+# 谱面分析进程数（0 表示使用全部CPU核心）
+analysis_workers = 0
+# 谱面解析模式（full 完整加载 / stream 流式扫描）
+chart_parser = "full"
+# JSON 解析后端（auto 自动选择已安装的最快后端）
+json_backend = "auto"
+# 搜索结果最多保留的数量和每页显示的数量
+result_limit = RESULT_LIMIT
+page_size = PAGE_SIZE
+# 工程列表的后台监视（程序文件夹变化时重新创建）
+project_registry = None
 # 当前打开的窗口
 current_windows = {
     'projects': {},  # 工程窗口
@@ -28,13 +50,23 @@ current_windows = {
 
 def load_config():
     """加载配置文件"""
-    global program_folder
+    global program_folder, analysis_workers, chart_parser, json_backend, result_limit, page_size
     try:
         if os.path.exists(CONFIG_FILE):
             with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
                 config = json.load(f)
                 if 'program_folder' in config and config['program_folder']:
                     program_folder = config['program_folder']
+                if isinstance(config.get('analysis_workers'), int):
+                    analysis_workers = config['analysis_workers']
+                if config.get('chart_parser') in PARSER_MODES:
+                    chart_parser = config['chart_parser']
+                if config.get('json_backend') in ('auto',) + BACKENDS:
+                    json_backend = config['json_backend']
+                if isinstance(config.get('result_limit'), int) and config['result_limit'] > 0:
+                    result_limit = config['result_limit']
+                if isinstance(config.get('page_size'), int) and config['page_size'] > 0:
+                    page_size = config['page_size']
                 return True
     except (json.JSONDecodeError, IOError) as e:
         print(f"加载配置文件失败: {e}")
@@ -43,153 +75,12 @@ def load_config():
 def save_config():
     """保存配置文件"""
     try:
-        config = {'program_folder': program_folder}
+        config = {'program_folder': program_folder, 'analysis_workers': analysis_workers, 'chart_parser': chart_parser, 'json_backend': json_backend, 'result_limit': result_limit, 'page_size': page_size}
         with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
     except IOError as e:
         print(f"保存配置文件失败: {e}")
 
-def generate_random_path():
-    """生成8位随机数字作为Path"""
-    return ''.join(random.choices(string.digits, k=8))
-
-def create_info_txt(project_folder, project_name):
-    """创建info.txt文件"""
-    path_value = generate_random_path()
-    info_content = f"""#
-Name: {project_name}
-Path: {path_value}
-Chart: {path_value}.json
-Level: 
-Composer: PhiChartSearch
-Charter: PhiChartSearch
-"""
-    info_path = os.path.join(project_folder, "info.txt")
-    with open(info_path, 'w', encoding='utf-8') as f:
-        f.write(info_content)
-    return path_value
-
-def read_info_txt(project_folder):
-    """读取info.txt文件"""
-    info_path = os.path.join(project_folder, "info.txt")
-    if not os.path.exists(info_path):
-        return None
-    
-    project_info = {}
-    with open(info_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if ':' in line and not line.startswith('#'):
-                key, value = line.split(':', 1)
-                project_info[key.strip()] = value.strip()
-    return project_info
-
-def update_info_txt(project_folder, project_info):
-    """更新info.txt文件"""
-    info_content = f"""#
-Name: {project_info['Name']}
-Path: {project_info['Path']}
-Chart: {project_info['Chart']}
-Level: {project_info['Level']}
-Composer: {project_info['Composer']}
-Charter: {project_info['Charter']}
-"""
-    info_path = os.path.join(project_folder, "info.txt")
-    with open(info_path, 'w', encoding='utf-8') as f:
-        f.write(info_content)
-
-def get_audio_duration(audio_path):
-    """获取音频时长（秒）"""
-    try:
-        with contextlib.closing(wave.open(audio_path, 'r')) as f:
-            frames = f.getnframes()
-            rate = f.getframerate()
-            duration = frames / float(rate)
-            return round(duration, 2)
-    except:
-        return None
-
-def create_chart_art(project_folder, project_name, project_level, path_value, font_path=None):
-    """创建曲绘图片"""
-    try:
-        # 图片尺寸 (16:9)
-        width = 1920
-        height = 1080
-        
-        # 创建白色背景图片
-        image = Image.new('RGB', (width, height), 'white')
-        draw = ImageDraw.Draw(image)
-        
-        # 选择字体
-        if font_path and os.path.exists(font_path):
-            try:
-                title_font = ImageFont.truetype(font_path, 160)
-                level_font = ImageFont.truetype(font_path, 80)
-            except:
-                font_path = "Source Han Sans & Saira Hybrid-Regular #2934.ttf"
-        
-        # 默认字体路径
-        if not font_path or not os.path.exists(font_path):
-            font_path = "Source Han Sans & Saira Hybrid-Regular #2934.ttf"
-        
-        try:
-            title_font = ImageFont.truetype(font_path, 160)
-            level_font = ImageFont.truetype(font_path, 80)
-        except:
-            # 如果字体加载失败，使用默认字体
-            title_font = ImageFont.load_default()
-            level_font = ImageFont.load_default()
-        
-        # 获取文本尺寸
-        title_bbox = draw.textbbox((0, 0), project_name, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        title_height = title_bbox[3] - title_bbox[1]
-        
-        level_bbox = draw.textbbox((0, 0), project_level, font=level_font)
-        level_width = level_bbox[2] - level_bbox[0]
-        level_height = level_bbox[3] - level_bbox[1]
-        
-        # 计算居中位置
-        title_x = (width - title_width) // 2
-        title_y = (height - title_height) // 2
-        
-        # 计算难度位置（右下角偏左上）
-        level_x = width - level_width - 100  # 距离右边100像素
-        level_y = height - level_height - 100  # 距离底部100像素
-        
-        # 绘制文本
-        draw.text((title_x, title_y), project_name, font=title_font, fill='black')
-        draw.text((level_x, level_y), project_level, font=level_font, fill='black')
-        
-        # 保存图片
-        image_path = os.path.join(project_folder, f"{path_value}.png")
-        image.save(image_path)
-        
-        return True
-    except Exception as e:
-        print(f"创建曲绘图片失败: {e}")
-        return False
-
-def scan_projects():
-    """扫描程序文件夹中的所有工程"""
-    projects = []
-    if not program_folder or not os.path.exists(program_folder):
-        return projects
-    
-    for item in os.listdir(program_folder):
-        item_path = os.path.join(program_folder, item)
-        if os.path.isdir(item_path):
-            info_path = os.path.join(item_path, "info.txt")
-            if os.path.exists(info_path):
-                project_info = read_info_txt(item_path)
-                if project_info:
-                    projects.append({
-                        'name': item,
-                        'folder': item_path,
-                        'info': project_info
-                    })
-    return projects
-
 def create_project():
     """创建新工程"""
     create_window = Toplevel(top)
@@ -293,14 +184,14 @@ def create_project():
         # 如果勾选了自创建曲绘，则生成图片
         if var_create_art.get():
             font_path = E_font.get().strip() if E_font.get().strip() else None
-            if create_chart_art(project_folder, project_name, level, path_value, font_path):
+            if create_chart_art(project_folder, project_name, level, path_value, font_path, BUNDLED_FONT):
                 messagebox.showinfo("成功", "曲绘图片创建成功！")
             else:
                 messagebox.showwarning("警告", "曲绘图片创建失败，但工程已创建。")
         
         messagebox.showinfo("成功", "工程创建成功！")
         create_window.destroy()
-        refresh_project_list()
+        update_project_list(project_name)
         
         # 自动打开新创建的工程
         open_project(project_name)
@@ -409,7 +300,7 @@ def open_project_window(project_name, project_folder, project_info):
             # 查找音频文件
             audio_file = None
             for f in os.listdir(project_folder) if os.path.exists(project_folder) else []:
-                if f.lower().endswith('.wav'):
+                if is_audio_file(f):
                     audio_file = f
                     break
             file_path = os.path.join(project_folder, audio_file) if audio_file else ""
@@ -553,6 +444,52 @@ def modify_info(project_folder, project_info, project_name, parent_window):
     
     main_frame.columnconfigure(1, weight=1)
 
+def create_page_options(parent):
+    """创建结果上限和每页数量的输入框，修改后保存到配置文件"""
+    frame = ttk.Frame(parent)
+    limit_var = tk.StringVar(value=str(result_limit))
+    page_var = tk.StringVar(value=str(page_size))
+    
+    def save_options(*args):
+        global result_limit, page_size
+        try:
+            limit = int(limit_var.get())
+            size = int(page_var.get())
+        except ValueError:
+            return
+        if limit > 0 and size > 0:
+            result_limit = limit
+            page_size = size
+            save_config()
+    
+    ttk.Label(frame, text="结果上限").pack(side=LEFT, padx=(0, 5))
+    ttk.Spinbox(frame, from_=10, to=100000, increment=100, width=8, textvariable=limit_var).pack(side=LEFT, padx=(0, 15))
+    ttk.Label(frame, text="每页").pack(side=LEFT, padx=(0, 5))
+    ttk.Spinbox(frame, from_=10, to=1000, increment=10, width=6, textvariable=page_var).pack(side=LEFT)
+    limit_var.trace_add("write", save_options)
+    page_var.trace_add("write", save_options)
+    return frame
+
+def chart_row_values(chart):
+    """谱面搜索结果表格中一行的内容"""
+    return (chart.fileName, chart.objectNumber, chart.bpm, chart.audioLength, f"{chart.sortingScore / 30:.2%}")
+
+def audio_row_values(audio_obj):
+    """音频搜索结果表格中一行的内容"""
+    bpm = f"{audio_obj.bpm:g}" if audio_obj.bpm else "-"
+    # 谱面对齐：相关系数和音频相对谱面的偏移
+    alignment = f"{audio_obj.alignment[0]:.2f}（{audio_obj.alignment[1]:+.2f}s）" if audio_obj.alignment else "-"
+    return (audio_obj.fileName, audio_obj.duration, bpm, alignment, f"{audio_obj.sortingScore / 10:.2%}")
+
+def show_next_page(tree, status_label, row_values):
+    """从已排好序的结果中继续加载下一页，不重新计算匹配度"""
+    pages = getattr(tree, 'result_pages', None)
+    if pages is None:
+        return
+    for result in pages.next_page():
+        tree.insert("", "end", values=row_values(result))
+    status_label.config(text=pages.describe())
+
 def open_chart_search_window(project_folder, project_info, project_name, parent_window):
     """打开谱面搜索窗口"""
     search_window = Toplevel(parent_window)
@@ -621,6 +558,10 @@ def open_chart_search_window(project_folder, project_info, project_name, parent_
     B2 = ttk.Button(filter_frame, text="开始筛选", command=lambda: search_charts(E1, E2, E3, E4, E5, T1, BL1, search_window, project_folder, project_info, project_name, parent_window), style="Accent.TButton")
     B2.grid(row=0, column=4, rowspan=2, padx=(15, 0))
     
+    # 结果数量
+    page_options = create_page_options(filter_frame)
+    page_options.grid(row=2, column=0, columnspan=4, sticky=W, pady=(10, 0))
+    
     # 谱面列表
     list_frame = ttk.LabelFrame(main_frame, text="搜索结果", padding="10")
     list_frame.grid(row=5, column=0, columnspan=5, sticky=(W, E, N, S), pady=10)
@@ -680,6 +621,9 @@ def open_chart_search_window(project_folder, project_info, project_name, parent_
         except Exception as e:
             messagebox.showerror("错误", f"添加谱面失败：{str(e)}")
     
+    B_next = ttk.Button(button_frame, text="加载下一页", command=lambda: show_next_page(T1, BL1, chart_row_values))
+    B_next.pack(side=LEFT, padx=(0, 10))
+    
     B_add = ttk.Button(button_frame, text="添加到工程", command=add_chart, style="Accent.TButton")
     B_add.pack(side=LEFT, padx=(0, 10))
     
@@ -703,77 +647,6 @@ def open_chart_search_window(project_folder, project_info, project_name, parent_
     main_frame.columnconfigure(0, weight=1)
     main_frame.rowconfigure(5, weight=1)
 
-class Chart:
-    def __init__(self, file, bpm, aboveNumber, belowNumber, keyMaxTime, eventMaxTime):
-        # 文件名称
-        self.file = file
-        self.fileName = file
-        # 铺面 bpm
-        self.bpm = bpm
-        # 物量
-        self.aboveNumber = aboveNumber
-        self.belowNumber = belowNumber
-        self.objectNumber = aboveNumber + belowNumber
-        # 最后一个键的时间
-        self.keyMaxTime = keyMaxTime
-        self.keyMaxSecond = round(self.keyMaxTime / bpm * 1.875, 2)
-        # 最后一个事件的事件
-        self.eventMaxTime = eventMaxTime
-        self.eventMaxSecond = round(self.eventMaxTime / bpm * 1.875, 2)
-        # 曲长
-        self.maxTime = max(eventMaxTime, keyMaxTime)
-        self.audioLength = round(self.maxTime / bpm * 1.875, 2)
-        # 排名分数
-        self.sortingScore = 0
-
-    def __str__(self) -> str:
-        return f"<Chart '{self.fileName}', bpm={self.bpm}, number={self.objectNumber}, maxTime={self.maxTime}, audioLength={self.audioLength}s>"
-
-    def __repr__(self) -> str:
-        return f"<Chart {self.fileName}>"
-
-def analyseJsonChart(chartFile: str):
-    """分析铺面文件，生成 Chart 对象"""
-    try:
-        with open(chartFile, 'r', encoding="utf-8") as f:
-            jsonData = json.load(f)
-
-        # 铺面 bpm
-        bpm = jsonData["judgeLineList"][0]["bpm"]
-        # 物量
-        aboveNumber = 0
-        belowNumber = 0
-        # 最后一个键的时间
-        keyMaxTime = 0
-        # 最后一个事件的时间
-        eventMaxTime = 0
-
-        # 统计最后一个判定线动画的时间
-        for line in jsonData["judgeLineList"]:
-            aboveNumber += len(line["notesAbove"])
-            belowNumber += len(line["notesBelow"])
-
-            eventList = line["speedEvents"] + line["judgeLineMoveEvents"] + line["judgeLineRotateEvents"] + line["judgeLineDisappearEvents"]
-            for event in eventList:
-                eventMaxTime = max(event["startTime"], eventMaxTime)
-        
-        # 统计最后一个note的时间
-        for line in jsonData["judgeLineList"]:
-            for note in line["notesAbove"]:
-                keyMaxTime = max(note["time"], keyMaxTime)
-
-        return Chart(
-            chartFile,
-            bpm,
-            aboveNumber,
-            belowNumber,
-            keyMaxTime,
-            eventMaxTime
-        )
-    except Exception as e:
-        print(f"分析文件 {chartFile} 时出错: {e}")
-        return None
-
 def search_charts(E1, E2, E3, E4, E5, T1, BL1, search_window, project_folder, project_info, project_name, parent_window):
     """搜索谱面"""
     global progress_var, progress_bar
@@ -794,10 +667,7 @@ def search_charts(E1, E2, E3, E4, E5, T1, BL1, search_window, project_folder, pr
 
     # 解析筛选条件
     if difficulty == "":
-        difficulty = None
-        keyWords = ["#"]
-    else:
-        keyWords = ["#", difficulty]
+        difficulty = "#"
     if targetNumber == "":
         targetNumber = None
     else:
@@ -811,9 +681,8 @@ def search_charts(E1, E2, E3, E4, E5, T1, BL1, search_window, project_folder, pr
     else:
         targetMaxTime = int(targetMaxTime)
 
+    index = ChartIndex()
     try:
-        fileList = os.listdir(fileDir)
-        fileCount = len(fileList)
         chartObjectsList = []
         
         # 初始化进度条
@@ -822,40 +691,31 @@ def search_charts(E1, E2, E3, E4, E5, T1, BL1, search_window, project_folder, pr
             if 'progress_bar' in globals() and progress_bar is not None:
                 progress_bar.update()
         
-        BL1.config(text="正在分析谱面文件...")
+        BL1.config(text=f"正在分析谱面文件...（{parser_description(chart_parser, json_backend)}）")
         search_window.update()
         
-        # 分析谱面文件
-        for i, file in enumerate(fileList):
+        # 从文件名索引中直接取出符合关键词的谱面
+        chartFiles = chart_candidates(fileDir, difficulty)
+        chartCount = len(chartFiles)
+
+        def show_progress(percent, text):
             # 更新进度条（分析阶段占50%）
-            progress = (i / fileCount) * 50
             if 'progress_var' in globals() and progress_var is not None:
-                progress_var.set(progress)
-                if 'progress_bar' in globals() and progress_bar is not None:
-                    progress_bar.update()
-            
+                progress_var.set(percent / 2)
+            BL1.config(text=text)
             # 更新UI防止未响应
             search_window.update()
-            
-            # 确认是否含有关键词
-            skip = False
-            for keyword in keyWords:
-                if keyword not in file:
-                    skip = True
-            if skip:
-                continue
-
-            # 尝试分析铺面文件
-            try:
-                chart = analyseJsonChart(os.path.join(fileDir, file))
-                if chart:
-                    chartObjectsList.append(chart)
-                    BL1.config(text=f"{i+1}/{fileCount}\t分析完成{chart}")
-                    search_window.update()
-            except KeyError as e:
-                BL1.config(text=f"{i+1}/{fileCount}\t分析'{file}'时遇到 KeyError:" + str(e))
-            except Exception as e:
-                BL1.config(text=f"{i+1}/{fileCount}\t分析'{file}'时出错: {str(e)}")
+
+        # 限制界面刷新频率，文件很多时不必每个文件都重绘一次
+        reporter = ProgressReporter(chartCount, show_progress)
+
+        # 分析谱面文件（已索引的文件直接读取，其余文件由进程池并行分析）
+        for chartFile, chart in analyse_charts(chartFiles, index, analysis_workers, mode=chart_parser, backend=json_backend):
+            if chart:
+                chartObjectsList.append(chart)
+            reporter.update(os.path.basename(chartFile), failed=0 if chart else 1)
+
+        index.commit()
 
         if not chartObjectsList:
             BL1.config(text="未找到匹配的谱面文件")
@@ -865,66 +725,51 @@ def search_charts(E1, E2, E3, E4, E5, T1, BL1, search_window, project_folder, pr
         BL1.config(text=f"正在对 {len(chartObjectsList)} 个铺面文件进行匹配...")
         search_window.update()
         
-        # 重置分数
-        for chart in chartObjectsList:
-            chart.sortingScore = 0
-        
-        # 计算匹配度并更新进度
-        for i, chart in enumerate(chartObjectsList):
-            if targetNumber is not None:
-                chart.sortingScore += max(0, 10 - abs(targetNumber - chart.objectNumber))
-            if targetBPM is not None:
-                chart.sortingScore += max(0, 10 - 0.2 * abs(targetBPM - chart.bpm))
-            if targetMaxTime is not None:
-                chart.sortingScore += max(0, 10 - 0.2 * abs(targetMaxTime - chart.audioLength))
-            
-            # 更新进度条（匹配阶段占50%）
-            progress = 50 + (i / len(chartObjectsList)) * 50
-            if 'progress_var' in globals() and progress_var is not None:
-                progress_var.set(progress)
-                if 'progress_bar' in globals() and progress_bar is not None:
-                    progress_bar.update()
-            
-            # 更新UI防止未响应
-            search_window.update()
+        # 向量化计算匹配度并取前 result_limit 名，之后按页显示
+        sortedList = ChartLibrary(chartObjectsList).search(targetNumber, targetBPM, targetMaxTime, k=result_limit)
+        T1.result_pages = ResultPages(sortedList, page_size)
         
         # 完成进度条
         if 'progress_var' in globals() and progress_var is not None:
             progress_var.set(100)
             if 'progress_bar' in globals() and progress_bar is not None:
                 progress_bar.update()
-        
-        # 进行排序
-        sortedList = sorted(chartObjectsList, key=lambda x: x.sortingScore, reverse=True)[:10]
 
         # 清空现有结果
         for child in T1.get_children():
             T1.delete(child)
         
         # 输出结果
-        if len(sortedList) == 0 or sortedList[0].sortingScore <= 0:
+        if len(T1.result_pages) == 0:
             BL1.config(text="匹配完成。未找到任何匹配项目。")
         else:
-            BL1.config(text=f"匹配完成，最佳匹配项为：{sortedList[0].fileName}")
-            for chart in sortedList:
-                if chart.sortingScore <= 0:
-                    continue
-                T1.insert("", "end", values=(
-                    chart.fileName,
-                    chart.objectNumber,
-                    chart.bpm,
-                    chart.audioLength,
-                    f"{chart.sortingScore / 30:.2%}"
-                ))
+            show_next_page(T1, BL1, chart_row_values)
+            BL1.config(text=f"匹配完成，最佳匹配项为：{sortedList[0].fileName}（{T1.result_pages.describe()}）")
         
     except Exception as e:
         messagebox.showerror("错误", f"搜索失败：{str(e)}")
+    finally:
+        index.close()
+
+def project_chart_path(project_folder, project_info):
+    """工程中谱面文件的路径，没有谱面时返回 None"""
+    chart_file = project_info.get("Chart", "")
+    chart_path = os.path.join(project_folder, chart_file)
+    return chart_path if chart_file and os.path.exists(chart_path) else None
+
+def project_chart_bpm(project_folder, project_info):
+    """读取工程中谱面的 BPM，作为音频搜索目标 BPM 的默认值；没有谱面时返回 None"""
+    chart_path = project_chart_path(project_folder, project_info)
+    if chart_path is None:
+        return None
+    chart = analyseJsonChart(chart_path, chart_parser, json_backend)
+    return chart.bpm if chart is not None else None
 
 def open_audio_search_window(project_folder, project_info, project_name, parent_window):
     """打开音频搜索窗口"""
     audio_window = Toplevel(parent_window)
     audio_window.title("音频搜索")
-    audio_window.geometry("750x750")
+    audio_window.geometry("750x790")
     audio_window.resizable(0, 0)
     
     # 设置窗口为模态窗口，防止父窗口被操作
@@ -940,7 +785,7 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
     title_label.grid(row=0, column=0, columnspan=4, pady=(0, 15))
     
     # 音频文件夹选择
-    L_audio_folder = ttk.Label(main_frame, text="音频文件夹（wav）")
+    L_audio_folder = ttk.Label(main_frame, text="音频文件夹（wav/ogg/mp3/flac）")
     L_audio_folder.grid(row=1, column=0, sticky=W, pady=5)
     
     folder_frame = ttk.Frame(main_frame)
@@ -971,6 +816,20 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
     E_audio_duration = ttk.Entry(duration_frame, width=20)
     E_audio_duration.pack(side=LEFT)
     
+    # 填写目标 BPM 后才分析 WAV 的节奏（需要读取采样，比只读文件头慢得多），工程谱面的 BPM 只作为提示
+    bpm_frame = ttk.Frame(filter_frame)
+    bpm_frame.grid(row=2, column=0, sticky=(W, E), pady=5)
+    
+    L_audio_bpm = ttk.Label(bpm_frame, text="目标 BPM（可选，半速和倍速也视为吻合）")
+    L_audio_bpm.pack(side=LEFT)
+    
+    E_audio_bpm = ttk.Entry(bpm_frame, width=10)
+    E_audio_bpm.pack(side=LEFT, padx=(10, 0))
+    chart_bpm = project_chart_bpm(project_folder, project_info)
+    if chart_bpm:
+        L_chart_bpm = ttk.Label(bpm_frame, text=f"工程谱面 BPM：{chart_bpm:g}")
+        L_chart_bpm.pack(side=LEFT, padx=(10, 0))
+    
     def search_audio():
         global progress_var_audio, progress_bar_audio
         
@@ -990,9 +849,19 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
             messagebox.showerror("错误", "音频时长必须是数字！")
             return
         
+        target_bpm = None
+        if E_audio_bpm.get().strip():
+            try:
+                target_bpm = float(E_audio_bpm.get())
+            except ValueError:
+                messagebox.showerror("错误", "BPM 必须是数字！")
+                return
+        
         # 扫描音频文件
-        audio_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.wav')]
+        audio_files = [f for f in os.listdir(folder_path) if is_audio_file(f)]
         audioObjectsList = []
+        # 结果所在的文件夹，之后修改输入框不影响试听、添加和对齐当前结果
+        T_audio.scanned_folder = folder_path
         
         # 初始化进度条
         if 'progress_var_audio' in globals() and progress_var_audio is not None:
@@ -1000,91 +869,84 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
             if 'progress_bar_audio' in globals() and progress_bar_audio is not None:
                 progress_bar_audio.update()
         
-        # 分析音频文件
-        for i, audio_file in enumerate(audio_files):
-            # 更新进度条（分析阶段占50%）
-            progress = (i / len(audio_files)) * 50
-            if 'progress_var_audio' in globals() and progress_var_audio is not None:
-                progress_var_audio.set(progress)
-                if 'progress_bar_audio' in globals() and progress_bar_audio is not None:
-                    progress_bar_audio.update()
+        def show_audio_results(audioSortedList, final=False):
+            """显示匹配结果，final 为 False 时表示分析尚未完成"""
+            # 清空现有结果
+            for child in T_audio.get_children():
+                T_audio.delete(child)
+            T_audio.result_pages = ResultPages(audioSortedList, page_size)
             
+            # 输出结果
+            if len(T_audio.result_pages) == 0:
+                if final:
+                    BL_audio.config(text="匹配完成。未找到任何匹配项目。")
+            else:
+                show_next_page(T_audio, BL_audio, audio_row_values)
+                if final:
+                    BL_audio.config(text=f"匹配完成，最佳匹配项为：{audioSortedList[0].fileName}（{T_audio.result_pages.describe()}）")
+        
+        # 分析音频文件（多线程读取文件头，每批结果刷新一次界面；给出目标 BPM 时才分析节奏）
+        index = AudioIndex()
+        audio_paths = [os.path.join(folder_path, f) for f in audio_files]
+        durations = scan_audio(audio_paths, index, tempo=bool(target_bpm))
+        # 分析过程中当前的最佳匹配，用小根堆只保留前 result_limit 个
+        bestAudio = TopK(result_limit)
+        
+        def show_progress(percent, text):
+            # 更新进度条和当前的最佳匹配
+            if 'progress_var_audio' in globals() and progress_var_audio is not None:
+                progress_var_audio.set(percent)
+            show_audio_results(bestAudio.items())
+            BL_audio.config(text=text)
             # 更新UI防止未响应
             audio_window.update()
-            
-            audio_path = os.path.join(folder_path, audio_file)
-            duration = get_audio_duration(audio_path)
-            
-            if duration is not None:
-                # 创建AudioFile对象
-                audio_obj = type('AudioFile', (), {
-                    'file': audio_file,
-                    'fileName': audio_file,
-                    'duration': duration,
-                    'sortingScore': 0
-                })()
-                audioObjectsList.append(audio_obj)
-                BL_audio.config(text=f"{i+1}/{len(audio_files)}\t分析完成 {audio_file}")
-                audio_window.update()
+        
+        # 限制界面刷新频率，音频很多时不必每批都重绘一次
+        reporter = ProgressReporter(len(audio_files), show_progress)
+        try:
+            for batch in iter_batches(durations):
+                batchObjectsList = []
+                for audio_path, duration, bpm in batch:
+                    if duration is not None:
+                        audio_file = os.path.basename(audio_path)
+                        # 创建AudioFile对象
+                        audio_obj = type('AudioFile', (), {
+                            'file': audio_file,
+                            'fileName': audio_file,
+                            'duration': duration,
+                            'bpm': bpm,
+                            'alignment': None,
+                            'sortingScore': 0
+                        })()
+                        batchObjectsList.append(audio_obj)
+                        audio_obj.sortingScore = audio_score(target_duration, duration, target_bpm, bpm)
+                        bestAudio.push(audio_obj.sortingScore, audio_obj)
+                audioObjectsList.extend(batchObjectsList)
+                reporter.update(os.path.basename(batch[-1][0]), len(batch), len(batch) - len(batchObjectsList))
+        finally:
+            durations.close()
+            index.close()
         
         if not audioObjectsList:
             BL_audio.config(text="未找到匹配的音频文件")
             return
         
-        # 计算匹配度
-        BL_audio.config(text=f"正在对 {len(audioObjectsList)} 个音频文件进行匹配...")
-        audio_window.update()
-        
-        # 重置分数
-        for audio_obj in audioObjectsList:
-            audio_obj.sortingScore = 0
-        
-        # 计算匹配度并更新进度
-        for i, audio_obj in enumerate(audioObjectsList):
-            # 匹配度计算：时长越接近，匹配度越高
-            time_diff = abs(target_duration - audio_obj.duration)
-            audio_obj.sortingScore = max(0, 10 - time_diff * 2)  # 每差1秒扣2分
-            
-            # 更新进度条（匹配阶段占50%）
-            progress = 50 + (i / len(audioObjectsList)) * 50
-            if 'progress_var_audio' in globals() and progress_var_audio is not None:
-                progress_var_audio.set(progress)
-                if 'progress_bar_audio' in globals() and progress_bar_audio is not None:
-                    progress_bar_audio.update()
-            
-            # 更新UI防止未响应
-            audio_window.update()
-        
         # 完成进度条
         if 'progress_var_audio' in globals() and progress_var_audio is not None:
             progress_var_audio.set(100)
             if 'progress_bar_audio' in globals() and progress_bar_audio is not None:
                 progress_bar_audio.update()
         
-        # 进行排序
-        audioSortedList = sorted(audioObjectsList, key=lambda x: x.sortingScore, reverse=True)[:10]
-        
-        # 清空现有结果
-        for child in T_audio.get_children():
-            T_audio.delete(child)
-        
-        # 输出结果
-        if len(audioSortedList) == 0 or audioSortedList[0].sortingScore <= 0:
-            BL_audio.config(text="匹配完成。未找到任何匹配项目。")
-        else:
-            BL_audio.config(text=f"匹配完成，最佳匹配项为：{audioSortedList[0].fileName}")
-            for audio_obj in audioSortedList:
-                if audio_obj.sortingScore <= 0:
-                    continue
-                T_audio.insert("", "end", values=(
-                    audio_obj.fileName,
-                    audio_obj.duration,
-                    f"{audio_obj.sortingScore / 10:.2%}"
-                ))
+        # 按时长排序后用二分查找取出最接近目标时长的音频
+        show_audio_results(AudioLibrary(audioObjectsList).search(target_duration, k=result_limit, target_bpm=target_bpm), final=True)
         
     B_audio_filter = ttk.Button(duration_frame, text="开始筛选", command=search_audio, style="Accent.TButton")
     B_audio_filter.pack(side=LEFT, padx=(15, 0))
     
+    # 结果数量
+    page_options = create_page_options(filter_frame)
+    page_options.grid(row=3, column=0, sticky=W, pady=5)
+    
     # 音频列表
     list_frame = ttk.LabelFrame(main_frame, text="搜索结果", padding="10")
     list_frame.grid(row=4, column=0, columnspan=4, sticky=(W, E, N, S), pady=10)
@@ -1123,7 +985,7 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
         
         item = T_audio.item(selection[0])
         audio_filename = item['values'][0]
-        audio_path = os.path.join(E_audio_folder.get(), audio_filename)
+        audio_path = os.path.join(T_audio.scanned_folder, audio_filename)
         
         try:
             if os.name == 'nt':  # Windows
@@ -1145,11 +1007,11 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
         try:
             # 删除现有音频文件
             for f in os.listdir(project_folder):
-                if f.lower().endswith('.wav'):
+                if is_audio_file(f):
                     os.remove(os.path.join(project_folder, f))
             
             # 复制新文件
-            source_path = os.path.join(E_audio_folder.get(), audio_filename)
+            source_path = os.path.join(T_audio.scanned_folder, audio_filename)
             shutil.copy2(source_path, project_folder)
             
             messagebox.showinfo("成功", f"音频已添加到工程 '{project_name}'！")
@@ -1160,9 +1022,71 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
         except Exception as e:
             messagebox.showerror("错误", f"添加音频失败：{str(e)}")
     
+    def align_with_chart():
+        """把工程谱面与匹配度最高的候选音频对齐，按对齐结果重新计算匹配度"""
+        chart_path = project_chart_path(project_folder, project_info)
+        if chart_path is None:
+            messagebox.showwarning("警告", "工程中还没有谱面！")
+            return
+        pages = getattr(T_audio, 'result_pages', None)
+        if not pages:
+            messagebox.showwarning("警告", "请先筛选音频！")
+            return
+        if getattr(pages, 'aligned', False):
+            messagebox.showinfo("提示", "当前结果已经按谱面对齐！")
+            return
+        
+        candidates = pages.results[:ALIGN_CANDIDATES]
+        audio_paths = [os.path.join(T_audio.scanned_folder, audio_obj.fileName) for audio_obj in candidates]
+        BL_audio.config(text=f"正在将谱面与前 {len(candidates)} 个候选音频对齐...")
+        B_align_audio.config(state=DISABLED)
+        
+        # 对齐需要读取每个候选音频的采样，在后台线程中计算；Tk 控件只能在界面线程中访问
+        result = {}
+        def run_alignment():
+            try:
+                result['alignments'] = align_audio(chart_path, audio_paths, json_backend)
+            except (OSError, ValueError, KeyError) as e:
+                result['error'] = e
+        worker = threading.Thread(target=run_alignment, daemon=True)
+        worker.start()
+        
+        def poll_alignment():
+            """对齐完成后在界面线程中显示结果"""
+            if not audio_window.winfo_exists():
+                return
+            if worker.is_alive():
+                audio_window.after(100, poll_alignment)
+                return
+            B_align_audio.config(state=NORMAL)
+            if 'error' in result:
+                messagebox.showerror("错误", f"谱面对齐失败：{str(result['error'])}")
+                return
+            # 对齐期间重新筛选过时丢弃旧结果
+            if getattr(T_audio, 'result_pages', None) is not pages:
+                return
+            alignments = result['alignments']
+            for child in T_audio.get_children():
+                T_audio.delete(child)
+            # 只有前 ALIGN_CANDIDATES 个结果参与对齐，其余结果保持原来的匹配度一起重新排序
+            T_audio.result_pages = ResultPages(apply_alignment(pages.results, alignments), page_size)
+            # 匹配度已按对齐结果折算，不能再次对齐
+            T_audio.result_pages.aligned = True
+            show_next_page(T_audio, BL_audio, audio_row_values)
+            aligned = sum(alignment is not None for alignment in alignments)
+            BL_audio.config(text=f"已将谱面与 {aligned}/{len(candidates)} 个候选音频对齐（非 WAV 文件保持原匹配度）")
+        
+        audio_window.after(100, poll_alignment)
+    
     B_play_audio = ttk.Button(button_frame, text="试听", command=play_audio)
     B_play_audio.pack(side=LEFT, padx=(0, 5))
     
+    B_next_audio = ttk.Button(button_frame, text="加载下一页", command=lambda: show_next_page(T_audio, BL_audio, audio_row_values))
+    B_next_audio.pack(side=LEFT, padx=(0, 5))
+    
+    B_align_audio = ttk.Button(button_frame, text="按谱面对齐", command=align_with_chart)
+    B_align_audio.pack(side=LEFT, padx=(0, 5))
+    
     B_add_audio = ttk.Button(button_frame, text="添加到工程", command=add_audio, style="Accent.TButton")
     B_add_audio.pack(side=LEFT, padx=(0, 10))
     
@@ -1171,13 +1095,17 @@ def open_audio_search_window(project_folder, project_info, project_name, parent_
     BL_audio.grid(row=6, column=0, columnspan=4, sticky=(W, E), pady=(10, 0))
 
     # 配置表格列
-    T_audio.config(columns=("1", "2", "3"), show='headings')
+    T_audio.config(columns=("1", "2", "3", "4", "5"), show='headings')
     T_audio.heading("1", text="文件路径")
     T_audio.heading("2", text="音频时长（秒）")
-    T_audio.heading("3", text="匹配度")
-    T_audio.column("1", width=400)
+    T_audio.heading("3", text="BPM")
+    T_audio.heading("4", text="谱面对齐")
+    T_audio.heading("5", text="匹配度")
+    T_audio.column("1", width=240)
     T_audio.column("2", width=100)
-    T_audio.column("3", width=100)
+    T_audio.column("3", width=60)
+    T_audio.column("4", width=100)
+    T_audio.column("5", width=100)
     
     main_frame.columnconfigure(0, weight=1)
     main_frame.rowconfigure(4, weight=1)
@@ -1218,7 +1146,7 @@ def modify_art(project_folder, project_info, project_name, parent_window):
     # 重新生成曲绘
     def regenerate_art():
         font_path = E_font.get().strip() if E_font.get().strip() else None
-        if create_chart_art(project_folder, project_info['Name'], project_info['Level'], project_info['Path'], font_path):
+        if create_chart_art(project_folder, project_info['Name'], project_info['Level'], project_info['Path'], font_path, BUNDLED_FONT):
             messagebox.showinfo("成功", "曲绘已重新生成！")
             art_window.destroy()
             parent_window.destroy()
@@ -1274,7 +1202,7 @@ def delete_file(file_type, project_folder, project_info, project_name, parent_wi
                 update_info_txt(project_folder, project_info)
         elif file_type == "audio":
             for f in os.listdir(project_folder):
-                if f.lower().endswith('.wav'):
+                if is_audio_file(f):
                     os.remove(os.path.join(project_folder, f))
         elif file_type == "art":
             art_file = f"{project_info.get('Path', '')}.png"
@@ -1312,7 +1240,7 @@ def pack_project(project_name, project_folder):
         
         # 音频文件
         for f in os.listdir(project_folder):
-            if f.lower().endswith('.wav'):
+            if is_audio_file(f):
                 audio_path = os.path.join(project_folder, f)
                 core_files.append((f, audio_path))
                 break
@@ -1354,7 +1282,7 @@ def delete_project(project_name):
         project_folder = os.path.join(program_folder, project_name)
         shutil.rmtree(project_folder)
         messagebox.showinfo("成功", "工程已删除！")
-        refresh_project_list()
+        update_project_list(project_name)
     except Exception as e:
         messagebox.showerror("错误", f"删除工程失败：{str(e)}")
 
@@ -1367,27 +1295,56 @@ def select_program_folder():
         E_program_folder.delete(0, END)
         E_program_folder.insert(0, folder_path)
         save_config()
-        refresh_project_list()
+        watch_program_folder()
 
-def refresh_project_list():
-    """刷新工程列表"""
-    # 清空现有列表
+def watch_program_folder():
+    """开始监视程序文件夹并重新加载工程列表"""
+    global project_registry
+    if project_registry is not None:
+        project_registry.stop()
     for item in T_projects.get_children():
         T_projects.delete(item)
-    
-    # 扫描并显示工程
-    projects = scan_projects()
-    for project in projects:
-        T_projects.insert("", "end", values=(
+    project_registry = ProjectRegistry(program_folder)
+    project_registry.start()
+    update_project_list()
+
+def refresh_project_list():
+    """刷新工程列表"""
+    if project_registry is None:
+        watch_program_folder()
+        return
+    # 重新检查所有工程，只更新有变化的行
+    project_registry.mark_dirty()
+    update_project_list()
+
+def update_project_list(project_name=None):
+    """把有变化的工程同步到列表，project_name 指定时立即重新读取该工程"""
+    if project_registry is None:
+        return
+    if project_name is not None:
+        project_registry.mark_dirty(project_name)
+    changed, removed = project_registry.update()
+    # 表格行以工程名作为 iid，可以直接定位
+    for name in removed:
+        if T_projects.exists(name):
+            T_projects.delete(name)
+    for name in changed:
+        project = project_registry.projects[name]
+        values = (
             project['name'],
             project['info'].get('Name', ''),
             project['info'].get('Level', ''),
-            "完整" if all([
-                project['info'].get('Chart', ''),
-                any(f.lower().endswith('.wav') for f in os.listdir(project['folder']) if os.path.isfile(os.path.join(project['folder'], f))),
-                os.path.exists(os.path.join(project['folder'], f"{project['info'].get('Path', '')}.png")) if project['info'].get('Path') else False
-            ]) else "不完整"
-        ))
+            "完整" if project['complete'] else "不完整"
+        )
+        if T_projects.exists(name):
+            T_projects.item(name, values=values)
+        else:
+            T_projects.insert("", "end", iid=name, values=values)
+
+def poll_project_list():
+    """定时把后台监视到的工程变化同步到列表"""
+    update_project_list()
+    top.after(1000, poll_project_list)
 
 def open_project_action():
     """打开选中的工程"""
@@ -1411,96 +1368,110 @@ def delete_project_action():
     project_name = item['values'][0]
     delete_project(project_name)
 
-# 创建主界面
-top = Tk()
-top.title("PhiChartSearch谱面工程管理器")
-top.geometry("800x600")
-top.resizable(1, 1)
-
-# 应用Sun-Valley-ttk主题
-sv_ttk.set_theme("light")
-
-# 设置全局字体样式
-style = ttk.Style()
-style.configure(".", font=("微软雅黑", 10))
-style.configure("TLabel", font=("微软雅黑", 10))
-style.configure("TButton", font=("微软雅黑", 10))
-style.configure("TEntry", font=("微软雅黑", 10))
-style.configure("Treeview", font=("微软雅黑", 10))
-style.configure("Treeview.Heading", font=("微软雅黑", 10))
-style.configure("TLabelframe.Label", font=("微软雅黑", 10))
-style.configure("TCheckbutton", font=("微软雅黑", 10))
-
-# 创建主框架
-main_frame = ttk.Frame(top, padding="20")
-main_frame.pack(fill=BOTH, expand=True)
-
-# 标题
-title_label = ttk.Label(main_frame, text="PhiChartSearch谱面工程管理器")
-title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
-
-# 程序文件夹选择
-folder_frame = ttk.LabelFrame(main_frame, text="程序文件夹设置", padding="10")
-folder_frame.grid(row=1, column=0, columnspan=3, sticky=(W, E), pady=10)
-
-L_program_folder = ttk.Label(folder_frame, text="程序文件夹（所有工程的总存放路径）")
-L_program_folder.pack(anchor=W, pady=(0, 5))
-
-program_folder_frame = ttk.Frame(folder_frame)
-program_folder_frame.pack(fill=X, pady=(0, 5))
-
-E_program_folder = ttk.Entry(program_folder_frame)
-E_program_folder.pack(side=LEFT, fill=X, expand=True, padx=(0, 10))
-
-B_browse_folder = ttk.Button(program_folder_frame, text="浏览", command=select_program_folder)
-B_browse_folder.pack(side=RIGHT)
-
-# 工程列表
-projects_frame = ttk.LabelFrame(main_frame, text="工程列表", padding="10")
-projects_frame.grid(row=2, column=0, columnspan=3, sticky=(W, E, N, S), pady=10)
-main_frame.columnconfigure(0, weight=1)
-main_frame.rowconfigure(2, weight=1)
-
-# 创建表格
-T_projects = ttk.Treeview(projects_frame, height=15)
-T_projects.pack(fill=BOTH, expand=True)
-
-# 配置表格列
-T_projects.config(columns=("name", "chart_name", "level", "status"), show='headings')
-T_projects.heading("name", text="工程名")
-T_projects.heading("chart_name", text="谱面名称")
-T_projects.heading("level", text="难度")
-T_projects.heading("status", text="状态")
-T_projects.column("name", width=200)
-T_projects.column("chart_name", width=200)
-T_projects.column("level", width=100)
-T_projects.column("status", width=100)
-
-# 按钮区域
-button_frame = ttk.Frame(main_frame)
-button_frame.grid(row=3, column=0, columnspan=3, pady=20)
-
-B_create = ttk.Button(button_frame, text="创建新工程", command=create_project, style="Accent.TButton")
-B_create.pack(side=LEFT, padx=(0, 10))
-
-B_open = ttk.Button(button_frame, text="打开工程", command=open_project_action)
-B_open.pack(side=LEFT, padx=(0, 10))
-
-B_delete = ttk.Button(button_frame, text="删除工程", command=delete_project_action)
-B_delete.pack(side=LEFT, padx=(0, 10))
-
-B_refresh = ttk.Button(button_frame, text="刷新列表", command=refresh_project_list)
-B_refresh.pack(side=LEFT)
-
-# 状态栏
-status_label = ttk.Label(main_frame, text="就绪", anchor="w")
-status_label.grid(row=4, column=0, columnspan=3, sticky=(W, E), pady=(10, 0))
-
-# 加载配置并初始化
-load_config()
-if program_folder:
-    E_program_folder.insert(0, program_folder)
-    refresh_project_list()
-
 if __name__ == '__main__':
+    # 打包为可执行文件后，进程池子进程需要由此进入
+    multiprocessing.freeze_support()
+    # 界面库在这里才导入：Windows 和打包后的程序以 spawn 方式启动谱面分析的子进程，
+    # 子进程会重新执行本文件（__name__ 不是 '__main__'），不需要导入界面库
+    import tkinter as tk
+    from tkinter import *
+    from tkinter import ttk
+    from tkinter import messagebox
+    from tkinter import filedialog
+    import sv_ttk
+    
+    # 创建主界面
+    top = Tk()
+    top.title("PhiChartSearch谱面工程管理器")
+    top.geometry("800x600")
+    top.resizable(1, 1)
+
+    # 应用Sun-Valley-ttk主题
+    sv_ttk.set_theme("light")
+
+    # 设置全局字体样式
+    style = ttk.Style()
+    style.configure(".", font=("微软雅黑", 10))
+    style.configure("TLabel", font=("微软雅黑", 10))
+    style.configure("TButton", font=("微软雅黑", 10))
+    style.configure("TEntry", font=("微软雅黑", 10))
+    style.configure("Treeview", font=("微软雅黑", 10))
+    style.configure("Treeview.Heading", font=("微软雅黑", 10))
+    style.configure("TLabelframe.Label", font=("微软雅黑", 10))
+    style.configure("TCheckbutton", font=("微软雅黑", 10))
+
+    # 创建主框架
+    main_frame = ttk.Frame(top, padding="20")
+    main_frame.pack(fill=BOTH, expand=True)
+
+    # 标题
+    title_label = ttk.Label(main_frame, text="PhiChartSearch谱面工程管理器")
+    title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
+
+    # 程序文件夹选择
+    folder_frame = ttk.LabelFrame(main_frame, text="程序文件夹设置", padding="10")
+    folder_frame.grid(row=1, column=0, columnspan=3, sticky=(W, E), pady=10)
+
+    L_program_folder = ttk.Label(folder_frame, text="程序文件夹（所有工程的总存放路径）")
+    L_program_folder.pack(anchor=W, pady=(0, 5))
+
+    program_folder_frame = ttk.Frame(folder_frame)
+    program_folder_frame.pack(fill=X, pady=(0, 5))
+
+    E_program_folder = ttk.Entry(program_folder_frame)
+    E_program_folder.pack(side=LEFT, fill=X, expand=True, padx=(0, 10))
+
+    B_browse_folder = ttk.Button(program_folder_frame, text="浏览", command=select_program_folder)
+    B_browse_folder.pack(side=RIGHT)
+
+    # 工程列表
+    projects_frame = ttk.LabelFrame(main_frame, text="工程列表", padding="10")
+    projects_frame.grid(row=2, column=0, columnspan=3, sticky=(W, E, N, S), pady=10)
+    main_frame.columnconfigure(0, weight=1)
+    main_frame.rowconfigure(2, weight=1)
+
+    # 创建表格
+    T_projects = ttk.Treeview(projects_frame, height=15)
+    T_projects.pack(fill=BOTH, expand=True)
+
+    # 配置表格列
+    T_projects.config(columns=("name", "chart_name", "level", "status"), show='headings')
+    T_projects.heading("name", text="工程名")
+    T_projects.heading("chart_name", text="谱面名称")
+    T_projects.heading("level", text="难度")
+    T_projects.heading("status", text="状态")
+    T_projects.column("name", width=200)
+    T_projects.column("chart_name", width=200)
+    T_projects.column("level", width=100)
+    T_projects.column("status", width=100)
+
+    # 按钮区域
+    button_frame = ttk.Frame(main_frame)
+    button_frame.grid(row=3, column=0, columnspan=3, pady=20)
+
+    B_create = ttk.Button(button_frame, text="创建新工程", command=create_project, style="Accent.TButton")
+    B_create.pack(side=LEFT, padx=(0, 10))
+
+    B_open = ttk.Button(button_frame, text="打开工程", command=open_project_action)
+    B_open.pack(side=LEFT, padx=(0, 10))
+
+    B_delete = ttk.Button(button_frame, text="删除工程", command=delete_project_action)
+    B_delete.pack(side=LEFT, padx=(0, 10))
+
+    B_refresh = ttk.Button(button_frame, text="刷新列表", command=refresh_project_list)
+    B_refresh.pack(side=LEFT)
+
+    # 状态栏
+    status_label = ttk.Label(main_frame, text="就绪", anchor="w")
+    status_label.grid(row=4, column=0, columnspan=3, sticky=(W, E), pady=(10, 0))
+
+    # 加载配置并初始化
+    load_config()
+    if program_folder:
+        E_program_folder.insert(0, program_folder)
+        watch_program_folder()
+    poll_project_list()
+    startup_timer.finish("主窗口及工程列表加载")
+    status_label.config(text=f"就绪（启动用时 {startup_timer.elapsed() * 1000:.0f} ms）")
+    
     mainloop()
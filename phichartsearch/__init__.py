@@ -0,0 +1 @@
+"""PhiChartSearch 公共模块（不依赖任何GUI库）"""
@@ -0,0 +1,113 @@
+from .jsonbackend import load_json_file
+from .startup import lazy_import
+from .tempo import ANALYSIS_RATE, FRAME_SIZE, HOP_SIZE, onset_envelope, read_wav_mono
+
+np = lazy_import("numpy")
+
+# 对齐使用的包络帧率（每秒帧数），采样率不同的音频都换算到这个帧率后一起计算
+FRAME_RATE = ANALYSIS_RATE / HOP_SIZE
+# 最多搜索的偏移（秒）：音频开头的空白与谱面 offset 之差一般不会超过这个范围
+MAX_OFFSET = 5
+# 默认对齐的候选音频数量（按匹配度取前 N 个）
+ALIGN_CANDIDATES = 20
+# note 时间的容差（秒），起音序列按此宽度做高斯平滑，容许谱面和起音检测的少量误差
+NOTE_TOLERANCE = 0.03
+
+def chart_note_times(chart_file, backend="auto"):
+    """读取谱面中全部 note 的时间（秒，已加上谱面的 offset），按时间排序"""
+    data = load_json_file(chart_file, backend)
+    offset = data.get("offset", 0)
+    times = []
+    for line in data["judgeLineList"]:
+        # 时间单位为 1/32 拍，换算方式与 Chart 相同，每条判定线使用自己的 BPM
+        bpm = line["bpm"]
+        for note in line["notesAbove"] + line["notesBelow"]:
+            times.append(note["time"] / bpm * 1.875 + offset)
+    return np.sort(np.array(times, dtype=np.float64))
+
+def onset_train(note_times, length, frame_rate=FRAME_RATE):
+    """把 note 时间转换为与起音包络帧对应的序列：有 note 的帧为 1，再做高斯平滑"""
+    # 包络的第 i 帧以 i * HOP_SIZE + FRAME_SIZE / 2 个采样处为中心
+    frames = np.round(note_times * frame_rate - FRAME_SIZE / 2 / HOP_SIZE).astype(np.intp)
+    frames = frames[(frames >= 0) & (frames < length)]
+    train = np.zeros(length, dtype=np.float32)
+    # 同时出现的多个 note（双押）只算一次起音
+    train[frames] = 1
+    width = NOTE_TOLERANCE * frame_rate
+    radius = int(np.ceil(3 * width))
+    kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / width) ** 2)
+    return np.convolve(train, kernel, mode='same').astype(np.float32)
+
+def audio_envelope(audio_path, frame_rate=FRAME_RATE):
+    """计算 WAV 音频的起音包络，并换算到统一的帧率"""
+    samples, rate = read_wav_mono(audio_path)
+    envelope, envelope_rate = onset_envelope(samples, rate)
+    if envelope_rate != frame_rate and len(envelope):
+        positions = np.arange(int(len(envelope) * frame_rate / envelope_rate)) * (envelope_rate / frame_rate)
+        envelope = np.interp(positions, np.arange(len(envelope)), envelope).astype(np.float32)
+    return envelope
+
+def _normalize(rows, lengths=None):
+    """每行减去均值并缩放到单位长度，互相关的结果即为相关系数
+
+    lengths 为各行的实际长度，之后补齐的 0 不计入均值，减去均值后仍为 0。
+    """
+    if lengths is None:
+        rows = rows - rows.mean(axis=-1, keepdims=True)
+    else:
+        lengths = np.asarray(lengths)[:, None]
+        rows = np.where(np.arange(rows.shape[-1]) < lengths, rows - rows.sum(axis=-1, keepdims=True) / lengths, 0)
+    norms = np.linalg.norm(rows, axis=-1, keepdims=True)
+    return rows / np.where(norms > 0, norms, 1)
+
+def cross_correlate(train, envelopes, max_lag, lengths=None):
+    """用 FFT 一次计算 train 与每条包络在 -max_lag~max_lag 帧偏移下的相关系数，返回 [包络, 偏移] 矩阵
+
+    偏移为正表示音频中的起音比谱面晚；lengths 为补齐到相同长度之前各条包络的长度。
+    """
+    size = 1 << (envelopes.shape[1] + len(train) - 1).bit_length()
+    train = _normalize(train)
+    spectrum = np.fft.rfft(_normalize(envelopes, lengths), size, axis=1) * np.conj(np.fft.rfft(train, size))
+    correlation = np.fft.irfft(spectrum, size, axis=1)
+    if lengths is not None:
+        # 较短的音频只与 train 的前一部分相关，按这一部分的长度缩放，结果不因其他候选更长而偏小
+        scales = np.array([np.linalg.norm(train[:length] - train[:length].mean()) for length in lengths])
+        correlation /= np.where(scales > 0, scales, 1)[:, None]
+    # 负偏移位于循环结果的末尾
+    return correlation[:, np.arange(-max_lag, max_lag + 1)]
+
+def align_audio(chart_file, audio_files, backend="auto", max_offset=MAX_OFFSET, interrupted=None):
+    """把谱面的 note 时间与每个音频的起音包络对齐，返回与 audio_files 对应的 (置信度, 偏移秒数) 列表
+
+    置信度为最佳偏移处的相关系数（0~1），偏移为音频相对谱面的延迟（秒）；
+    无法分析的音频（非 WAV、文件损坏）对应 None。
+    interrupted 为可选的函数，每读取一个音频前调用，返回 True 时停止对齐并返回 None。
+    """
+    note_times = chart_note_times(chart_file, backend)
+    envelopes = {}
+    for i, audio_file in enumerate(audio_files):
+        if interrupted is not None and interrupted():
+            return None
+        try:
+            envelope = audio_envelope(audio_file)
+        except (OSError, ValueError):
+            continue
+        if envelope.any():
+            envelopes[i] = envelope
+
+    results = [None] * len(audio_files)
+    if not envelopes or not len(note_times):
+        return results
+    # 所有候选补齐到相同长度，一起做 FFT
+    length = max(len(envelope) for envelope in envelopes.values())
+    matrix = np.zeros((len(envelopes), length), dtype=np.float32)
+    for row, envelope in enumerate(envelopes.values()):
+        matrix[row, :len(envelope)] = envelope
+    max_lag = int(max_offset * FRAME_RATE)
+    lengths = [len(envelope) for envelope in envelopes.values()]
+    correlation = cross_correlate(onset_train(note_times, length), matrix, max_lag, lengths)
+    best = correlation.argmax(axis=1)
+    for row, i in enumerate(envelopes):
+        confidence = max(0.0, float(correlation[row, best[row]]))
+        results[i] = (round(confidence, 4), round((best[row] - max_lag) / FRAME_RATE, 3))
+    return results
@@ -0,0 +1,65 @@
+import os
+
+from .startup import lazy_import
+
+# PIL 只在生成曲绘时使用，延迟到第一次使用时导入
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
+
+# 随程序发布的默认曲绘字体
+BUNDLED_FONT = "Source Han Sans & Saira Hybrid-Regular #2934.ttf"
+
+def load_art_fonts(font_path=None, fallback_font=None):
+    """加载曲绘的标题和难度字体，依次尝试 font_path、fallback_font，都不可用时使用 PIL 默认字体"""
+    for path in (font_path, fallback_font):
+        if path and os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, 160), ImageFont.truetype(path, 80)
+            except (OSError, ValueError):
+                pass
+    return ImageFont.load_default(), ImageFont.load_default()
+
+def create_chart_art(project_folder, project_name, project_level, path_value, font_path=None, fallback_font=None):
+    """创建曲绘图片"""
+    try:
+        # 图片尺寸 (16:9)
+        width = 1920
+        height = 1080
+
+        # 创建白色背景图片
+        image = Image.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(image)
+
+        # 选择字体
+        title_font, level_font = load_art_fonts(font_path, fallback_font)
+
+        # 获取文本尺寸
+        title_bbox = draw.textbbox((0, 0), project_name, font=title_font)
+        title_width = title_bbox[2] - title_bbox[0]
+        title_height = title_bbox[3] - title_bbox[1]
+
+        level_bbox = draw.textbbox((0, 0), project_level, font=level_font)
+        level_width = level_bbox[2] - level_bbox[0]
+        level_height = level_bbox[3] - level_bbox[1]
+
+        # 计算居中位置
+        title_x = (width - title_width) // 2
+        title_y = (height - title_height) // 2
+
+        # 计算难度位置（右下角偏左上）
+        level_x = width - level_width - 100  # 距离右边100像素
+        level_y = height - level_height - 100  # 距离底部100像素
+
+        # 绘制文本
+        draw.text((title_x, title_y), project_name, font=title_font, fill='black')
+        draw.text((level_x, level_y), project_level, font=level_font, fill='black')
+
+        # 保存图片
+        image_path = os.path.join(project_folder, f"{path_value}.png")
+        image.save(image_path)
+
+        return True
+    except Exception as e:
+        print(f"创建曲绘图片失败: {e}")
+        return False
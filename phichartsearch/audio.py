@@ -0,0 +1,212 @@
+import os
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from .containers import flac_duration, mp3_duration, ogg_duration, wav_duration
+from .tempo import audio_bpm, preload as preload_tempo
+from .waveform import waveform_overview
+
+# 支持的音频格式及对应的时长读取函数，都只读取容器头部或尾部，不解码音频
+AUDIO_READERS = {
+    ".wav": wav_duration,
+    ".ogg": ogg_duration,
+    ".mp3": mp3_duration,
+    ".flac": flac_duration,
+}
+AUDIO_EXTENSIONS = tuple(AUDIO_READERS)
+
+# 读取文件头是 I/O 密集型操作，线程数可以多于 CPU 核心数，以重叠网络盘或机械硬盘的等待时间
+SCAN_WORKERS = 16
+# 节奏分析需要读取并计算音频数据，线程数不宜过多，以免同时占用太多内存
+TEMPO_WORKERS = 4
+# 界面每收到多少个结果刷新一次表格
+SCAN_BATCH = 50
+
+# 读取文件出错（如文件被占用、网络盘断开）时的返回值，这类错误通常是暂时的，结果不写入缓存
+_READ_ERROR = object()
+
+def is_audio_file(file_name):
+    """判断文件扩展名是否为支持的音频格式"""
+    return file_name.lower().endswith(AUDIO_EXTENSIONS)
+
+def audio_duration(audio_path):
+    """按扩展名选择读取函数计算音频时长（秒），格式不支持或文件无法识别时抛出 ValueError"""
+    reader = AUDIO_READERS.get(os.path.splitext(audio_path)[1].lower())
+    if reader is None:
+        raise ValueError("不支持的音频格式")
+    return reader(audio_path)
+
+def get_audio_duration(audio_path):
+    """获取音频时长（秒，保留两位小数），无法读取时返回 None"""
+    try:
+        return round(audio_duration(audio_path), 2)
+    except (OSError, ValueError, struct.error):
+        return None
+
+def _read_duration(audio_file):
+    """在线程池中读取单个文件的时长，文件无法识别时返回 None，读取出错时返回 _READ_ERROR"""
+    try:
+        return audio_duration(audio_file)
+    except (ValueError, struct.error) as e:
+        print(f"分析文件 {audio_file} 时出错: {e}", file=sys.stderr)
+        return None
+    except OSError as e:
+        print(f"读取文件 {audio_file} 时出错: {e}", file=sys.stderr)
+        return _READ_ERROR
+
+def _read_bpm(audio_file):
+    """在线程池中估计单个文件的 BPM，无法得到时返回 0（与缓存中的记录方式一致），读取出错时返回 _READ_ERROR"""
+    try:
+        return audio_bpm(audio_file) or 0
+    except ValueError:
+        # 压缩格式等不支持节奏分析，不算出错
+        return 0
+    except (OSError, MemoryError) as e:
+        print(f"分析文件 {audio_file} 的节奏时出错: {e}", file=sys.stderr)
+        return _READ_ERROR
+
+def _analyse(audio_file, duration, tempo):
+    """读取缺少的时长和 BPM，返回 (时长, BPM)；duration 为 None 时读取时长，tempo 为 True 时估计 BPM"""
+    if duration is None:
+        duration = _read_duration(audio_file)
+    bpm = _read_bpm(audio_file) if tempo and duration not in (None, _READ_ERROR) else None
+    return duration, bpm
+
+def _round_duration(duration):
+    return round(duration, 2) if duration is not None else None
+
+def scan_audio(audio_files, index=None, max_workers=SCAN_WORKERS, tempo=False):
+    """获取音频时长和 BPM，按输入顺序逐个产出 (文件, 时长或 None, BPM 或 None)
+
+    先查询缓存，未命中的文件一次性提交给线程池并发读取文件头；tempo 为 True 时还会估计
+    缓存中尚无 BPM 的音频的节奏，否则 BPM 只取自缓存。
+    缓存只在调用方线程中读写（SQLite 连接不能跨线程使用）。
+    """
+    entries = []
+    for audio_file in audio_files:
+        try:
+            stat = os.stat(audio_file)
+        except OSError as e:
+            print(f"读取文件 {audio_file} 信息时出错: {e}", file=sys.stderr)
+            entries.append((audio_file, None, ()))
+            continue
+        cached = index.get(audio_file, stat) if index is not None else None
+        entries.append((audio_file, stat, cached))
+
+    # 需要读取的文件：{文件: (已缓存的时长, 是否估计 BPM)}
+    misses = {}
+    for audio_file, _, cached in entries:
+        if cached is None:
+            misses[audio_file] = (None, tempo)
+        elif cached and tempo and cached[1] is None:
+            misses[audio_file] = (cached[0], True)
+    if tempo:
+        max_workers = min(max_workers, TEMPO_WORKERS)
+    executor = None
+    futures = {}
+    if max_workers > 1 and len(misses) > 1:
+        if tempo:
+            preload_tempo()
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(misses)))
+        futures = {audio_file: executor.submit(_analyse, audio_file, *miss) for audio_file, miss in misses.items()}
+    try:
+        for audio_file, stat, cached in entries:
+            if audio_file in misses:
+                future = futures.get(audio_file)
+                duration, bpm = future.result() if future else _analyse(audio_file, *misses[audio_file])
+                if duration is _READ_ERROR:
+                    duration, cache_duration = None, False
+                else:
+                    cache_duration = True
+                if bpm is _READ_ERROR:
+                    bpm, cache_bpm = None, False
+                else:
+                    cache_bpm = bpm is not None
+                # 读取出错的结果不写入缓存，下次扫描时重新读取
+                if index is not None:
+                    if cached is None and cache_duration:
+                        index.put(audio_file, stat, duration, bpm)
+                    elif cached is not None and cache_bpm:
+                        index.put_bpm(audio_file, stat, bpm)
+            elif cached:
+                duration, bpm = cached
+            else:
+                duration, bpm = None, None
+            yield audio_file, _round_duration(duration), bpm or None
+    finally:
+        # 提前结束迭代时丢弃尚未开始的任务
+        for future in futures.values():
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+def scan_durations(audio_files, index=None, max_workers=SCAN_WORKERS):
+    """获取音频时长，按输入顺序逐个产出 (文件, 时长或 None)，见 scan_audio"""
+    results = scan_audio(audio_files, index, max_workers)
+    try:
+        for audio_file, duration, _ in results:
+            yield audio_file, duration
+    finally:
+        results.close()
+
+def _read_waveform(audio_file):
+    """在线程池中计算单个文件的波形缩略图，无法计算时返回 None，读取出错时返回 _READ_ERROR"""
+    try:
+        return waveform_overview(audio_file)
+    except ValueError:
+        # 压缩格式等无法读取采样，不算出错
+        return None
+    except (OSError, MemoryError) as e:
+        print(f"读取文件 {audio_file} 的波形时出错: {e}", file=sys.stderr)
+        return _READ_ERROR
+
+def scan_waveforms(audio_files, index=None, max_workers=TEMPO_WORKERS):
+    """获取音频的波形缩略图，按输入顺序逐个产出 (文件, 缩略图字节或 None)
+
+    先查询缓存，未缓存的文件提交给线程池读取采样；与 scan_audio 一样只在调用方线程中读写缓存。
+    """
+    entries = []
+    for audio_file in audio_files:
+        try:
+            stat = os.stat(audio_file)
+        except OSError:
+            entries.append((audio_file, None, b""))
+            continue
+        entries.append((audio_file, stat, index.get_waveform(audio_file, stat) if index is not None else None))
+
+    misses = [audio_file for audio_file, _, cached in entries if cached is None]
+    executor = None
+    futures = {}
+    if max_workers > 1 and len(misses) > 1:
+        preload_tempo()
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(misses)))
+        futures = {audio_file: executor.submit(_read_waveform, audio_file) for audio_file in misses}
+    try:
+        for audio_file, stat, cached in entries:
+            if cached is not None:
+                yield audio_file, cached or None
+                continue
+            future = futures.get(audio_file)
+            waveform = future.result() if future else _read_waveform(audio_file)
+            if waveform is _READ_ERROR:
+                # 读取出错不写入缓存，下次显示时重新读取
+                waveform = None
+            elif index is not None:
+                index.put_waveform(audio_file, stat, waveform)
+            yield audio_file, waveform
+    finally:
+        for future in futures.values():
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+def iter_batches(items, size=SCAN_BATCH):
+    """把结果按 size 个一组分批产出，便于界面批量刷新"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,100 @@
+import sys
+
+from .jsonbackend import load_json_file, resolve_backend
+from .stream import scan_chart
+
+# 谱面解析模式：full 使用 json 完整加载，stream 流式扫描并只读取所需字段
+PARSER_MODES = ("full", "stream")
+
+class Chart:
+    def __init__(self, file, bpm, aboveNumber, belowNumber, keyMaxTime, eventMaxTime):
+        # 文件名称
+        self.file = file
+        self.fileName = file
+        # 铺面 bpm
+        self.bpm = bpm
+        # 物量
+        self.aboveNumber = aboveNumber
+        self.belowNumber = belowNumber
+        self.objectNumber = aboveNumber + belowNumber
+        # 最后一个键的时间
+        self.keyMaxTime = keyMaxTime
+        self.keyMaxSecond = round(self.keyMaxTime / bpm * 1.875, 2)
+        # 最后一个事件的事件
+        self.eventMaxTime = eventMaxTime
+        self.eventMaxSecond = round(self.eventMaxTime / bpm * 1.875, 2)
+        # 曲长
+        self.maxTime = max(eventMaxTime, keyMaxTime)
+        self.audioLength = round(self.maxTime / bpm * 1.875, 2)
+        # 排名分数
+        self.sortingScore = 0
+
+    def __str__(self) -> str:
+        return f"<Chart '{self.fileName}', bpm={self.bpm}, number={self.objectNumber}, maxTime={self.maxTime}, audioLength={self.audioLength}s>"
+
+    def __repr__(self) -> str:
+        return f"<Chart {self.fileName}>"
+
+def parser_description(mode="full", backend="auto"):
+    """返回谱面解析方式的说明，用于状态栏显示"""
+    if mode == "stream":
+        return "流式扫描"
+    return f"JSON 后端 {resolve_backend(backend)[0]}"
+
+def analyseJsonChart(chartFile: str, mode="full", backend="auto"):
+    """分析铺面文件，生成 Chart 对象"""
+    return analyse_chart_file(chartFile, mode, backend)[0]
+
+def analyse_chart_file(chartFile, mode="full", backend="auto"):
+    """分析铺面文件，返回 (Chart 或 None, 结果是否可以缓存)
+
+    谱面格式错误时结果可以缓存；读取文件出错（如文件被占用、网络中断）通常是暂时的，不应缓存。
+    """
+    try:
+        return _read_chart(chartFile, mode, backend), True
+    except OSError as e:
+        print(f"读取文件 {chartFile} 时出错: {e}", file=sys.stderr)
+        return None, False
+    except Exception as e:
+        print(f"分析文件 {chartFile} 时出错: {e}", file=sys.stderr)
+        return None, True
+
+def _read_chart(chartFile, mode, backend):
+    """解析铺面文件，出错时抛出异常"""
+    if mode == "stream":
+        return Chart(chartFile, *scan_chart(chartFile))
+
+    jsonData = load_json_file(chartFile, backend)
+
+    # 铺面 bpm
+    bpm = jsonData["judgeLineList"][0]["bpm"]
+    # 物量
+    aboveNumber = 0
+    belowNumber = 0
+    # 最后一个键的时间
+    keyMaxTime = 0
+    # 最后一个事件的时间
+    eventMaxTime = 0
+
+    # 统计最后一个判定线动画的时间
+    for line in jsonData["judgeLineList"]:
+        aboveNumber += len(line["notesAbove"])
+        belowNumber += len(line["notesBelow"])
+
+        eventList = line["speedEvents"] + line["judgeLineMoveEvents"] + line["judgeLineRotateEvents"] + line["judgeLineDisappearEvents"]
+        for event in eventList:
+            eventMaxTime = max(event["startTime"], eventMaxTime)
+    
+    # 统计最后一个note的时间
+    for line in jsonData["judgeLineList"]:
+        for note in line["notesAbove"]:
+            keyMaxTime = max(note["time"], keyMaxTime)
+
+    return Chart(
+        chartFile,
+        bpm,
+        aboveNumber,
+        belowNumber,
+        keyMaxTime,
+        eventMaxTime
+    )
@@ -0,0 +1,264 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+from .align import align_audio
+from .audio import AUDIO_EXTENSIONS, is_audio_file, scan_audio
+from .chart import PARSER_MODES
+from .engine import analyse_charts
+from .fileindex import chart_candidates
+from .index import INDEX_FILE, AudioIndex, ChartIndex
+from .jsonbackend import BACKENDS
+from .pairing import PAIR_CANDIDATES, PAIR_TOLERANCE, group_songs, pair_songs, pairing_rows, write_pairing_report
+from .scoring import AUDIO_DURATION_WINDOW, AudioLibrary, ChartLibrary, apply_alignment
+
+# 结果的输出字段
+CHART_COLUMNS = ("rank", "file", "notes", "bpm", "length", "score", "match")
+AUDIO_COLUMNS = ("rank", "file", "duration", "bpm", "score", "match")
+# 给出谱面时音频结果附带对齐的相关系数和偏移（秒）
+ALIGNED_AUDIO_COLUMNS = ("rank", "file", "duration", "bpm", "confidence", "offset", "score", "match")
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m phichartsearch",
+        description="PhiChartSearch 命令行模式，不启动图形界面批量搜索谱面和音频"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_options = argparse.ArgumentParser(add_help=False)
+    index_options.add_argument("--index", default=INDEX_FILE, help=f"分析索引文件（默认 {INDEX_FILE}）")
+    index_options.add_argument("--no-index", action="store_true", help="不读取也不写入分析索引")
+
+    chart_options = argparse.ArgumentParser(add_help=False)
+    chart_options.add_argument("--workers", type=int, default=0, help="分析谱面的进程数，0 表示使用全部 CPU 核心")
+    chart_options.add_argument("--parser", choices=PARSER_MODES, default="full", help="谱面解析方式（默认 full）")
+    chart_options.add_argument("--backend", choices=("auto",) + BACKENDS, default="auto", help="JSON 解析库（默认 auto）")
+
+    common = argparse.ArgumentParser(add_help=False, parents=[index_options])
+    common.add_argument("--dir", required=True, help="要搜索的文件夹")
+    common.add_argument("--top", type=int, default=10, help="每次查询输出的结果数量（默认 10）")
+    common.add_argument("--queries", help="批量查询的 CSV 文件，表头为筛选条件的参数名（如 notes,bpm,length 或 duration）")
+    output = common.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_const", dest="format", const="json", help="以 JSON 格式输出")
+    output.add_argument("--csv", action="store_const", dest="format", const="csv", help="以 CSV 格式输出")
+    common.set_defaults(format="text")
+
+    search = subparsers.add_parser("search", parents=[common, chart_options], help="按物量、BPM、音频长度搜索谱面")
+    search.add_argument("--keyword", default="#", help="文件名需要包含的关键词，如难度 IN、AT（默认 #）")
+    search.add_argument("--notes", type=int, help="目标物量")
+    search.add_argument("--bpm", type=int, help="目标 BPM")
+    search.add_argument("--length", type=int, help="目标音频长度（秒）")
+
+    audio = subparsers.add_parser("audio", parents=[common], help=f"按时长搜索音频（{'/'.join(AUDIO_EXTENSIONS)}）")
+    audio.add_argument("--duration", type=float, help="目标音频时长（秒）")
+    audio.add_argument("--bpm", type=float, help="目标 BPM，给出时分析 WAV 音频的节奏并一同匹配（结果写入索引）")
+    audio.add_argument("--chart", help="谱面文件，给出时把谱面的 note 与每个查询的结果（WAV）对齐，按对齐结果重新排序")
+
+    pair = subparsers.add_parser("pair", parents=[index_options, chart_options], help="为整个谱面文件夹中的每首曲目自动配对音频，输出 CSV 报告")
+    pair.add_argument("--charts", required=True, help="谱面文件夹（TextAsset）")
+    pair.add_argument("--audio", required=True, help="音频文件夹")
+    pair.add_argument("--out", help="报告文件路径（默认输出到标准输出）")
+    pair.add_argument("--tolerance", type=float, default=PAIR_TOLERANCE, help=f"允许的时长误差（秒，默认 {PAIR_TOLERANCE}，最大 {AUDIO_DURATION_WINDOW}：误差更大时匹配度为 0）")
+    pair.add_argument("--candidates", type=int, default=PAIR_CANDIDATES, help=f"每首曲目参与分配的候选音频数量（默认 {PAIR_CANDIDATES}）")
+    pair.add_argument("--tempo", action="store_true", help="分析 WAV 音频的 BPM，与谱面 BPM 一同比较（结果写入索引）")
+    return parser
+
+def read_queries(path, fields, convert):
+    """读取批量查询文件，每行返回一个 {参数名: 值或 None} 的字典"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        unknown = set(reader.fieldnames or ()) - set(fields)
+        if unknown:
+            raise ValueError(f"查询文件包含未知的列：{', '.join(sorted(unknown))}")
+        return [
+            {field: convert(row[field]) if row.get(field, "").strip() else None for field in fields}
+            for row in reader
+        ]
+
+def collect_queries(args, fields, convert):
+    """合并命令行参数和查询文件中的筛选条件，每个查询至少需要一个条件"""
+    if args.queries:
+        queries = read_queries(args.queries, fields, convert)
+    else:
+        queries = [{field: getattr(args, field) for field in fields}]
+    if not queries:
+        raise ValueError("查询文件中没有查询")
+    for i, query in enumerate(queries):
+        if all(value is None for value in query.values()):
+            raise ValueError(f"第 {i + 1} 个查询缺少筛选条件")
+    return queries
+
+def open_index(args, index_class):
+    return None if args.no_index else index_class(args.index)
+
+def search_charts(args):
+    """分析文件夹中的谱面，对每个查询输出匹配结果"""
+    queries = collect_queries(args, ("notes", "bpm", "length"), int)
+    chart_files = chart_candidates(args.dir, args.keyword)
+
+    index = open_index(args, ChartIndex)
+    try:
+        charts = [
+            chart for _, chart in analyse_charts(chart_files, index, args.workers, mode=args.parser, backend=args.backend)
+            if chart
+        ]
+    finally:
+        if index is not None:
+            index.close()
+
+    # 谱面只分析一次，所有查询共用同一个谱面库
+    library = ChartLibrary(charts)
+    results = []
+    for query in queries:
+        rows = []
+        for chart in library.search(query["notes"], query["bpm"], query["length"], k=args.top):
+            if chart.sortingScore <= 0:
+                continue
+            rows.append({
+                "rank": len(rows) + 1,
+                "file": chart.fileName,
+                "notes": chart.objectNumber,
+                "bpm": chart.bpm,
+                "length": chart.audioLength,
+                "score": round(chart.sortingScore, 4),
+                "match": round(chart.sortingScore / 30, 4),
+            })
+        results.append((query, rows))
+    return results, CHART_COLUMNS
+
+def load_audio(args, folder, tempo=False):
+    """读取文件夹中全部音频的时长（以及需要时的 BPM），返回可以读取的音频对象列表"""
+    audio_files = [os.path.join(folder, f) for f in os.listdir(folder) if is_audio_file(f)]
+    index = open_index(args, AudioIndex)
+    try:
+        return [
+            type('AudioFile', (), {
+                'file': os.path.basename(audio_file),
+                'fileName': os.path.basename(audio_file),
+                'duration': duration,
+                'bpm': bpm,
+                'sortingScore': 0
+            })()
+            for audio_file, duration, bpm in scan_audio(audio_files, index, tempo=tempo)
+            if duration is not None
+        ]
+    finally:
+        if index is not None:
+            index.close()
+
+def search_audio(args):
+    """读取文件夹中的音频时长（以及需要时的 BPM），对每个查询输出匹配结果"""
+    queries = collect_queries(args, ("duration", "bpm"), float)
+    for i, query in enumerate(queries):
+        if query["duration"] is None:
+            raise ValueError(f"第 {i + 1} 个查询缺少目标时长")
+    audio_objects = load_audio(args, args.dir, tempo=any(query["bpm"] for query in queries))
+
+    library = AudioLibrary(audio_objects)
+    results = []
+    for query in queries:
+        matches = [audio for audio in library.search(query["duration"], k=args.top, target_bpm=query["bpm"]) if audio.sortingScore > 0]
+        if args.chart:
+            paths = [os.path.join(args.dir, audio.fileName) for audio in matches]
+            matches = apply_alignment(matches, align_audio(args.chart, paths))
+        rows = []
+        for audio in matches:
+            row = {
+                "rank": len(rows) + 1,
+                "file": audio.fileName,
+                "duration": audio.duration,
+                "bpm": audio.bpm,
+                "score": round(audio.sortingScore, 4),
+                "match": round(audio.sortingScore / 10, 4),
+            }
+            if args.chart:
+                row["confidence"], row["offset"] = audio.alignment or (None, None)
+            rows.append(row)
+        results.append((query, rows))
+    return results, ALIGNED_AUDIO_COLUMNS if args.chart else AUDIO_COLUMNS
+
+def pair_library(args):
+    """分析整个谱面文件夹和音频文件夹，每首曲目的谱面只分析一次、音频只读取一次，返回配对报告的行"""
+    chart_files = chart_candidates(args.charts)
+    index = open_index(args, ChartIndex)
+    try:
+        charts = [
+            chart for _, chart in analyse_charts(chart_files, index, args.workers, mode=args.parser, backend=args.backend)
+            if chart
+        ]
+    finally:
+        if index is not None:
+            index.close()
+    audio_objects = load_audio(args, args.audio, tempo=args.tempo)
+
+    songs = group_songs(charts)
+    pairs = pair_songs(songs, audio_objects, args.tolerance, args.candidates, args.tempo)
+    return pairing_rows(songs, audio_objects, pairs)
+
+def write_results(results, columns, output_format, out):
+    """按指定格式输出结果，批量查询时每行附带查询条件；没有结果时只输出空列表或表头"""
+    batch = len(results) > 1
+    if output_format == "json":
+        if batch:
+            data = [{"query": query, "results": rows} for query, rows in results]
+        else:
+            data = results[0][1] if results else []
+        json.dump(data, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    elif output_format == "csv":
+        # 批量查询时查询条件加上 target_ 前缀，避免与结果字段重名
+        fieldnames = list(columns)
+        if batch:
+            fieldnames = ["query"] + [f"target_{field}" for field in results[0][0]] + fieldnames
+        writer = csv.DictWriter(out, fieldnames=fieldnames, lineterminator="\n")
+        writer.writeheader()
+        for i, (query, rows) in enumerate(results):
+            targets = {f"target_{field}": value for field, value in query.items()}
+            for row in rows:
+                writer.writerow({"query": i + 1, **targets, **row} if batch else row)
+    else:
+        for i, (query, rows) in enumerate(results):
+            if batch:
+                conditions = ", ".join(f"{key}={value}" for key, value in query.items() if value is not None)
+                out.write(f"# 查询 {i + 1}：{conditions}\n")
+            if not rows:
+                out.write("未找到任何匹配项目。\n")
+            for row in rows:
+                # 未分析节奏的音频没有 BPM
+                values = [
+                    f"{row['match']:.2%}" if column == "match" else "-" if row[column] is None else str(row[column])
+                    for column in columns if column != "score"
+                ]
+                out.write("\t".join(values) + "\n")
+
+def main(argv=None):
+    """命令行入口，返回退出码"""
+    args = build_parser().parse_args(argv)
+    folders = (args.charts, args.audio) if args.command == "pair" else (args.dir,)
+    for folder in folders:
+        if not os.path.isdir(folder):
+            print(f"路径不存在：{folder}", file=sys.stderr)
+            return 2
+    try:
+        if args.command == "pair":
+            rows = pair_library(args)
+            if args.out:
+                # 带 BOM 以便 Excel 正确识别中文
+                with open(args.out, 'w', newline='', encoding='utf-8-sig') as f:
+                    write_pairing_report(rows, f)
+            else:
+                write_pairing_report(rows, sys.stdout)
+            return 0
+        if args.command == "search":
+            results, columns = search_charts(args)
+        else:
+            results, columns = search_audio(args)
+    except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+        # sqlite3.Error：索引文件损坏或无法写入
+        print(f"搜索失败：{e}", file=sys.stderr)
+        return 1
+    write_results(results, columns, args.format, sys.stdout)
+    return 0
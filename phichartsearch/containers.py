@@ -0,0 +1,255 @@
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+# WAV 编码格式
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# data 块大小未知时（流式写入或 RF64）填写的占位值
+_UNKNOWN_SIZE = 0xFFFFFFFF
+
+def _read_chunks(f, file_size):
+    """逐个读取块头，返回 {块 ID: (数据偏移, 块大小)}，只保留 fmt/fact/data/ds64"""
+    chunks = {}
+    pos = 12
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        chunk_id, size = struct.unpack('<4sI', header)
+        if chunk_id in (b'fmt ', b'fact', b'ds64'):
+            chunks[chunk_id] = (pos + 8, f.read(min(size, 64)))
+        elif chunk_id == b'data':
+            chunks[chunk_id] = (pos + 8, size)
+            # data 之后的块不影响时长，data 大小未知时也无法继续向后查找
+            break
+        # 块按 2 字节对齐
+        pos += 8 + size + (size & 1)
+    return chunks
+
+# WAV 的格式信息；format_tag 为扩展格式中的实际编码，fact_frames 为 fact 块记录的采样帧数（没有时为 None）
+WavFormat = namedtuple("WavFormat", (
+    "format_tag", "channels", "sample_rate", "byte_rate", "block_align", "bits_per_sample",
+    "data_offset", "data_size", "fact_frames",
+))
+
+def wav_format(audio_path):
+    """只读取 RIFF 块头，返回 WavFormat
+
+    支持 PCM、浮点、WAVE_FORMAT_EXTENSIBLE 以及 RF64，不读取音频数据。
+    文件无法识别时抛出 ValueError。
+    """
+    file_size = os.path.getsize(audio_path)
+    with open(audio_path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12).ljust(12, b'\0'))
+        if riff not in (b'RIFF', b'RF64') or wave_id != b'WAVE':
+            raise ValueError("不是 WAV 文件")
+        chunks = _read_chunks(f, file_size)
+
+    if b'fmt ' not in chunks or b'data' not in chunks:
+        raise ValueError("缺少 fmt 或 data 块")
+    fmt = chunks[b'fmt '][1]
+    if len(fmt) < 16:
+        raise ValueError("fmt 块不完整")
+    format_tag, channels, sample_rate, byte_rate, block_align, bits_per_sample = struct.unpack('<HHIIHH', fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # 扩展格式的实际编码保存在子格式 GUID 的前两个字节
+        format_tag = struct.unpack('<H', fmt[24:26])[0]
+    if not sample_rate or not channels:
+        raise ValueError("采样率或声道数为 0")
+
+    data_offset, data_size = chunks[b'data']
+    if riff == b'RF64' and b'ds64' in chunks and len(chunks[b'ds64'][1]) >= 16:
+        data_size = struct.unpack('<Q', chunks[b'ds64'][1][8:16])[0]
+    # 大小缺失或超出文件时以文件实际长度为准
+    if data_size == _UNKNOWN_SIZE or data_offset + data_size > file_size:
+        data_size = file_size - data_offset
+
+    fact_frames = None
+    if b'fact' in chunks and len(chunks[b'fact'][1]) >= 4:
+        fact_frames = struct.unpack('<I', chunks[b'fact'][1][:4])[0]
+    return WavFormat(format_tag, channels, sample_rate, byte_rate, block_align, bits_per_sample,
+                     data_offset, data_size, fact_frames)
+
+def wav_duration(audio_path):
+    """只读取 RIFF 块头计算 WAV 时长（秒），文件无法识别时抛出 ValueError"""
+    fmt = wav_format(audio_path)
+    if fmt.format_tag in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) and fmt.block_align:
+        return (fmt.data_size // fmt.block_align) / fmt.sample_rate
+    # 压缩格式优先使用 fact 块记录的采样帧数
+    if fmt.fact_frames is not None:
+        return fmt.fact_frames / fmt.sample_rate
+    if fmt.byte_rate:
+        return fmt.data_size / fmt.byte_rate
+    raise ValueError("无法计算时长")
+
+# 读取文件开头的字节数（MP3 跳过 ID3v2 标签之后计算），足以包含首帧或 Ogg 首页
+HEAD_SIZE = 16 * 1024
+# Ogg 读取文件末尾的字节数，不小于一个 Ogg 页的最大长度（约 64KB）
+TAIL_SIZE = 64 * 1024
+
+def _skip_id3v2(f):
+    """跳过文件开头的 ID3v2 标签（FLAC 和 MP3 都可能带有），返回音频数据的起始位置"""
+    f.seek(0)
+    header = f.read(10)
+    if len(header) == 10 and header[:3] == b'ID3':
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        # 带有页脚时多 10 字节
+        return 10 + size + (10 if header[5] & 0x10 else 0)
+    return 0
+
+def flac_duration(audio_path):
+    """读取 FLAC STREAMINFO 块中的采样率和总采样数计算时长（秒）"""
+    with open(audio_path, 'rb') as f:
+        f.seek(_skip_id3v2(f))
+        if f.read(4) != b'fLaC':
+            raise ValueError("不是 FLAC 文件")
+        # STREAMINFO 必须是第一个元数据块
+        block_header = f.read(4)
+        if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+            raise ValueError("缺少 STREAMINFO 块")
+        streaminfo = f.read(34)
+    if len(streaminfo) < 18:
+        raise ValueError("STREAMINFO 块不完整")
+    # 第 10~17 字节依次为：采样率 20 位、声道数 3 位、位深 5 位、总采样数 36 位
+    packed = struct.unpack('>Q', streaminfo[10:18])[0]
+    sample_rate = packed >> 44
+    total_samples = packed & 0xFFFFFFFFF
+    if not sample_rate:
+        raise ValueError("采样率为 0")
+    if not total_samples:
+        raise ValueError("STREAMINFO 未记录总采样数")
+    return total_samples / sample_rate
+
+def _ogg_page(buf, pos):
+    """解析 pos 处的 Ogg 页头，返回 (颗粒位置, 流序号, 页数据起始位置, 页数据长度)"""
+    if buf[pos:pos + 4] != b'OggS' or len(buf) < pos + 27 or buf[pos + 4] != 0:
+        return None
+    granule, serial = struct.unpack_from('<qI', buf, pos + 6)
+    segments = buf[pos + 26]
+    body = pos + 27 + segments
+    if len(buf) < body:
+        return None
+    return granule, serial, body, sum(buf[pos + 27:body])
+
+def ogg_duration(audio_path):
+    """读取 Ogg 首页的编码头和最后一页的颗粒位置计算时长（秒），支持 Vorbis 和 Opus"""
+    file_size = os.path.getsize(audio_path)
+    with open(audio_path, 'rb') as f:
+        head = f.read(HEAD_SIZE)
+        f.seek(max(0, file_size - TAIL_SIZE))
+        tail = f.read()
+
+    page = _ogg_page(head, 0)
+    if page is None:
+        raise ValueError("不是 Ogg 文件")
+    _, serial, body, length = page
+    packet = head[body:body + length]
+    if packet[:7] == b'\x01vorbis' and len(packet) >= 16:
+        sample_rate = struct.unpack_from('<I', packet, 12)[0]
+        pre_skip = 0
+    elif packet[:8] == b'OpusHead' and len(packet) >= 12:
+        # Opus 的颗粒位置固定以 48kHz 计数，开头需要去掉 pre-skip 个采样
+        sample_rate = 48000
+        pre_skip = struct.unpack_from('<H', packet, 10)[0]
+    else:
+        raise ValueError("不支持的 Ogg 编码")
+    if not sample_rate:
+        raise ValueError("采样率为 0")
+
+    # 从文件末尾向前查找同一逻辑流中颗粒位置有效的最后一页
+    pos = len(tail)
+    while True:
+        pos = tail.rfind(b'OggS', 0, pos)
+        if pos < 0:
+            raise ValueError("找不到 Ogg 结束页")
+        page = _ogg_page(tail, pos)
+        if page is not None and page[1] == serial and page[0] >= 0:
+            return max(0, page[0] - pre_skip) / sample_rate
+
+# MPEG 音频帧头各字段对应的取值，下标为帧头中的编码
+_MP3_VERSIONS = (2.5, None, 2, 1)
+_MP3_LAYERS = (None, 3, 2, 1)
+_MP3_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    2.5: (11025, 12000, 8000),
+}
+_MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+def _mp3_frame(buf, pos):
+    """解析 pos 处的 MPEG 音频帧头，返回 (帧长度, 每帧采样数, 采样率, 版本, 是否单声道)，无效时返回 None"""
+    if len(buf) < pos + 4:
+        return None
+    header = struct.unpack_from('>I', buf, pos)[0]
+    if header >> 21 != 0x7FF:
+        return None
+    version = _MP3_VERSIONS[(header >> 19) & 3]
+    layer = _MP3_LAYERS[(header >> 17) & 3]
+    bitrate_index = (header >> 12) & 15
+    sample_rate_index = (header >> 10) & 3
+    # 不支持自由码率（0）和保留值
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    padding = (header >> 9) & 1
+    mono = (header >> 6) & 3 == 3
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate, version, mono
+    samples = 576 if layer == 3 and version != 1 else 1152
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate, version, mono
+
+def _find_mp3_frame(buf, start):
+    """从 start 开始查找第一个有效帧，要求下一帧紧接其后以排除偶然出现的同步字"""
+    pos = buf.find(b'\xff', start)
+    while pos >= 0:
+        frame = _mp3_frame(buf, pos)
+        if frame is not None:
+            following = _mp3_frame(buf, pos + frame[0])
+            if following is not None or len(buf) < pos + frame[0] + 4:
+                return pos, frame
+        pos = buf.find(b'\xff', pos + 1)
+    raise ValueError("找不到 MPEG 音频帧")
+
+def mp3_duration(audio_path):
+    """计算 MP3 时长（秒）：优先读取首帧中的 Xing/Info 或 VBRI 头，没有时逐帧扫描帧头"""
+    with open(audio_path, 'rb') as f:
+        start = _skip_id3v2(f)
+        f.seek(start)
+        head = f.read(HEAD_SIZE)
+        pos, (length, samples, sample_rate, version, mono) = _find_mp3_frame(head, 0)
+
+        # Xing/Info 头位于边信息之后，记录了总帧数（不含自身）
+        side_info = (17 if mono else 32) if version == 1 else (9 if mono else 17)
+        xing = pos + 4 + side_info
+        if head[xing:xing + 4] in (b'Xing', b'Info') and len(head) >= xing + 12:
+            flags = struct.unpack_from('>I', head, xing + 4)[0]
+            if flags & 1:
+                return struct.unpack_from('>I', head, xing + 8)[0] * samples / sample_rate
+        # VBRI 头固定位于帧头之后 32 字节
+        vbri = pos + 36
+        if head[vbri:vbri + 4] == b'VBRI' and len(head) >= vbri + 18:
+            return struct.unpack_from('>I', head, vbri + 14)[0] * samples / sample_rate
+
+        # 没有 VBR 头时逐帧累加，只解析帧头，不解码音频数据
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            pos += start
+            duration = 0
+            while True:
+                frame = _mp3_frame(buf, pos)
+                if frame is None:
+                    return duration
+                duration += frame[1] / frame[2]
+                pos += frame[0]
@@ -0,0 +1,71 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .chart import Chart, analyse_chart_file
+
+# 每次提交给进程池的谱面数量
+CHUNK_SIZE = 16
+# 待分析文件少于该数量时直接在当前进程分析，避免进程池的启动开销
+PARALLEL_THRESHOLD = 32
+# Windows 下 ProcessPoolExecutor 最多支持 61 个进程
+MAX_WORKERS_LIMIT = 61
+
+def resolve_workers(max_workers):
+    """解析进程数配置，0 或 None 表示使用全部CPU核心"""
+    if not max_workers or max_workers < 1:
+        max_workers = os.cpu_count() or 1
+    return min(max_workers, MAX_WORKERS_LIMIT)
+
+def _analyse_chunk(chart_files, mode, backend):
+    """在子进程中分析一组谱面文件"""
+    return [(chart_file, *analyse_chart_file(chart_file, mode, backend)) for chart_file in chart_files]
+
+def analyse_parallel(chart_files, max_workers=0, chunk_size=CHUNK_SIZE, mode="full", backend="auto"):
+    """使用进程池并行分析谱面文件，按完成顺序逐个产出 (文件, Chart 或 None, 结果是否可以缓存)"""
+    chart_files = list(chart_files)
+    max_workers = resolve_workers(max_workers)
+    if max_workers == 1 or len(chart_files) < PARALLEL_THRESHOLD:
+        for chart_file in chart_files:
+            yield (chart_file, *analyse_chart_file(chart_file, mode, backend))
+        return
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    futures = [
+        executor.submit(_analyse_chunk, chart_files[i:i + chunk_size], mode, backend)
+        for i in range(0, len(chart_files), chunk_size)
+    ]
+    try:
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        # 提前结束迭代（如取消搜索）时丢弃尚未开始的任务
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+def analyse_charts(chart_files, index=None, max_workers=0, chunk_size=CHUNK_SIZE, mode="full", backend="auto"):
+    """分析谱面文件：先查询索引，未命中的文件交给进程池并行分析，逐个产出 (文件, Chart 或 None)"""
+    pending = []
+    stats = {}
+    for chart_file in chart_files:
+        if index is None:
+            pending.append(chart_file)
+            continue
+        try:
+            stat = os.stat(chart_file)
+        except OSError as e:
+            print(f"读取文件 {chart_file} 信息时出错: {e}", file=sys.stderr)
+            yield chart_file, None
+            continue
+        cached = index.get(chart_file, stat)
+        if cached is None:
+            stats[chart_file] = stat
+            pending.append(chart_file)
+        else:
+            yield chart_file, Chart(chart_file, *cached) if cached else None
+
+    for chart_file, chart, cacheable in analyse_parallel(pending, max_workers, chunk_size, mode, backend):
+        # 读取出错的文件不写入索引，下次搜索时重新分析
+        if index is not None and cacheable:
+            index.put(chart_file, stats[chart_file], chart)
+        yield chart_file, chart
@@ -0,0 +1,70 @@
+import os
+import threading
+
+# 已建立的文件名索引，按文件夹缓存：{文件夹绝对路径: (文件夹修改时间, 索引)}
+_indexes = {}
+_lock = threading.Lock()
+
+def parse_chart_name(name):
+    """从谱面文件名中解析 (曲目, 难度)，如 Song.Artist.0-#Chart_IN.json 解析为 ("Song.Artist.0", "IN")
+
+    文件名不含 # 时不是谱面，返回 None。
+    """
+    song, sep, rest = name.partition('#')
+    if not sep:
+        return None
+    stem = os.path.splitext(rest)[0]
+    tag = stem.rpartition('_')[2]
+    return song.rstrip('-. '), tag
+
+class FilenameIndex:
+    """文件夹中谱面文件名的索引，按难度和曲目分组，关键词搜索时不必逐个检查文件名"""
+
+    def __init__(self, folder):
+        # 文件名包含 # 的文件，其余文件不会参与任何搜索
+        self.names = []
+        self.by_tag = {}
+        self.by_song = {}
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                parsed = parse_chart_name(entry.name)
+                if parsed is None:
+                    continue
+                song, tag = parsed
+                self.names.append(entry.name)
+                self.by_tag.setdefault(tag, []).append(entry.name)
+                self.by_song.setdefault(song, []).append(entry.name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def candidates(self, keyword="#"):
+        """返回符合关键词的谱面文件名
+
+        关键词为空或 # 时返回全部谱面；关键词是难度（如 IN、AT）或曲目名时直接取对应分组；
+        其余关键词按文件名包含关键词筛选。
+        """
+        if not keyword or keyword == "#":
+            return self.names
+        if keyword in self.by_tag:
+            return self.by_tag[keyword]
+        if keyword in self.by_song:
+            return self.by_song[keyword]
+        return [name for name in self.names if keyword in name]
+
+def get_filename_index(folder):
+    """返回文件夹的文件名索引，文件夹中增删或重命名文件（修改时间改变）后重新建立"""
+    folder = os.path.abspath(folder)
+    mtime = os.stat(folder).st_mtime_ns
+    with _lock:
+        cached = _indexes.get(folder)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    index = FilenameIndex(folder)
+    with _lock:
+        _indexes[folder] = (mtime, index)
+    return index
+
+def chart_candidates(folder, keyword="#"):
+    """返回文件夹中符合关键词的谱面文件路径"""
+    return [os.path.join(folder, name) for name in get_filename_index(folder).candidates(keyword)]
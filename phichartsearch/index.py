@@ -0,0 +1,146 @@
+import os
+import sqlite3
+
+# 索引文件路径（与配置文件放在同一目录）
+INDEX_FILE = "chart_analyzer_index.db"
+
+# 音频缓存在旧版本之后新增的列，打开旧索引时补上
+AUDIO_EXTRA_COLUMNS = (("bpm", "REAL"), ("waveform", "BLOB"))
+
+# 索引中保存的 Chart 字段（顺序与 Chart 构造参数一致）
+CHART_FIELDS = ("bpm", "aboveNumber", "belowNumber", "keyMaxTime", "eventMaxTime")
+
+class ChartIndex:
+    """谱面分析索引，按路径、大小和修改时间缓存 analyseJsonChart 的结果"""
+
+    def __init__(self, index_file=INDEX_FILE):
+        self.conn = sqlite3.connect(index_file)
+        # 字段不声明类型，保持 bpm 等数值原本的 int/float 类型
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS charts (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL,
+                valid INTEGER NOT NULL,
+                bpm, aboveNumber, belowNumber, keyMaxTime, eventMaxTime, audioLength
+            )"""
+        )
+
+    def get(self, chart_file, stat):
+        """读取缓存结果：命中返回字段元组，已知无效的文件返回空元组，未命中或文件已变化返回 None"""
+        row = self.conn.execute(
+            "SELECT size, mtime, valid, bpm, aboveNumber, belowNumber, keyMaxTime, eventMaxTime "
+            "FROM charts WHERE path = ?",
+            (os.path.abspath(chart_file),)
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        if not row[2]:
+            return ()
+        return row[3:]
+
+    def put(self, chart_file, stat, chart):
+        """写入分析结果，chart 为 None 时记录为无效文件，避免重复分析"""
+        if chart is None:
+            values = (0, None, None, None, None, None, None)
+        else:
+            values = (1,) + tuple(getattr(chart, field) for field in CHART_FIELDS) + (chart.audioLength,)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO charts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (os.path.abspath(chart_file), stat.st_size, stat.st_mtime_ns) + values
+        )
+
+    def commit(self):
+        """提交本次搜索写入的结果"""
+        self.conn.commit()
+
+    def close(self):
+        """提交并关闭索引"""
+        self.conn.commit()
+        self.conn.close()
+
+class AudioIndex(ChartIndex):
+    """音频时长、BPM 和波形缩略图缓存，与谱面索引保存在同一个文件中
+
+    bpm 为 NULL 表示尚未分析节奏，为 0 表示分析过但无法得到 BPM（找不到节奏或格式不支持）；
+    waveform 为波形缩略图，NULL 表示尚未计算，空字节表示无法计算。
+    波形可以先于时长写入，此时 valid 为 1 而 duration 为 NULL，读取时长时视为未命中。
+    """
+
+    def __init__(self, index_file=INDEX_FILE):
+        self.conn = sqlite3.connect(index_file)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS audio (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL,
+                valid INTEGER NOT NULL,
+                duration REAL,
+                bpm REAL,
+                waveform BLOB
+            )"""
+        )
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(audio)")]
+        for name, column_type in AUDIO_EXTRA_COLUMNS:
+            if name not in columns:
+                self.conn.execute(f"ALTER TABLE audio ADD COLUMN {name} {column_type}")
+
+    def get(self, audio_file, stat):
+        """读取缓存结果：命中返回 (时长, BPM)，已知无效的文件返回空元组，未命中或文件已变化返回 None"""
+        row = self.conn.execute(
+            "SELECT size, mtime, valid, duration, bpm FROM audio WHERE path = ?",
+            (os.path.abspath(audio_file),)
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        if not row[2]:
+            return ()
+        if row[3] is None:
+            return None
+        return row[3:]
+
+    def put(self, audio_file, stat, duration, bpm=None):
+        """写入音频时长和 BPM，duration 为 None 时记录为无效文件
+
+        文件未变化时保留已缓存的波形，以及 bpm 为 None 时已缓存的 BPM。
+        """
+        self.conn.execute(
+            """INSERT INTO audio (path, size, mtime, valid, duration, bpm) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                bpm = coalesce(excluded.bpm, CASE WHEN size = excluded.size AND mtime = excluded.mtime THEN bpm END),
+                waveform = CASE WHEN size = excluded.size AND mtime = excluded.mtime THEN waveform END,
+                size = excluded.size, mtime = excluded.mtime, valid = excluded.valid, duration = excluded.duration""",
+            (os.path.abspath(audio_file), stat.st_size, stat.st_mtime_ns, int(duration is not None), duration, bpm)
+        )
+
+    def put_bpm(self, audio_file, stat, bpm):
+        """为已缓存时长的音频补充 BPM，文件在缓存之后变化过时不写入"""
+        self.conn.execute(
+            "UPDATE audio SET bpm = ? WHERE path = ? AND size = ? AND mtime = ?",
+            (bpm, os.path.abspath(audio_file), stat.st_size, stat.st_mtime_ns)
+        )
+
+    def get_waveform(self, audio_file, stat):
+        """读取波形缩略图：未计算或文件已变化返回 None，无法计算的文件返回空字节"""
+        row = self.conn.execute(
+            "SELECT size, mtime, waveform FROM audio WHERE path = ?",
+            (os.path.abspath(audio_file),)
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns:
+            return None
+        return row[2]
+
+    def put_waveform(self, audio_file, stat, waveform):
+        """保存波形缩略图，waveform 为 None 时记录为无法计算
+
+        文件未变化时保留已缓存的时长和 BPM；文件已变化或尚未缓存时，时长和 BPM 留待下次扫描读取。
+        """
+        self.conn.execute(
+            """INSERT INTO audio (path, size, mtime, valid, waveform) VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                valid = CASE WHEN size = excluded.size AND mtime = excluded.mtime THEN valid ELSE 1 END,
+                duration = CASE WHEN size = excluded.size AND mtime = excluded.mtime THEN duration END,
+                bpm = CASE WHEN size = excluded.size AND mtime = excluded.mtime THEN bpm END,
+                size = excluded.size, mtime = excluded.mtime, waveform = excluded.waveform""",
+            (os.path.abspath(audio_file), stat.st_size, stat.st_mtime_ns, waveform if waveform is not None else b"")
+        )
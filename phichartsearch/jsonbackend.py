@@ -0,0 +1,55 @@
+import json
+
+# 可选的 JSON 解析库，按解析速度从快到慢排列，json 为标准库兜底
+BACKENDS = ("orjson", "simdjson", "ujson", "json")
+
+# 已解析的后端缓存（每个进程各自缓存）
+_resolved = {}
+
+# 部分编辑器保存的谱面以 UTF-8 BOM 开头，标准库能识别，orjson 等后端会报错
+UTF8_BOM = b"\xef\xbb\xbf"
+
+def _import_loads(name):
+    """导入指定后端并返回其 loads 函数，未安装时返回 None"""
+    try:
+        if name == "orjson":
+            import orjson
+            return orjson.loads
+        if name == "simdjson":
+            import simdjson
+            return simdjson.loads
+        if name == "ujson":
+            import ujson
+            return ujson.loads
+    except ImportError:
+        return None
+    # 标准库可以直接解析 bytes，会自动识别编码
+    return json.loads
+
+def available_backends():
+    """返回当前环境中可用的后端名称"""
+    return [name for name in BACKENDS if _import_loads(name) is not None]
+
+def resolve_backend(backend="auto"):
+    """解析后端配置，返回 (实际使用的后端名称, loads 函数)
+
+    backend 为 auto 或指定的后端未安装时，使用可用后端中最快的一个。
+    """
+    if backend not in _resolved:
+        loads = _import_loads(backend) if backend in BACKENDS else None
+        name = backend
+        if loads is None:
+            for name in BACKENDS:
+                loads = _import_loads(name)
+                if loads is not None:
+                    break
+        _resolved[backend] = (name, loads)
+    return _resolved[backend]
+
+def load_json_file(path, backend="auto"):
+    """以二进制方式读取文件并用选定的后端解析，开头的 UTF-8 BOM 先去掉，各后端结果一致"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(UTF8_BOM):
+        data = data[len(UTF8_BOM):]
+    return resolve_backend(backend)[1](data)
@@ -0,0 +1,109 @@
+import csv
+import os
+from bisect import bisect_left, bisect_right
+
+from .fileindex import parse_chart_name
+from .scoring import AUDIO_DURATION_WINDOW, audio_scores
+from .startup import lazy_import
+
+np = lazy_import("numpy")
+
+# 默认允许的时长误差（秒），超出的音频不会与曲目配对；
+# 时长相差 AUDIO_DURATION_WINDOW 秒以上时匹配度为 0，更大的误差不起作用
+PAIR_TOLERANCE = 2.0
+# 每首曲目最多保留的候选音频数量，音频很多时限制参与分配的配对数
+PAIR_CANDIDATES = 20
+
+# 配对报告的字段
+PAIR_COLUMNS = ("song", "charts", "length", "bpm", "audio", "duration", "audio_bpm", "score", "match")
+
+class Song:
+    """同一首曲目的全部谱面（各难度共用一个音频）"""
+
+    def __init__(self, name, charts):
+        self.name = name
+        self.charts = charts
+        # 各难度谱面的最后一个事件时间不同，取最长的作为曲目时长
+        self.length = max(chart.audioLength for chart in charts)
+        self.bpm = charts[0].bpm
+
+def group_songs(charts):
+    """按文件名中的曲目名把谱面分组，返回按曲目名排序的 Song 列表"""
+    groups = {}
+    for chart in charts:
+        name = os.path.basename(chart.fileName)
+        parsed = parse_chart_name(name)
+        groups.setdefault(parsed[0] if parsed else name, []).append(chart)
+    return [Song(name, groups[name]) for name in sorted(groups)]
+
+def candidate_pairs(songs, audio_files, tolerance=PAIR_TOLERANCE, k=PAIR_CANDIDATES, tempo=False):
+    """为每首曲目找出时长相差 tolerance 秒以内、匹配度最高的 k 个音频，返回 [(匹配度, 曲目下标, 音频下标)]
+
+    音频按时长排序后二分查找时长窗口，窗口内的匹配度用 NumPy 一次算出；tempo 为 True 时同时比较 BPM。
+    tolerance 最大为 AUDIO_DURATION_WINDOW，超出这个范围的音频匹配度都是 0。
+    """
+    tolerance = min(tolerance, AUDIO_DURATION_WINDOW)
+    order = sorted(range(len(audio_files)), key=lambda i: audio_files[i].duration)
+    durations = [audio_files[i].duration for i in order]
+    duration_array = np.array(durations, dtype=np.float64)
+    bpm_array = np.array([getattr(audio_files[i], 'bpm', None) or np.nan for i in order], dtype=np.float64)
+    order = np.array(order, dtype=np.intp)
+
+    pairs = []
+    for s, song in enumerate(songs):
+        lo = bisect_left(durations, song.length - tolerance)
+        hi = bisect_right(durations, song.length + tolerance)
+        if lo >= hi:
+            continue
+        scores = audio_scores(song.length, duration_array[lo:hi], song.bpm if tempo else None, bpm_array[lo:hi])
+        best = np.argsort(-scores, kind='stable')[:k]
+        pairs.extend((float(scores[p]), s, int(order[lo + p])) for p in best if scores[p] > 0)
+    return pairs
+
+def pair_songs(songs, audio_files, tolerance=PAIR_TOLERANCE, k=PAIR_CANDIDATES, tempo=False):
+    """为曲目和音频做一一配对，返回与 songs 对应的 (音频下标, 匹配度) 列表，未配对的曲目为 None
+
+    在候选配对中按匹配度从高到低贪心选取，曲目和音频都只使用一次。
+    同分时先配对曲目名和文件顺序靠前的，结果是确定的。
+    """
+    pairs = candidate_pairs(songs, audio_files, tolerance, k, tempo)
+    pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+    result = [None] * len(songs)
+    used = set()
+    for score, s, a in pairs:
+        if result[s] is None and a not in used:
+            result[s] = (a, score)
+            used.add(a)
+    return result
+
+def pairing_rows(songs, audio_files, pairs):
+    """生成配对报告的行：先列出全部曲目（未配对的音频字段为空），再列出没有配对的音频"""
+    rows = []
+    for song, pair in zip(songs, pairs):
+        row = {
+            "song": song.name,
+            "charts": ";".join(os.path.basename(chart.fileName) for chart in song.charts),
+            "length": song.length,
+            "bpm": song.bpm,
+        }
+        if pair is not None:
+            audio = audio_files[pair[0]]
+            row.update({
+                "audio": audio.fileName,
+                "duration": audio.duration,
+                "audio_bpm": getattr(audio, 'bpm', None),
+                "score": round(pair[1], 4),
+                "match": round(pair[1] / 10, 4),
+            })
+        rows.append(row)
+    used = {pair[0] for pair in pairs if pair is not None}
+    for i, audio in enumerate(audio_files):
+        if i not in used:
+            rows.append({"audio": audio.fileName, "duration": audio.duration, "audio_bpm": getattr(audio, 'bpm', None)})
+    return rows
+
+def write_pairing_report(rows, out):
+    """把配对结果写成 CSV"""
+    writer = csv.DictWriter(out, fieldnames=PAIR_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
@@ -0,0 +1,113 @@
+import mmap
+
+from .containers import WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM, wav_format
+from .startup import lazy_import
+
+np = lazy_import("numpy")
+
+# 逐块转换采样时每块的帧数，决定转换过程中临时占用的内存（与文件大小无关）
+CHUNK_FRAMES = 1 << 16
+
+# 各编码和位深对应的采样数据类型；NumPy 没有 24 位整数，按 3 个字节读取
+_SAMPLE_TYPES = {
+    (WAVE_FORMAT_PCM, 8): "u1",
+    (WAVE_FORMAT_PCM, 16): "<i2",
+    (WAVE_FORMAT_PCM, 24): "u1",
+    (WAVE_FORMAT_PCM, 32): "<i4",
+    (WAVE_FORMAT_IEEE_FLOAT, 32): "<f4",
+    (WAVE_FORMAT_IEEE_FLOAT, 64): "<f8",
+}
+
+class PcmFile:
+    """以内存映射方式打开未压缩的 WAV，data 块直接作为 NumPy 数组访问，不把音频数据复制到内存
+
+    只支持 PCM 和浮点 WAV，其他格式抛出 ValueError。应使用 with 语句打开；
+    关闭时仍被 samples 返回的数组引用的映射会保留到这些数组被释放为止。
+    """
+
+    def __init__(self, audio_path):
+        fmt = wav_format(audio_path)
+        self.format = fmt
+        self.bits = fmt.bits_per_sample
+        if (fmt.format_tag, self.bits) not in _SAMPLE_TYPES:
+            raise ValueError("只支持未压缩的 PCM 或浮点 WAV 文件")
+        if fmt.block_align != self.bits // 8 * fmt.channels:
+            raise ValueError("WAV 块对齐与声道数不符")
+        self.channels = fmt.channels
+        self.sample_rate = fmt.sample_rate
+        self.frames = fmt.data_size // fmt.block_align
+
+        self._file = open(audio_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """关闭内存映射和文件"""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # 仍有数组引用映射，由垃圾回收在数组释放后关闭
+                pass
+            self._mmap = None
+            self._file.close()
+
+    @property
+    def duration(self):
+        return self.frames / self.sample_rate
+
+    @property
+    def samples(self):
+        """data 块的零复制视图，形状为 (帧数, 声道数)；24 位 PCM 为 (帧数, 声道数, 3) 的字节"""
+        dtype = np.dtype(_SAMPLE_TYPES[self.format.format_tag, self.bits])
+        count = self.frames * self.format.block_align // dtype.itemsize
+        view = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=self.format.data_offset)
+        if self.bits == 24:
+            return view.reshape(self.frames, self.channels, 3)
+        return view.reshape(self.frames, self.channels)
+
+    def _to_float(self, block):
+        """把一块原始采样转换为 -1~1 的 float32 单声道"""
+        if self.bits == 24:
+            # 三个字节拼成 32 位整数的高位，再算术右移还原符号
+            block = block.astype(np.int32)
+            block = ((block[..., 0] << 8) | (block[..., 1] << 16) | (block[..., 2] << 24)) >> 8
+        mono = block.mean(axis=1, dtype=np.float32)
+        if self.format.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            return mono
+        if self.bits == 8:
+            return (mono - 128) / 128
+        return mono / (1 << (self.bits - 1))
+
+    def iter_mono(self, start=0, stop=None, chunk_frames=CHUNK_FRAMES):
+        """从 start 帧到 stop 帧逐块产出混合为单声道的 float32 采样，每块 chunk_frames 帧"""
+        samples = self.samples
+        stop = self.frames if stop is None else min(stop, self.frames)
+        for pos in range(start, stop, chunk_frames):
+            yield self._to_float(samples[pos:min(pos + chunk_frames, stop)])
+
+    def mono(self, rate=None, start=0, stop=None):
+        """返回混合为单声道、降采样到不低于 rate 的 float32 采样和实际采样率
+
+        每 step 个采样取平均（简单的低通滤波加抽取），逐块转换，只为输出结果分配内存。
+        """
+        step = max(1, self.sample_rate // rate) if rate else 1
+        stop = self.frames if stop is None else min(stop, self.frames)
+        # 丢弃末尾不足 step 个的采样
+        stop = start + max(0, stop - start) // step * step
+        output = np.empty((stop - start) // step, dtype=np.float32)
+        pos = 0
+        for block in self.iter_mono(start, stop, max(step, CHUNK_FRAMES // step * step)):
+            decimated = block.reshape(-1, step).mean(axis=1) if step > 1 else block
+            output[pos:pos + len(decimated)] = decimated
+            pos += len(decimated)
+        return output, self.sample_rate / step
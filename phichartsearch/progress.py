@@ -0,0 +1,53 @@
+import time
+
+# 默认每秒最多刷新界面的次数
+MAX_UPDATES_PER_SECOND = 10
+
+class ProgressReporter:
+    """限制刷新频率的进度报告，谱面搜索和音频搜索共用
+
+    每处理完一个或一批文件调用一次 update，距上次刷新超过 1 / max_rate 秒或全部完成时才调用
+    callback(百分比, 状态文字)；两次刷新之间的状态消息合并为一条，出错的文件单独计数。
+    """
+
+    def __init__(self, total, callback, max_rate=MAX_UPDATES_PER_SECOND, clock=time.monotonic):
+        self.total = total
+        self.callback = callback
+        self.interval = 1 / max_rate
+        self.clock = clock
+        self.done = 0
+        self.failed = 0
+        self._last_flush = None
+        self._last_name = ""
+        self._pending = 0
+
+    def update(self, name="", count=1, failed=0):
+        """记录完成了 count 个文件（其中 failed 个出错），name 为最后完成的文件名，返回本次是否刷新了界面"""
+        self.done += count
+        self.failed += failed
+        self._pending += count
+        if name:
+            self._last_name = name
+        now = self.clock()
+        if self.done >= self.total or self._last_flush is None or now - self._last_flush >= self.interval:
+            self._last_flush = now
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """立即把当前进度发送给 callback"""
+        self.callback(self.percent(), self.message())
+        self._pending = 0
+
+    def percent(self):
+        return int(self.done / self.total * 100) if self.total else 100
+
+    def message(self):
+        """当前的状态文字，合并上次刷新以来完成的文件"""
+        text = f"{self.done}/{self.total}\t分析完成 {self._last_name}"
+        if self._pending > 1:
+            text += f" 等 {self._pending} 个文件"
+        if self.failed:
+            text += f"，{self.failed} 个文件分析出错"
+        return text
@@ -0,0 +1,115 @@
+import os
+import random
+import string
+
+from .audio import is_audio_file
+
+def generate_random_path():
+    """生成8位随机数字作为Path"""
+    return ''.join(random.choices(string.digits, k=8))
+
+def create_info_txt(project_folder, project_name, composer="PhiChartSearch", charter="PhiChartSearch"):
+    """创建info.txt文件，composer 和 charter 为曲师和谱师的默认值"""
+    path_value = generate_random_path()
+    info_content = f"""#
+Name: {project_name}
+Path: {path_value}
+Chart: {path_value}.json
+Level: 
+Composer: {composer}
+Charter: {charter}
+"""
+    info_path = os.path.join(project_folder, "info.txt")
+    with open(info_path, 'w', encoding='utf-8') as f:
+        f.write(info_content)
+    return path_value
+
+def read_info_txt(project_folder):
+    """读取info.txt文件"""
+    info_path = os.path.join(project_folder, "info.txt")
+    if not os.path.exists(info_path):
+        return None
+    return _parse_info_txt(info_path)
+
+def _parse_info_txt(info_path):
+    project_info = {}
+    with open(info_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if ':' in line and not line.startswith('#'):
+                key, value = line.split(':', 1)
+                project_info[key.strip()] = value.strip()
+    return project_info
+
+def update_info_txt(project_folder, project_info):
+    """更新info.txt文件"""
+    info_content = f"""#
+Name: {project_info['Name']}
+Path: {project_info['Path']}
+Chart: {project_info['Chart']}
+Level: {project_info['Level']}
+Composer: {project_info['Composer']}
+Charter: {project_info['Charter']}
+"""
+    info_path = os.path.join(project_folder, "info.txt")
+    with open(info_path, 'w', encoding='utf-8') as f:
+        f.write(info_content)
+
+def scan_project_folder(project_folder):
+    """只读取一次工程文件夹，返回工程信息和谱面、音频、曲绘文件的状态，不是工程时返回 None
+
+    文件类型直接取自目录项，不需要对每个文件单独 stat。返回的 chart、audio、art 为文件名，文件不存在时为 None。
+    """
+    files = {}
+    audio_file = None
+    with os.scandir(project_folder) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            # Windows 下文件名不区分大小写，与 os.path.exists 的判断保持一致
+            files[os.path.normcase(entry.name)] = entry.name
+            if audio_file is None and is_audio_file(entry.name):
+                audio_file = entry.name
+    if "info.txt" not in files:
+        return None
+    project_info = _parse_info_txt(os.path.join(project_folder, files["info.txt"]))
+    if not project_info:
+        return None
+
+    chart_file = project_info.get('Chart', '')
+    art_file = f"{project_info['Path']}.png" if project_info.get('Path') else ''
+    chart_file = files.get(os.path.normcase(chart_file)) if chart_file else None
+    art_file = files.get(os.path.normcase(art_file)) if art_file else None
+    return {
+        'info': project_info,
+        'chart': chart_file,
+        'audio': audio_file,
+        'art': art_file,
+        'complete': all([chart_file, audio_file, art_file])
+    }
+
+def load_project(program_folder, name):
+    """读取程序文件夹中的单个工程，不是工程文件夹或已被删除时返回 None"""
+    item_path = os.path.join(program_folder, name)
+    try:
+        project = scan_project_folder(item_path)
+    except (OSError, UnicodeDecodeError):
+        # 不是文件夹、读取过程中工程被删除或 info.txt 正在写入
+        return None
+    if project is None:
+        return None
+    return {'name': name, 'folder': item_path, **project}
+
+def scan_projects(program_folder):
+    """扫描程序文件夹中的所有工程"""
+    projects = []
+    if not program_folder or not os.path.exists(program_folder):
+        return projects
+    
+    with os.scandir(program_folder) as entries:
+        names = [entry.name for entry in entries if entry.is_dir()]
+    for name in names:
+        project = load_project(program_folder, name)
+        if project:
+            projects.append(project)
+    return projects
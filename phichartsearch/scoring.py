@@ -0,0 +1,231 @@
+import heapq
+from bisect import bisect_left, bisect_right
+
+from .startup import lazy_import
+
+# numpy 导入较慢，只在第一次计算匹配度时加载
+np = lazy_import("numpy")
+
+# 默认最多保留的结果数量和每页显示的数量
+RESULT_LIMIT = 1000
+PAGE_SIZE = 50
+
+def top_k_indices(scores, k):
+    """按分数从高到低返回前 k 个下标，同分时保持原有顺序（与稳定排序结果一致）"""
+    n = len(scores)
+    if k >= n:
+        return np.lexsort((np.arange(n), -scores))
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    # 第 k 大的分数，严格高于它的全部入选，与它同分的按下标顺序补足
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    indices = np.concatenate([above, ties])
+    return indices[np.lexsort((indices, -scores[indices]))]
+
+class ChartLibrary:
+    """已分析谱面的列式存储，用于一次性计算全部谱面的匹配度"""
+
+    def __init__(self, charts):
+        self.charts = list(charts)
+        self.objectNumber = np.array([chart.objectNumber for chart in self.charts], dtype=np.float64)
+        self.bpm = np.array([chart.bpm for chart in self.charts], dtype=np.float64)
+        self.audioLength = np.array([chart.audioLength for chart in self.charts], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.charts)
+
+    def score(self, target_number=None, target_bpm=None, target_max_time=None):
+        """计算每个谱面的匹配度，满分30（物量、BPM、时长各10分）"""
+        scores = np.zeros(len(self.charts), dtype=np.float64)
+        if target_number is not None:
+            scores += np.maximum(0, 10 - np.abs(target_number - self.objectNumber))
+        if target_bpm is not None:
+            scores += np.maximum(0, 10 - 0.2 * np.abs(target_bpm - self.bpm))
+        if target_max_time is not None:
+            scores += np.maximum(0, 10 - 0.2 * np.abs(target_max_time - self.audioLength))
+        return scores
+
+    def search(self, target_number=None, target_bpm=None, target_max_time=None, k=10):
+        """返回匹配度最高的 k 个谱面（已写入 sortingScore）"""
+        scores = self.score(target_number, target_bpm, target_max_time)
+        result = []
+        for i in top_k_indices(scores, k):
+            chart = self.charts[i]
+            chart.sortingScore = float(scores[i])
+            result.append(chart)
+        return result
+
+# 时长差多少秒以内的音频匹配度大于 0
+AUDIO_DURATION_WINDOW = 5
+
+def tempo_match(target_bpm, bpm):
+    """节奏吻合程度（0~1），每差1 BPM 减 0.02；BPM 估计常有倍频误差，半速和倍速也视为吻合"""
+    difference = min(abs(target_bpm - bpm * factor) for factor in (0.5, 1, 2))
+    return max(0, 1 - difference * 0.02)
+
+def audio_score(target_duration, duration, target_bpm=None, bpm=None):
+    """音频匹配度，满分10，每差1秒扣2分
+
+    给出目标 BPM 且音频有 BPM 时，再按节奏吻合程度折算，节奏完全不符时只剩一半。
+    """
+    score = max(0, 10 - abs(target_duration - duration) * 2)
+    if target_bpm and bpm:
+        score *= (1 + tempo_match(target_bpm, bpm)) / 2
+    return score
+
+def audio_scores(target_duration, durations, target_bpm=None, bpms=None):
+    """audio_score 的向量版本：一次计算多个音频的匹配度，bpms 中未知的 BPM 用 NaN 表示"""
+    scores = np.maximum(0, 10 - np.abs(target_duration - durations) * 2)
+    if target_bpm and bpms is not None:
+        difference = np.min([np.abs(target_bpm - bpms * factor) for factor in (0.5, 1, 2)], axis=0)
+        match = np.maximum(0, 1 - difference * 0.02)
+        scores = np.where(np.isnan(bpms), scores, scores * (1 + match) / 2)
+    return scores
+
+# 谱面与音频对齐的相关系数达到此值即视为完全吻合（起音检测和谱面都有误差，实际很难接近 1）
+ALIGNED_CORRELATION = 0.25
+
+def alignment_score(score, confidence):
+    """按谱面与音频对齐的置信度折算匹配度，完全对不上时只剩一半"""
+    return score * (1 + min(1, confidence / ALIGNED_CORRELATION)) / 2
+
+def apply_alignment(audio_files, alignments):
+    """把对齐结果 (置信度, 偏移秒数) 写入音频的 alignment 并折算匹配度，返回按新匹配度排序的全部音频
+
+    alignments 对应 audio_files 开头的若干个（通常只对齐排名靠前的候选），其余音频和无法对齐的音频
+    （alignments 中为 None）保持原来的匹配度，一起重新排序；同分时保持原有顺序。
+    """
+    for audio, alignment in zip(audio_files, alignments):
+        audio.alignment = alignment
+        if alignment is not None:
+            audio.sortingScore = alignment_score(audio.sortingScore, alignment[0])
+    return sorted(audio_files, key=lambda audio: -audio.sortingScore)
+
+class AudioLibrary:
+    """按时长排序的音频列表，用二分查找取出时长最接近目标的音频"""
+
+    def __init__(self, audio_files):
+        self.audio_files = list(audio_files)
+        # 按 (时长, 原下标) 排序，durations 与 order 一一对应
+        self.order = sorted(range(len(self.audio_files)), key=lambda i: (self.audio_files[i].duration, i))
+        self.durations = [self.audio_files[i].duration for i in self.order]
+        self.bpms = [getattr(self.audio_files[i], 'bpm', None) for i in self.order]
+
+    def __len__(self):
+        return len(self.audio_files)
+
+    def nearest(self, target_duration, k=10):
+        """返回时长最接近目标的 k 个音频下标，距离相同时保持原有顺序"""
+        durations = self.durations
+        n = len(durations)
+        k = min(k, n)
+        if k <= 0:
+            return []
+        hi = bisect_left(durations, target_duration)
+        lo = hi - 1
+        # 从目标位置向两侧扩展，按距离从近到远取出 k 个
+        picked = []
+        while len(picked) < k:
+            if hi >= n or (lo >= 0 and target_duration - durations[lo] <= durations[hi] - target_duration):
+                picked.append(lo)
+                lo -= 1
+            else:
+                picked.append(hi)
+                hi += 1
+        # 与第 k 个同分的也一并取出，按原下标决定先后，结果与稳定排序一致
+        # （距离略有不同的音频也可能因浮点舍入而同分；0 分的音频不会显示，无需补足）
+        limit = audio_score(target_duration, durations[picked[-1]])
+        if limit > 0:
+            while lo >= 0 and audio_score(target_duration, durations[lo]) == limit:
+                picked.append(lo)
+                lo -= 1
+            while hi < n and audio_score(target_duration, durations[hi]) == limit:
+                picked.append(hi)
+                hi += 1
+        picked.sort(key=lambda p: (-audio_score(target_duration, durations[p]), self.order[p]))
+        return [self.order[p] for p in picked[:k]]
+
+    def best_matches(self, target_duration, target_bpm, k=10):
+        """同时考虑时长和 BPM，返回匹配度最高的 k 个音频下标
+
+        匹配度不会高于只按时长计算的分数，因此只需在时长相差 AUDIO_DURATION_WINDOW 秒以内的音频中比较。
+        """
+        lo = bisect_right(self.durations, target_duration - AUDIO_DURATION_WINDOW)
+        hi = bisect_left(self.durations, target_duration + AUDIO_DURATION_WINDOW)
+        scored = [
+            (-audio_score(target_duration, self.durations[p], target_bpm, self.bpms[p]), self.order[p])
+            for p in range(lo, hi)
+        ]
+        scored.sort()
+        return [i for _, i in scored[:k]]
+
+    def search(self, target_duration, k=10, target_bpm=None):
+        """返回匹配度最高的 k 个音频（已写入 sortingScore），不给出目标 BPM 时只比较时长"""
+        if target_bpm:
+            indices = self.best_matches(target_duration, target_bpm, k)
+        else:
+            indices = self.nearest(target_duration, k)
+        result = []
+        for i in indices:
+            audio = self.audio_files[i]
+            audio.sortingScore = audio_score(target_duration, audio.duration, target_bpm, getattr(audio, 'bpm', None))
+            result.append(audio)
+        return result
+
+class TopK:
+    """逐个加入对象时只保留分数最高的 k 个（小根堆），同分时先加入的排在前面"""
+
+    def __init__(self, k=RESULT_LIMIT):
+        self.k = k
+        self._heap = []
+        self._count = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, score, item):
+        # 序号取负数，同分时先加入的更"大"，不会先被挤出堆
+        entry = (score, -self._count, item)
+        self._count += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        """按分数从高到低返回保留的对象"""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+class ResultPages:
+    """分页读取已按匹配度排序的结果：匹配度只计算一次，加载下一页时从排好的结果中继续取
+
+    匹配度为 0 的结果不显示，但会计入 hidden，在状态栏中说明。
+    """
+
+    def __init__(self, results, page_size=PAGE_SIZE):
+        results = list(results)
+        self.results = [result for result in results if result.sortingScore > 0]
+        self.hidden = len(results) - len(self.results)
+        self.page_size = max(1, page_size)
+        self.shown = 0
+
+    def __len__(self):
+        return len(self.results)
+
+    def has_more(self):
+        return self.shown < len(self.results)
+
+    def next_page(self):
+        """返回下一页的结果"""
+        page = self.results[self.shown:self.shown + self.page_size]
+        self.shown += len(page)
+        return page
+
+    def describe(self):
+        """返回已显示数量的说明文字"""
+        text = f"已显示 {self.shown}/{len(self.results)} 个结果"
+        if self.hidden:
+            text += f"，另有 {self.hidden} 个匹配度为 0 的结果未显示"
+        return text
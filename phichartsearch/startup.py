@@ -0,0 +1,85 @@
+import builtins
+import importlib.util
+import sys
+import time
+from collections import defaultdict
+
+def lazy_import(name):
+    """延迟导入模块：立即返回模块对象，第一次访问其属性时才真正执行导入
+
+    PyInstaller 的静态分析看不到这样导入的模块，第三方包需在构建命令中用 --hidden-import 列出。
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"找不到模块 {name}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+class StartupTimer:
+    """统计程序启动耗时，按顶层包汇总各模块自身的导入耗时（类似 python -X importtime）"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = []
+        self.import_times = defaultdict(float)
+        self._stack = []
+        self._original_import = None
+
+    def begin(self):
+        """开始统计导入耗时，应在导入界面库等大型依赖之前调用"""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level and globals:
+            # 相对导入归入所在的包
+            package = (globals.get('__package__') or '').partition('.')[0]
+        else:
+            package = name.partition('.')[0]
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            # 只记录自身耗时，嵌套导入的耗时记在被导入的包上
+            self.import_times[package] += elapsed - children
+
+    def elapsed(self):
+        """返回从开始统计到现在经过的秒数"""
+        return time.perf_counter() - self.start
+
+    def mark(self, label):
+        """记录启动过程中某个阶段完成的时间点"""
+        self.marks.append((label, self.elapsed()))
+
+    def finish(self, label="启动完成"):
+        """结束统计并恢复原来的导入函数，之后的导入不再计时"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.mark(label)
+
+    def report(self, top=10):
+        """返回启动耗时报告的文本"""
+        lines = [f"{label}：{seconds * 1000:.0f} ms" for label, seconds in self.marks]
+        total = sum(self.import_times.values())
+        if total:
+            lines.append(f"模块导入共 {total * 1000:.0f} ms，其中：")
+            ranked = sorted(self.import_times.items(), key=lambda item: item[1], reverse=True)
+            for package, seconds in ranked[:top]:
+                lines.append(f"    {package}：{seconds * 1000:.1f} ms")
+        return "\n".join(lines)
+
+# 程序全局共用的启动计时器
+timer = StartupTimer()
@@ -0,0 +1,215 @@
+import mmap
+import re
+
+from .jsonbackend import UTF8_BOM
+
+# 解析谱面时只读取以下数据，其余内容直接跳过，不构建 Python 对象
+NOTE_KEYS = (b"notesAbove", b"notesBelow")
+EVENT_KEYS = (b"speedEvents", b"judgeLineMoveEvents", b"judgeLineRotateEvents", b"judgeLineDisappearEvents")
+LINE_KEYS = NOTE_KEYS + EVENT_KEYS
+
+_NUMBER_PATTERN = rb'-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?'
+_WS = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.S)
+_NUMBER = re.compile(_NUMBER_PATTERN)
+_SCALAR = re.compile(_NUMBER_PATTERN + rb'|true|false|null')
+# 不含嵌套容器的对象，note 和事件都是这种结构，可以整体匹配后直接查找所需字段
+_FLAT_OBJECT = re.compile(rb'\{(?:[^\[\]{}"]|"(?:[^"\\]|\\.)*")*\}', re.S)
+# 跳过容器时一次性吞掉括号以外的内容（包括字符串）
+_NON_BRACKET = re.compile(rb'(?:[^\[\]{}"]|"(?:[^"\\]|\\.)*")*', re.S)
+_TIME = re.compile(rb'"time"\s*:\s*(' + _NUMBER_PATTERN + rb')')
+_START_TIME = re.compile(rb'"startTime"\s*:\s*(' + _NUMBER_PATTERN + rb')')
+
+def _error(pos, message):
+    return ValueError(f"{message}（位置 {pos}）")
+
+def _ws(buf, pos):
+    return _WS.match(buf, pos).end()
+
+def _to_number(m, group=0):
+    """按 json 模块的规则把匹配到的数字转换为 int 或 float"""
+    text = m.group(group)
+    if m.group(group + 1) or m.group(group + 2):
+        return float(text)
+    return int(text)
+
+def _number(buf, pos):
+    m = _NUMBER.match(buf, pos)
+    if not m:
+        raise _error(pos, "应为数字")
+    return _to_number(m), m.end()
+
+def _skip_value(buf, pos):
+    """跳过任意 JSON 值，返回其结束位置"""
+    c = buf[pos:pos + 1]
+    if c == b'"':
+        m = _STRING.match(buf, pos)
+        if not m:
+            raise _error(pos, "字符串未结束")
+        return m.end()
+    if c == b'{' or c == b'[':
+        depth = 0
+        while True:
+            c = buf[pos:pos + 1]
+            if c == b'{' or c == b'[':
+                depth += 1
+            elif c == b'}' or c == b']':
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            else:
+                raise _error(pos, "JSON 结构不完整")
+            pos = _NON_BRACKET.match(buf, pos + 1).end()
+    m = _SCALAR.match(buf, pos)
+    if not m:
+        raise _error(pos, "无法识别的值")
+    return m.end()
+
+def _walk_object(buf, pos, handle):
+    """遍历对象的每个键，handle(key, pos) 负责读取或跳过值并返回结束位置"""
+    if buf[pos:pos + 1] != b'{':
+        raise _error(pos, "应为对象")
+    pos = _ws(buf, pos + 1)
+    if buf[pos:pos + 1] == b'}':
+        return pos + 1
+    while True:
+        m = _STRING.match(buf, pos)
+        if not m:
+            raise _error(pos, "应为键名")
+        key = buf[m.start() + 1:m.end() - 1]
+        pos = _ws(buf, m.end())
+        if buf[pos:pos + 1] != b':':
+            raise _error(pos, "应为冒号")
+        pos = _ws(buf, handle(key, _ws(buf, pos + 1)))
+        c = buf[pos:pos + 1]
+        if c == b',':
+            pos = _ws(buf, pos + 1)
+        elif c == b'}':
+            return pos + 1
+        else:
+            raise _error(pos, "对象未正确结束")
+
+def _walk_array(buf, pos, handle):
+    """遍历数组的每个元素，handle(pos) 负责读取或跳过元素并返回结束位置"""
+    if buf[pos:pos + 1] != b'[':
+        raise _error(pos, "应为数组")
+    pos = _ws(buf, pos + 1)
+    if buf[pos:pos + 1] == b']':
+        return pos + 1
+    while True:
+        pos = _ws(buf, handle(pos))
+        c = buf[pos:pos + 1]
+        if c == b',':
+            pos = _ws(buf, pos + 1)
+        elif c == b']':
+            return pos + 1
+        else:
+            raise _error(pos, "数组未正确结束")
+
+def _read_field(buf, pos, key, pattern):
+    """读取对象中的单个数字字段，返回 (值, 结束位置)"""
+    m = _FLAT_OBJECT.match(buf, pos)
+    if m:
+        field = pattern.search(buf, m.start(), m.end())
+        if not field:
+            raise KeyError(key.decode())
+        return _to_number(field, 1), m.end()
+
+    # 含有嵌套结构时逐个键遍历
+    found = []
+    def handle(k, p):
+        if k == key:
+            value, p = _number(buf, p)
+            found.append(value)
+            return p
+        return _skip_value(buf, p)
+    end = _walk_object(buf, pos, handle)
+    if not found:
+        raise KeyError(key.decode())
+    return found[-1], end
+
+def scan_chart(chartFile):
+    """流式扫描谱面文件，返回 (bpm, aboveNumber, belowNumber, keyMaxTime, eventMaxTime)
+
+    文件通过 mmap 映射后直接在字节上匹配，不会构建 note 和事件的对象，
+    字段含义与 analyseJsonChart 完全一致。
+    """
+    with open(chartFile, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return _scan(buf)
+
+def _scan(buf):
+    stats = {
+        'bpm': None,
+        'aboveNumber': 0,
+        'belowNumber': 0,
+        'keyMaxTime': 0,
+        'eventMaxTime': 0,
+        'lines': 0,
+    }
+
+    def handle_note_above(pos):
+        stats['aboveNumber'] += 1
+        time, pos = _read_field(buf, pos, b"time", _TIME)
+        stats['keyMaxTime'] = max(time, stats['keyMaxTime'])
+        return pos
+
+    def handle_note_below(pos):
+        stats['belowNumber'] += 1
+        return _skip_value(buf, pos)
+
+    def handle_event(pos):
+        start_time, pos = _read_field(buf, pos, b"startTime", _START_TIME)
+        stats['eventMaxTime'] = max(start_time, stats['eventMaxTime'])
+        return pos
+
+    def handle_line(pos):
+        seen = set()
+        first_line = stats['lines'] == 0
+
+        def handle_line_key(key, p):
+            seen.add(key)
+            if key == b"bpm" and first_line:
+                stats['bpm'], p = _number(buf, p)
+                return p
+            if key == b"notesAbove":
+                return _walk_array(buf, p, handle_note_above)
+            if key == b"notesBelow":
+                return _walk_array(buf, p, handle_note_below)
+            if key in EVENT_KEYS:
+                return _walk_array(buf, p, handle_event)
+            return _skip_value(buf, p)
+
+        pos = _walk_object(buf, pos, handle_line_key)
+        for key in LINE_KEYS:
+            if key not in seen:
+                raise KeyError(key.decode())
+        if first_line and b"bpm" not in seen:
+            raise KeyError("bpm")
+        stats['lines'] += 1
+        return pos
+
+    found = []
+    def handle_root_key(key, pos):
+        if key == b"judgeLineList":
+            found.append(key)
+            return _walk_array(buf, pos, handle_line)
+        return _skip_value(buf, pos)
+
+    # 与 load_json_file 一样跳过开头的 UTF-8 BOM
+    start = len(UTF8_BOM) if buf[:len(UTF8_BOM)] == UTF8_BOM else 0
+    pos = _ws(buf, _walk_object(buf, _ws(buf, start), handle_root_key))
+    if pos != len(buf):
+        raise _error(pos, "文件末尾存在多余内容")
+    if not found:
+        raise KeyError("judgeLineList")
+    if stats['lines'] == 0:
+        raise IndexError("judgeLineList 为空")
+
+    return (
+        stats['bpm'],
+        stats['aboveNumber'],
+        stats['belowNumber'],
+        stats['keyMaxTime'],
+        stats['eventMaxTime']
+    )
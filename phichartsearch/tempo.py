@@ -0,0 +1,87 @@
+from .pcm import PcmFile
+from .startup import lazy_import
+
+np = lazy_import("numpy")
+
+# 节奏分析的采样率：只关心能量随时间的变化，降采样后计算量小很多
+ANALYSIS_RATE = 11025
+# 最多分析音频开头的秒数，足以覆盖多个小节
+MAX_ANALYSIS_SECONDS = 120
+# 计算起音包络时每帧的采样数和帧移（11025Hz 下帧移约 11.6ms）
+FRAME_SIZE = 512
+HOP_SIZE = 128
+# 每次做 FFT 的帧数，分块计算使内存占用与音频长度无关
+ENVELOPE_BLOCK = 1024
+# 对数压缩的系数（采样已归一化到 -1~1），使响度不同的音频得到相近的包络
+COMPRESSION = 100
+# 估计 BPM 的范围，以及没有明显节奏时偏向的 BPM（自相关在倍数节奏处也有峰值）
+MIN_BPM = 60
+MAX_BPM = 240
+PREFERRED_BPM = 120
+
+def preload():
+    """在当前线程完成 numpy 的延迟导入；Python 3.12 之前延迟导入不是线程安全的，需在启动分析线程前调用"""
+    return np.ndarray
+
+def read_wav_mono(audio_path, rate=ANALYSIS_RATE, max_seconds=MAX_ANALYSIS_SECONDS):
+    """读取 WAV 开头 max_seconds 秒的采样，混合为单声道并降采样到不低于 rate，返回 (采样数组, 实际采样率)
+
+    通过内存映射逐块读取，只支持未压缩的 PCM 和浮点 WAV，其他格式抛出 ValueError。
+    """
+    with PcmFile(audio_path) as pcm:
+        return pcm.mono(rate, stop=int(max_seconds * pcm.sample_rate))
+
+def onset_envelope(samples, rate):
+    """计算起音强度包络（频谱通量：各频段对数幅度增加量之和），返回 (包络, 每秒帧数)"""
+    if len(samples) < FRAME_SIZE:
+        return np.zeros(0, dtype=np.float32), rate / HOP_SIZE
+    # 分帧只是视图，不复制采样
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_SIZE)[::HOP_SIZE]
+    window = np.hanning(FRAME_SIZE).astype(np.float32)
+    envelope = np.zeros(len(frames), dtype=np.float32)
+    previous = None
+    for start in range(0, len(frames), ENVELOPE_BLOCK):
+        spectrum = np.log1p(np.abs(np.fft.rfft(frames[start:start + ENVELOPE_BLOCK] * window, axis=1)) * COMPRESSION)
+        # 每块的第一帧与上一块的最后一帧比较，第一帧的通量为 0
+        stacked = np.concatenate([spectrum[:1] if previous is None else previous, spectrum])
+        envelope[start:start + len(spectrum)] = np.maximum(np.diff(stacked, axis=0), 0).sum(axis=1)
+        previous = spectrum[-1:]
+    # 减去约 0.5 秒内的局部平均，只保留突出的起音
+    width = max(1, int(0.5 * rate / HOP_SIZE))
+    local_mean = np.convolve(envelope, np.ones(width) / width, mode='same')
+    return np.maximum(envelope - local_mean, 0).astype(np.float32), rate / HOP_SIZE
+
+def autocorrelation(signal):
+    """用 FFT 计算信号的自相关（非循环），返回非负延迟部分"""
+    n = len(signal)
+    size = 1 << (2 * n - 1).bit_length()
+    spectrum = np.fft.rfft(signal, size)
+    return np.fft.irfft(spectrum * np.conj(spectrum), size)[:n]
+
+def estimate_bpm(envelope, frame_rate, min_bpm=MIN_BPM, max_bpm=MAX_BPM):
+    """由起音包络的自相关估计 BPM，找不到节奏时返回 None"""
+    min_lag = max(1, int(np.ceil(60 * frame_rate / max_bpm)))
+    max_lag = int(60 * frame_rate / min_bpm)
+    if len(envelope) <= 2 * max_lag or not envelope.any():
+        return None
+    correlation = autocorrelation(envelope - envelope.mean())
+    lags = np.arange(min_lag, max_lag + 1)
+    # 自相关在节拍的整数倍处都有峰值，用以 PREFERRED_BPM 为中心的对数高斯权重选出最可能的一个
+    weights = np.exp(-0.5 * np.log2(60 * frame_rate / lags / PREFERRED_BPM) ** 2)
+    best = int(np.argmax(correlation[lags] * weights)) + min_lag
+    if correlation[best] <= 0:
+        return None
+    # 抛物线插值得到小于一帧的延迟
+    lag = float(best)
+    if min_lag < best < max_lag:
+        left, center, right = correlation[best - 1:best + 2]
+        curvature = left - 2 * center + right
+        if curvature < 0:
+            lag += 0.5 * (left - right) / curvature
+    return float(60 * frame_rate / lag)
+
+def audio_bpm(audio_path):
+    """估计 WAV 音频的 BPM（保留一位小数），找不到节奏时返回 None；不支持的格式抛出 ValueError"""
+    samples, rate = read_wav_mono(audio_path)
+    bpm = estimate_bpm(*onset_envelope(samples, rate))
+    return round(bpm, 1) if bpm is not None else None
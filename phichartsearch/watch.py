@@ -0,0 +1,149 @@
+import os
+import threading
+
+from .project import load_project
+
+# 没有 watchdog 时，后台线程比较工程文件夹修改时间的间隔（秒）
+POLL_INTERVAL = 2.0
+
+def _watchdog_observer(folder, callback):
+    """用 watchdog 监视文件夹，每个变化的路径都会传给 callback；未安装 watchdog 时返回 None"""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            callback(event.src_path)
+            # 重命名事件同时涉及新旧两个路径
+            dest_path = getattr(event, 'dest_path', None)
+            if dest_path:
+                callback(dest_path)
+
+    observer = Observer()
+    observer.daemon = True
+    try:
+        observer.schedule(Handler(), folder, recursive=True)
+        observer.start()
+    except OSError:
+        # 网络驱动器等不支持文件通知的位置改用轮询
+        return None
+    return observer
+
+def _signature(entry):
+    """工程文件夹的变化标记：增删文件会改变文件夹的修改时间，编辑工程信息会改变 info.txt 的修改时间"""
+    try:
+        folder_mtime = entry.stat().st_mtime_ns
+    except OSError:
+        return None
+    try:
+        info_mtime = os.stat(os.path.join(entry.path, "info.txt")).st_mtime_ns
+    except OSError:
+        info_mtime = None
+    return folder_mtime, info_mtime
+
+class ProjectRegistry:
+    """工程列表缓存：在后台监视程序文件夹，刷新时只重新读取发生变化的工程
+
+    安装了 watchdog 时使用系统的文件变化通知（如 inotify），否则由后台线程定时比较各工程文件夹的修改时间。
+    """
+
+    def __init__(self, program_folder, poll_interval=POLL_INTERVAL):
+        self.program_folder = program_folder
+        self.poll_interval = poll_interval
+        self.projects = {}
+        self.backend = None
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._rescan = True
+        self._observer = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """开始在后台监视程序文件夹"""
+        if self.backend or not self.program_folder or not os.path.isdir(self.program_folder):
+            return
+        self._observer = _watchdog_observer(self.program_folder, self._on_path_changed)
+        if self._observer is not None:
+            self.backend = "watchdog"
+        else:
+            self.backend = "polling"
+            # 先记录当前状态，之后的变化都能被比较出来
+            signatures = self._poll_signatures()
+            self._thread = threading.Thread(target=self._poll_loop, args=(signatures,), daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """停止监视"""
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+        self._thread = None
+        self.backend = None
+
+    def mark_dirty(self, name=None):
+        """标记工程需要重新读取，name 为 None 时重新扫描整个程序文件夹"""
+        with self._lock:
+            if name is None:
+                self._rescan = True
+            else:
+                self._dirty.add(name)
+
+    def _on_path_changed(self, path):
+        """把变化的路径归到它所在的工程"""
+        try:
+            relative = os.path.relpath(path, self.program_folder)
+        except ValueError:
+            # Windows 下路径与程序文件夹不在同一个驱动器（如经由链接的工程），不属于任何工程
+            return
+        if relative == os.curdir or relative.startswith(os.pardir):
+            return
+        self.mark_dirty(relative.split(os.sep, 1)[0])
+
+    def _poll_loop(self, signatures):
+        while not self._stop.wait(self.poll_interval):
+            current = self._poll_signatures()
+            for name in signatures.keys() | current.keys():
+                if signatures.get(name) != current.get(name):
+                    self.mark_dirty(name)
+            signatures = current
+
+    def _poll_signatures(self):
+        signatures = {}
+        try:
+            with os.scandir(self.program_folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        signatures[entry.name] = _signature(entry)
+        except OSError:
+            pass
+        return signatures
+
+    def update(self):
+        """重新读取有变化的工程，返回 (新增或变化的工程名列表, 被删除的工程名列表)"""
+        if not self.program_folder:
+            return [], []
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            rescan, self._rescan = self._rescan, False
+        if rescan:
+            try:
+                dirty.update(os.listdir(self.program_folder))
+            except OSError:
+                pass
+            dirty.update(self.projects)
+
+        changed, removed = [], []
+        for name in sorted(dirty):
+            project = load_project(self.program_folder, name)
+            if project is None:
+                if self.projects.pop(name, None) is not None:
+                    removed.append(name)
+            elif project != self.projects.get(name):
+                self.projects[name] = project
+                changed.append(name)
+        return changed, removed
@@ -0,0 +1,40 @@
+from .pcm import CHUNK_FRAMES, PcmFile
+from .startup import lazy_import
+
+np = lazy_import("numpy")
+
+# 波形缩略图的点数，每个点记录一段音频的最小值和最大值
+WAVEFORM_POINTS = 96
+
+def waveform_overview(audio_path, points=WAVEFORM_POINTS):
+    """计算 WAV 的波形缩略图：把音频等分为 points 段，返回各段 (最小值, 最大值) 交替排列的 int8 字节
+
+    采样通过内存映射逐块读取，只支持未压缩的 WAV，其他格式抛出 ValueError。
+    """
+    with PcmFile(audio_path) as pcm:
+        if not pcm.frames:
+            raise ValueError("音频没有采样")
+        bucket = -(-pcm.frames // points)
+        lows = np.zeros(points, dtype=np.float32)
+        highs = np.zeros(points, dtype=np.float32)
+        # 每块包含整数个分段，块内一次求出各段的最值
+        chunk_frames = max(1, CHUNK_FRAMES // bucket) * bucket
+        point = 0
+        for block in pcm.iter_mono(chunk_frames=chunk_frames):
+            count = -(-len(block) // bucket)
+            if len(block) < count * bucket:
+                # 最后一段不足时用该段的最后一个采样补齐，不影响最值
+                block = np.concatenate([block, np.full(count * bucket - len(block), block[-1], dtype=np.float32)])
+            segments = block.reshape(count, bucket)
+            lows[point:point + count] = segments.min(axis=1)
+            highs[point:point + count] = segments.max(axis=1)
+            point += count
+    peaks = np.empty(points * 2, dtype=np.float32)
+    peaks[0::2] = lows
+    peaks[1::2] = highs
+    return np.round(np.clip(peaks, -1, 1) * 127).astype(np.int8).tobytes()
+
+def waveform_peaks(waveform):
+    """把 waveform_overview 返回的字节还原为 [(最小值, 最大值)]，取值范围 -1~1"""
+    values = np.frombuffer(waveform, dtype=np.int8).astype(np.float32) / 127
+    return list(zip(values[0::2].tolist(), values[1::2].tolist()))
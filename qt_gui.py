@@ -0,0 +1,2255 @@
+# -*- coding: utf-8 -*-
+# Qt 版界面，由 QT_ChartAnalyzer.py 启动
+
+from phichartsearch.startup import lazy_import, timer as startup_timer
+startup_timer.begin()
+import sys
+import os
+import json
+import shutil
+import subprocess
+from PyQt5.QtWidgets import *
+from PyQt5.QtCore import *
+from PyQt5.QtGui import *
+from qfluentwidgets import *
+from phichartsearch.align import ALIGN_CANDIDATES, align_audio
+from phichartsearch.art import create_chart_art
+from phichartsearch.chart import PARSER_MODES, analyseJsonChart, parser_description
+from phichartsearch.audio import is_audio_file, iter_batches, scan_audio, scan_waveforms
+from phichartsearch.engine import analyse_charts
+from phichartsearch.fileindex import chart_candidates
+from phichartsearch.index import AudioIndex, ChartIndex
+from phichartsearch.jsonbackend import BACKENDS
+from phichartsearch.progress import ProgressReporter
+from phichartsearch.project import create_info_txt, read_info_txt, update_info_txt
+from phichartsearch.scoring import PAGE_SIZE, RESULT_LIMIT, AudioLibrary, ChartLibrary, ResultPages, TopK, apply_alignment, audio_score
+from phichartsearch.watch import ProjectRegistry
+from phichartsearch.waveform import waveform_peaks
+
+# 只在打包工程时使用，延迟到第一次使用时导入
+zipfile = lazy_import("zipfile")
+
+# 配置文件路径
+CONFIG_FILE = "chart_analyzer_config.json"
+# 程序文件夹配置
+program_folder = ""
+# 谱面分析进程数（0 表示使用全部CPU核心）
+analysis_workers = 0
+# 谱面解析模式（full 完整加载 / stream 流式扫描）
+chart_parser = "full"
+# JSON 解析后端（auto 自动选择已安装的最快后端）
+json_backend = "auto"
+# 搜索结果最多保留的数量和每页显示的数量
+result_limit = RESULT_LIMIT
+page_size = PAGE_SIZE
+# 当前打开的窗口
+current_windows = {
+    'projects': {},  # 工程窗口
+    'charts': {},    # 谱面搜索窗口
+    'audio': {}      # 音频搜索窗口
+}
+
+def load_config():
+    """加载配置文件"""
+    global program_folder, analysis_workers, chart_parser, json_backend, result_limit, page_size
+    try:
+        if os.path.exists(CONFIG_FILE):
+            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+                if 'program_folder' in config and config['program_folder']:
+                    program_folder = config['program_folder']
+                if isinstance(config.get('analysis_workers'), int):
+                    analysis_workers = config['analysis_workers']
+                if config.get('chart_parser') in PARSER_MODES:
+                    chart_parser = config['chart_parser']
+                if config.get('json_backend') in ('auto',) + BACKENDS:
+                    json_backend = config['json_backend']
+                if isinstance(config.get('result_limit'), int) and config['result_limit'] > 0:
+                    result_limit = config['result_limit']
+                if isinstance(config.get('page_size'), int) and config['page_size'] > 0:
+                    page_size = config['page_size']
+                return True
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"加载配置文件失败: {e}")
+    return False
+
+def save_config():
+    """保存配置文件"""
+    try:
+        config = {'program_folder': program_folder, 'analysis_workers': analysis_workers, 'chart_parser': chart_parser, 'json_backend': json_backend, 'result_limit': result_limit, 'page_size': page_size}
+        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+    except IOError as e:
+        print(f"保存配置文件失败: {e}")
+
+class ObjectTableModel(QAbstractTableModel):
+    """显示对象列表的表格模型，单元格文字在显示时才生成，排序和筛选都在模型中完成
+
+    columns 为 (标题, 排序取值函数, 显示文字函数[, 图标函数]) 的列表，图标函数返回单元格中显示的图片；
+    key 用于按键更新或删除单个对象。
+    未按列排序时按 set_objects 传入的顺序（如匹配度排名）显示。
+    """
+    
+    def __init__(self, columns, key=None, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.key = key
+        self.objects = []
+        # 当前显示的对象（已筛选、排序）
+        self.rows = []
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        self.filter_text = ""
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            return column[2](self.rows[index.row()])
+        if role == Qt.DecorationRole and len(column) > 3:
+            return column[3](self.rows[index.row()])
+        return None
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+        
+    def object_at(self, row):
+        """返回第 row 行显示的对象"""
+        return self.rows[row]
+        
+    def refresh(self):
+        """对象的属性在模型外被修改后，重新绘制全部行"""
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, len(self.columns) - 1))
+        
+    def set_objects(self, objects):
+        """替换全部对象"""
+        self.beginResetModel()
+        self.objects = list(objects)
+        self.rows = self.visible_rows()
+        self.endResetModel()
+        
+    def set_filter(self, text):
+        """只显示任意一列包含 text 的行（不区分大小写）"""
+        text = text.strip().lower()
+        if text == self.filter_text:
+            return
+        self.beginResetModel()
+        self.filter_text = text
+        self.rows = self.visible_rows()
+        self.endResetModel()
+        
+    def sort(self, column, order=Qt.AscendingOrder):
+        """按列排序，column 为 -1 时恢复原来的顺序"""
+        self.sort_column = column
+        self.sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self.rows
+        self.rows = self.visible_rows()
+        # 行的位置变化后，让选中的行跟着对象移动
+        positions = {id(obj): row for row, obj in enumerate(self.rows)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(positions[id(old_rows[index.row()])], index.column()) for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+        
+    def append_objects(self, objects):
+        """在末尾追加对象（如加载下一页），按列排序时追加后重新排序"""
+        objects = list(objects)
+        self.objects.extend(objects)
+        rows = self.filtered(objects)
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+            if self.sort_column >= 0:
+                self.sort(self.sort_column, self.sort_order)
+        
+    def put(self, obj):
+        """按 key 新增或替换一个对象"""
+        key = self.key(obj)
+        for i, old in enumerate(self.objects):
+            if self.key(old) == key:
+                self.objects[i] = obj
+                if old in self.rows:
+                    row = self.rows.index(old)
+                    self.rows[row] = obj
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+                break
+        else:
+            self.objects.append(obj)
+            if self.filtered([obj]):
+                row = len(self.rows)
+                self.beginInsertRows(QModelIndex(), row, row)
+                self.rows.append(obj)
+                self.endInsertRows()
+        if self.sort_column >= 0:
+            self.sort(self.sort_column, self.sort_order)
+            
+    def remove(self, key):
+        """按 key 删除对象"""
+        for i, obj in enumerate(self.objects):
+            if self.key(obj) == key:
+                del self.objects[i]
+                if obj in self.rows:
+                    row = self.rows.index(obj)
+                    self.beginRemoveRows(QModelIndex(), row, row)
+                    del self.rows[row]
+                    self.endRemoveRows()
+                return
+                
+    def filtered(self, objects):
+        if not self.filter_text:
+            return list(objects)
+        return [
+            obj for obj in objects
+            if any(self.filter_text in str(column[2](obj)).lower() for column in self.columns)
+        ]
+        
+    def visible_rows(self):
+        """按当前的筛选和排序条件计算要显示的行；排序是稳定的，同值的行保持原来的顺序"""
+        rows = self.filtered(self.objects)
+        if self.sort_column >= 0:
+            rows.sort(key=self.columns[self.sort_column][1], reverse=self.sort_order == Qt.DescendingOrder)
+        return rows
+
+def selected_object(table):
+    """返回表格中选中行对应的对象，没有选中时返回 None"""
+    indexes = table.selectionModel().selectedIndexes()
+    return table.model().object_at(indexes[0].row()) if indexes else None
+
+def format_alignment(audio):
+    """谱面对齐列的内容：相关系数和音频相对谱面的偏移，未对齐时显示 -"""
+    if not audio.alignment:
+        return "-"
+    confidence, offset = audio.alignment
+    return f"{confidence:.2f}（{offset:+.2f}s）"
+
+def waveform_pixmap(waveform, width=96, height=24):
+    """把波形缩略图字节绘制为图片：每个点画一条从最小值到最大值的竖线"""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(Qt.transparent)
+    peaks = waveform_peaks(waveform)
+    painter = QPainter(pixmap)
+    painter.setPen(themeColor())
+    middle = (height - 1) / 2
+    for x, (low, high) in enumerate(peaks):
+        x = int(x * width / len(peaks))
+        painter.drawLine(x, round(middle - high * middle), x, round(middle - low * middle))
+    painter.end()
+    return pixmap
+
+def create_table_view(model):
+    """创建显示 model 的表格，点击表头按列排序"""
+    table = TableView()
+    table.setBorderRadius(8)
+    table.setBorderVisible(True)
+    table.setModel(model)
+    table.setSelectionBehavior(QAbstractItemView.SelectRows)  # 选择整行
+    table.setSelectionMode(QAbstractItemView.SingleSelection)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    # 没有排序列时按模型中原来的顺序（匹配度排名）显示
+    table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+    table.setSortingEnabled(True)
+    return table
+
+def create_page_options(on_changed=None):
+    """创建结果上限和每页数量的输入框，修改后保存到配置文件并调用 on_changed"""
+    layout = QHBoxLayout()
+    limit_spin = SpinBox()
+    limit_spin.setRange(10, 100000)
+    limit_spin.setSingleStep(100)
+    limit_spin.setValue(result_limit)
+    page_spin = SpinBox()
+    page_spin.setRange(10, 1000)
+    page_spin.setSingleStep(10)
+    page_spin.setValue(page_size)
+    layout.addWidget(BodyLabel("结果上限"))
+    layout.addWidget(limit_spin)
+    layout.addWidget(BodyLabel("每页"))
+    layout.addWidget(page_spin)
+    
+    def save_options():
+        global result_limit, page_size
+        result_limit = limit_spin.value()
+        page_size = page_spin.value()
+        save_config()
+        if on_changed is not None:
+            on_changed()
+            
+    limit_spin.valueChanged.connect(save_options)
+    page_spin.valueChanged.connect(save_options)
+    return layout
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.project_registry = None
+        self.initUI()
+        # 定时把后台监视到的工程变化同步到列表
+        self.project_timer = QTimer(self)
+        self.project_timer.setInterval(1000)
+        self.project_timer.timeout.connect(self.update_project_list)
+        self.project_timer.start()
+        self.load_config_and_refresh()
+        
+    def initUI(self):
+        self.setWindowTitle('PhiChartSearch谱面工程管理器')
+        self.setGeometry(100, 100, 1000, 700)  # 扩大主界面尺寸
+        
+        # 创建中心部件和主布局
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        
+        # 标题
+        title_label = TitleLabel('PhiChartSearch谱面工程管理器')
+        main_layout.addWidget(title_label)
+        
+        # 程序文件夹设置
+        folder_group = CardWidget()
+        folder_layout = QVBoxLayout(folder_group)
+        folder_layout.setContentsMargins(20, 20, 20, 20)
+        
+        folder_label = StrongBodyLabel('程序文件夹（所有工程的总存放路径）')
+        folder_layout.addWidget(folder_label)
+        
+        folder_h_layout = QHBoxLayout()
+        self.folder_line_edit = LineEdit()
+        self.folder_line_edit.setPlaceholderText('请选择程序文件夹')
+        folder_h_layout.addWidget(self.folder_line_edit)
+        
+        self.browse_button = PushButton('浏览')
+        self.browse_button.clicked.connect(self.select_program_folder)
+        folder_h_layout.addWidget(self.browse_button)
+        
+        folder_layout.addLayout(folder_h_layout)
+        main_layout.addWidget(folder_group)
+        
+        # 工程列表
+        project_group = CardWidget()
+        project_layout = QVBoxLayout(project_group)
+        project_layout.setContentsMargins(10, 10, 10, 10)
+        
+        project_header_layout = QHBoxLayout()
+        project_label = StrongBodyLabel('工程列表')
+        project_header_layout.addWidget(project_label)
+        project_header_layout.addStretch()
+        self.project_filter_edit = SearchLineEdit()
+        self.project_filter_edit.setPlaceholderText('筛选工程')
+        project_header_layout.addWidget(self.project_filter_edit)
+        project_layout.addLayout(project_header_layout)
+        
+        # 创建表格
+        self.project_model = ObjectTableModel([
+            ('工程名', lambda p: p['name'], lambda p: p['name']),
+            ('谱面名称', lambda p: p['info'].get('Name', ''), lambda p: p['info'].get('Name', '')),
+            ('难度', lambda p: p['info'].get('Level', ''), lambda p: p['info'].get('Level', '')),
+            ('状态', lambda p: p['complete'], lambda p: "完整" if p['complete'] else "不完整"),
+        ], key=lambda p: p['name'], parent=self)
+        self.project_table = create_table_view(self.project_model)
+        self.project_filter_edit.textChanged.connect(self.project_model.set_filter)
+        project_layout.addWidget(self.project_table)
+        
+        main_layout.addWidget(project_group)
+        
+        # 按钮区域
+        button_layout = QHBoxLayout()
+        
+        self.create_button = PrimaryPushButton('创建新工程')
+        self.create_button.clicked.connect(self.create_project)
+        button_layout.addWidget(self.create_button)
+        
+        self.open_button = PushButton('打开工程')
+        self.open_button.clicked.connect(self.open_project_action)
+        button_layout.addWidget(self.open_button)
+        
+        self.delete_button = PushButton('删除工程')
+        self.delete_button.clicked.connect(self.delete_project_action)
+        button_layout.addWidget(self.delete_button)
+        
+        self.refresh_button = PushButton('刷新列表')
+        self.refresh_button.clicked.connect(self.refresh_project_list)
+        button_layout.addWidget(self.refresh_button)
+        
+        # 添加关于按钮
+        self.about_button = PushButton('关于')
+        self.about_button.clicked.connect(self.show_about)
+        button_layout.addWidget(self.about_button)
+        
+        main_layout.addLayout(button_layout)
+        
+        # 状态栏
+        self.status_label = BodyLabel("就绪")
+        main_layout.addWidget(self.status_label)
+        
+    def load_config_and_refresh(self):
+        """加载配置并刷新工程列表"""
+        load_config()
+        if program_folder:
+            self.folder_line_edit.setText(program_folder)
+            self.watch_program_folder()
+            
+    def select_program_folder(self):
+        """选择程序文件夹"""
+        global program_folder
+        folder_path = QFileDialog.getExistingDirectory(self, "选择程序文件夹（所有工程的总存放路径）")
+        if folder_path:
+            program_folder = folder_path
+            self.folder_line_edit.setText(folder_path)
+            save_config()
+            self.watch_program_folder()
+            
+    def watch_program_folder(self):
+        """开始监视程序文件夹并重新加载工程列表"""
+        if self.project_registry is not None:
+            self.project_registry.stop()
+        self.project_model.set_objects([])
+        self.project_registry = ProjectRegistry(program_folder)
+        self.project_registry.start()
+        self.update_project_list()
+        
+    def refresh_project_list(self):
+        """刷新工程列表"""
+        if self.project_registry is None:
+            self.watch_program_folder()
+            return
+        # 重新检查所有工程，只更新有变化的行
+        self.project_registry.mark_dirty()
+        self.update_project_list()
+        
+    def update_project_list(self, project_name=None):
+        """把有变化的工程同步到列表，project_name 指定时立即重新读取该工程"""
+        if self.project_registry is None:
+            return
+        if project_name is not None:
+            self.project_registry.mark_dirty(project_name)
+        changed, removed = self.project_registry.update()
+        for name in removed:
+            self.project_model.remove(name)
+        for name in changed:
+            self.project_model.put(self.project_registry.projects[name])
+            
+    def create_project(self):
+        """创建新工程"""
+        dialog = CreateProjectDialog(self)
+        if dialog.exec_() == QDialog.Accepted:
+            # 获取用户输入的数据
+            project_name = dialog.name_edit.text().strip()
+            level = dialog.level_edit.text().strip()
+            composer = dialog.composer_edit.text().strip()
+            charter = dialog.charter_edit.text().strip()
+            create_art = dialog.create_art_check.isChecked()
+            font_path = dialog.font_edit.text().strip()
+            use_local_art = dialog.use_local_art_check.isChecked()
+            local_art_path = dialog.local_art_edit.text().strip()
+            
+            # 验证必填字段
+            if not project_name:
+                MessageBox("错误", "请填写工程名称！", self).exec_()
+                return
+                
+            if not level:
+                MessageBox("错误", "请填写难度！", self).exec_()
+                return
+            
+            # 检查工程文件夹是否已存在
+            project_folder = os.path.join(program_folder, project_name)
+            if os.path.exists(project_folder):
+                MessageBox("错误", "工程文件夹已存在！", self).exec_()
+                return
+            
+            try:
+                # 创建工程文件夹
+                os.makedirs(project_folder)
+                
+                # 创建info.txt
+                path_value = create_info_txt(project_folder, project_name, "Phigros", "Phigros")
+                
+                # 更新工程信息
+                project_info = read_info_txt(project_folder)
+                project_info['Level'] = level
+                project_info['Composer'] = composer
+                project_info['Charter'] = charter
+                update_info_txt(project_folder, project_info)
+                
+                # 处理曲绘文件
+                art_created = False
+                if use_local_art and local_art_path and os.path.exists(local_art_path):
+                    # 使用本地曲绘文件
+                    try:
+                        target_art_path = os.path.join(project_folder, f"{path_value}.png")
+                        shutil.copy2(local_art_path, target_art_path)
+                        art_created = True
+                    except Exception as e:
+                        MessageBox("警告", f"复制本地曲绘文件失败：{str(e)}", self).exec_()
+                elif create_art:
+                    # 自动生成曲绘
+                    if not font_path:
+                        MessageBox("警告", "未设置曲绘字体，无法生成曲绘！", self).exec_()
+                    elif create_chart_art(project_folder, project_name, level, path_value, font_path):
+                        art_created = True
+                    else:
+                        MessageBox("警告", "曲绘图片创建失败，但工程已创建。", self).exec_()
+                
+                if art_created:
+                    MessageBox("成功", "工程创建成功，曲绘已处理！", self).exec_()
+                else:
+                    MessageBox("成功", "工程创建成功！", self).exec_()
+                
+                self.update_project_list(project_name)
+                
+                # 自动打开新创建的工程
+                self.open_project(project_name)
+                
+            except Exception as e:
+                MessageBox("错误", f"创建工程失败：{str(e)}", self).exec_()
+        
+    def open_project_action(self):
+        """打开选中的工程"""
+        project = selected_object(self.project_table)
+        if project is None:
+            MessageBox("警告", "请先选择要打开的工程！", self).exec_()
+            return
+            
+        self.open_project(project['name'])
+        
+    def open_project(self, project_name):
+        """打开工程管理页面"""
+        project_folder = os.path.join(program_folder, project_name)
+        project_info = read_info_txt(project_folder)
+        
+        if not project_info:
+            MessageBox("错误", "无法读取工程信息！", self).exec_()
+            return
+            
+        # 如果该工程已经打开，则聚焦到该窗口
+        if project_name in current_windows['projects'] and current_windows['projects'][project_name]:
+            current_windows['projects'][project_name].raise_()
+            current_windows['projects'][project_name].activateWindow()
+            return
+            
+        # 创建并显示工程管理窗口
+        project_window = ProjectWindow(project_name, project_folder, project_info, self)
+        current_windows['projects'][project_name] = project_window
+        project_window.show()
+        
+    def delete_project_action(self):
+        """删除选中的工程"""
+        project = selected_object(self.project_table)
+        if project is None:
+            MessageBox("警告", "请先选择要删除的工程！", self).exec_()
+            return
+            
+        project_name = project['name']
+        
+        # 确认删除
+        if not MessageBox("确认删除", f"确定要删除工程 '{project_name}' 吗？\n此操作不可恢复！", self).exec_():
+            return
+            
+        try:
+            project_folder = os.path.join(program_folder, project_name)
+            shutil.rmtree(project_folder)
+            MessageBox("成功", "工程已删除！", self).exec_()
+            self.update_project_list(project_name)
+        except Exception as e:
+            MessageBox("错误", f"删除工程失败：{str(e)}", self).exec_()
+            
+    def show_about(self):
+        """显示关于对话框"""
+        dialog = AboutDialog(self)
+        dialog.exec_()
+
+class CreateProjectDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("创建新工程")
+        self.setFixedSize(450, 700)
+        self.initUI()
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        # 标题
+        title_label = TitleLabel("创建新的谱面工程")
+        layout.addWidget(title_label)
+        
+        # 工程名称
+        name_label = BodyLabel("工程名称/谱面名称（必填）")
+        layout.addWidget(name_label)
+        
+        self.name_edit = LineEdit()
+        self.name_edit.setPlaceholderText("请输入工程名称")
+        layout.addWidget(self.name_edit)
+        
+        # 难度
+        level_label = BodyLabel("难度（必填）")
+        layout.addWidget(level_label)
+        
+        self.level_edit = LineEdit()
+        self.level_edit.setPlaceholderText("请输入难度")
+        layout.addWidget(self.level_edit)
+        
+        # Composer
+        composer_label = BodyLabel("Composer")
+        layout.addWidget(composer_label)
+        
+        self.composer_edit = LineEdit()
+        self.composer_edit.setText("Phigros")
+        layout.addWidget(self.composer_edit)
+        
+        # Charter
+        charter_label = BodyLabel("Charter")
+        layout.addWidget(charter_label)
+        
+        self.charter_edit = LineEdit()
+        self.charter_edit.setText("Phigros")
+        layout.addWidget(self.charter_edit)
+        
+        # 曲绘创建选项
+        art_card = CardWidget()
+        art_layout = QVBoxLayout(art_card)
+        art_layout.setContentsMargins(15, 15, 15, 15)
+        art_layout.setSpacing(10)
+        
+        art_title = StrongBodyLabel("曲绘创建选项")
+        art_layout.addWidget(art_title)
+        
+        # 是否自创建曲绘
+        self.create_art_check = CheckBox("自动生成曲绘")
+        self.create_art_check.stateChanged.connect(self.on_create_art_check_changed)
+        art_layout.addWidget(self.create_art_check)
+        
+        # 字体选择
+        self.font_label = BodyLabel("曲绘字体（可选）")
+        self.font_label.setEnabled(False)
+        art_layout.addWidget(self.font_label)
+        
+        font_layout = QHBoxLayout()
+        self.font_edit = LineEdit()
+        self.font_edit.setPlaceholderText("请选择字体文件")
+        self.font_edit.setEnabled(False)
+        font_layout.addWidget(self.font_edit)
+        
+        self.font_button = PushButton("浏览")
+        self.font_button.clicked.connect(self.browse_font)
+        self.font_button.setEnabled(False)
+        font_layout.addWidget(self.font_button)
+        art_layout.addLayout(font_layout)
+        
+        # 使用本地曲绘文件
+        self.use_local_art_check = CheckBox("使用本地曲绘文件")
+        self.use_local_art_check.stateChanged.connect(self.on_use_local_art_check_changed)
+        art_layout.addWidget(self.use_local_art_check)
+        
+        # 本地曲绘文件选择
+        self.local_art_label = BodyLabel("本地曲绘文件")
+        self.local_art_label.setEnabled(False)
+        art_layout.addWidget(self.local_art_label)
+        
+        local_art_layout = QHBoxLayout()
+        self.local_art_edit = LineEdit()
+        self.local_art_edit.setPlaceholderText("请选择本地曲绘文件")
+        self.local_art_edit.setEnabled(False)
+        local_art_layout.addWidget(self.local_art_edit)
+        
+        self.local_art_button = PushButton("浏览")
+        self.local_art_button.clicked.connect(self.browse_local_art)
+        self.local_art_button.setEnabled(False)
+        local_art_layout.addWidget(self.local_art_button)
+        art_layout.addLayout(local_art_layout)
+        
+        layout.addWidget(art_card)
+        
+        # 按钮
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        
+        self.cancel_button = PushButton("取消")
+        self.cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.cancel_button)
+        
+        self.create_button = PrimaryPushButton("创建工程")
+        self.create_button.clicked.connect(self.accept)
+        button_layout.addWidget(self.create_button)
+        
+        layout.addLayout(button_layout)
+        
+    def on_create_art_check_changed(self, state):
+        """处理自动生成曲绘复选框状态变化"""
+        enabled = state == Qt.Checked
+        self.font_label.setEnabled(enabled)
+        self.font_edit.setEnabled(enabled)
+        self.font_button.setEnabled(enabled)
+        # 如果启用了自动生成曲绘，则禁用使用本地曲绘文件
+        if enabled:
+            self.use_local_art_check.setChecked(False)
+    
+    def on_use_local_art_check_changed(self, state):
+        """处理使用本地曲绘文件复选框状态变化"""
+        enabled = state == Qt.Checked
+        self.local_art_label.setEnabled(enabled)
+        self.local_art_edit.setEnabled(enabled)
+        self.local_art_button.setEnabled(enabled)
+        # 如果启用了使用本地曲绘文件，则禁用自动生成曲绘
+        if enabled:
+            self.create_art_check.setChecked(False)
+    
+    def browse_font(self):
+        """浏览选择字体文件"""
+        font_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择字体文件",
+            "",
+            "字体文件 (*.ttf *.otf *.ttc);;所有文件 (*.*)"
+        )
+        if font_path:
+            self.font_edit.setText(font_path)
+    
+    def browse_local_art(self):
+        """浏览选择本地曲绘文件"""
+        image_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择曲绘文件",
+            "",
+            "图片文件 (*.png *.jpg *.jpeg);;所有文件 (*.*)"
+        )
+        if image_path:
+            self.local_art_edit.setText(image_path)
+
+class ProjectWindow(QMainWindow):
+    def __init__(self, project_name, project_folder, project_info, parent=None):
+        super().__init__(parent)
+        self.project_name = project_name
+        self.project_folder = project_folder
+        self.project_info = project_info
+        self.parent = parent
+        # 连接窗口关闭事件
+        self.setAttribute(Qt.WA_DeleteOnClose, True)
+        self.initUI()
+        
+    def closeEvent(self, event):
+        """窗口关闭事件处理"""
+        # 从当前窗口字典中移除引用
+        if self.project_name in current_windows['projects']:
+            del current_windows['projects'][self.project_name]
+        event.accept()
+        
+    def initUI(self):
+        self.setWindowTitle(f"工程管理 - {self.project_name}")
+        self.setGeometry(100, 100, 800, 600)
+        
+        # 创建中心部件和主布局
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        main_layout.setSpacing(15)
+        
+        # 标题
+        title_label = TitleLabel(f"工程管理 - {self.project_name}")
+        main_layout.addWidget(title_label)
+        
+        # 文件管理区域
+        file_group = CardWidget()
+        file_layout = QVBoxLayout(file_group)
+        file_layout.setContentsMargins(15, 15, 15, 15)
+        file_layout.setSpacing(10)
+        
+        file_title = StrongBodyLabel("文件管理")
+        file_layout.addWidget(file_title)
+        
+        # 定义文件类型
+        file_types = [
+            ("信息", "info.txt", "info"),
+            ("谱面", ".json", "chart"),
+            ("音频", ".wav", "audio"),
+            ("曲绘", ".png", "art")
+        ]
+        
+        self.file_widgets = {}
+        
+        for i, (display_name, extension, file_type) in enumerate(file_types):
+            # 文件类型标签
+            type_layout = QHBoxLayout()
+            type_layout.setSpacing(10)
+            
+            type_label = BodyLabel(display_name)
+            type_label.setFixedWidth(60)  # 设置固定宽度
+            type_layout.addWidget(type_label)
+            
+            # 文件名显示
+            file_name, file_path = self.get_file_info(file_type)
+            status_label = BodyLabel(file_name)
+            status_label.setWordWrap(False)  # 禁止换行
+            status_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)  # 设置大小策略
+            type_layout.addWidget(status_label)
+            
+            # 曲绘预览（仅对曲绘文件类型）
+            if file_type == "art" and file_path and os.path.exists(file_path):
+                # 创建预览标签
+                preview_label = QLabel()
+                preview_label.setFixedSize(80, 45)  # 16:9比例的缩略图
+                preview_label.setAlignment(Qt.AlignCenter)
+                preview_label.setStyleSheet("border: 1px solid gray;")
+                
+                # 加载并缩放图片
+                try:
+                    pixmap = QPixmap(file_path)
+                    pixmap = pixmap.scaled(80, 45, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    preview_label.setPixmap(pixmap)
+                except Exception as e:
+                    preview_label.setText("预览失败")
+                
+                type_layout.addWidget(preview_label)
+            
+            # 按钮框架
+            button_layout = QHBoxLayout()
+            button_layout.setSpacing(5)
+            button_layout.setContentsMargins(0, 0, 0, 0)
+            
+            modify_button = PushButton("修改")
+            modify_button.setFixedWidth(60)  # 设置固定宽度
+            modify_button.clicked.connect(lambda _, ft=file_type: self.modify_file(ft))
+            button_layout.addWidget(modify_button)
+            
+            delete_button = PushButton("删除")
+            delete_button.setFixedWidth(60)  # 设置固定宽度
+            delete_button.clicked.connect(lambda _, ft=file_type: self.delete_file(ft))
+            button_layout.addWidget(delete_button)
+            
+            type_layout.addLayout(button_layout)
+            file_layout.addLayout(type_layout)
+            
+            self.file_widgets[file_type] = {
+                'status_label': status_label,
+                'file_path': file_path,
+                'file_name': file_name
+            }
+        
+        main_layout.addWidget(file_group)
+        
+        # 按钮区域
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(10)
+        
+        self.open_folder_button = PushButton("打开工程文件夹")
+        self.open_folder_button.setFixedWidth(120)
+        self.open_folder_button.clicked.connect(self.open_project_folder)
+        button_layout.addWidget(self.open_folder_button)
+        
+        self.pack_button = PrimaryPushButton("一键打包zip")
+        self.pack_button.setFixedWidth(120)
+        self.pack_button.clicked.connect(self.pack_project)
+        button_layout.addWidget(self.pack_button)
+        
+        # 添加弹性空间
+        button_layout.addStretch()
+        
+        main_layout.addLayout(button_layout)
+        
+        # 设置主布局的边距
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        
+    def get_file_info(self, file_type):
+        """获取文件信息"""
+        if file_type == "info":
+            file_path = os.path.join(self.project_folder, "info.txt")
+            file_name = "info.txt"
+        elif file_type == "chart":
+            chart_file = self.project_info.get("Chart", "")
+            # 检查文件是否实际存在
+            if chart_file and os.path.exists(os.path.join(self.project_folder, chart_file)):
+                file_path = os.path.join(self.project_folder, chart_file)
+                file_name = chart_file
+            else:
+                file_path = ""
+                file_name = "未设置"
+        elif file_type == "audio":
+            # 查找音频文件
+            audio_file = None
+            for f in os.listdir(self.project_folder) if os.path.exists(self.project_folder) else []:
+                if is_audio_file(f):
+                    audio_file = f
+                    break
+            file_path = os.path.join(self.project_folder, audio_file) if audio_file else ""
+            file_name = audio_file if audio_file else "未设置"
+        else:  # art
+            art_file = f"{self.project_info.get('Path', '')}.png"
+            file_path = os.path.join(self.project_folder, art_file) if self.project_info.get('Path') else ""
+            file_name = art_file if self.project_info.get('Path') and os.path.exists(file_path) else "未设置"
+            
+        return file_name, file_path
+        
+    def modify_file(self, file_type):
+        """修改文件"""
+        if file_type == "info":
+            self.modify_info()
+        elif file_type == "chart":
+            self.open_chart_search_window()
+        elif file_type == "audio":
+            self.open_audio_search_window()
+        elif file_type == "art":
+            self.modify_art()
+            
+    def modify_info(self):
+        """修改信息文件"""
+        dialog = ModifyInfoDialog(self.project_info, self)
+        if dialog.exec_() == QDialog.Accepted:
+            # 更新工程信息
+            self.project_info['Level'] = dialog.level_edit.text().strip()
+            self.project_info['Composer'] = dialog.composer_edit.text().strip()
+            self.project_info['Charter'] = dialog.charter_edit.text().strip()
+            update_info_txt(self.project_folder, self.project_info)
+            MessageBox("成功", "工程信息已更新！", self).exec_()
+            # 刷新窗口
+            self.close()
+            self.parent.open_project(self.project_name)
+            
+    def open_chart_search_window(self):
+        """打开谱面搜索窗口"""
+        dialog = ChartSearchWindow(self.project_folder, self.project_info, self.project_name, self.parent, self)
+        dialog.exec_()
+        
+    def open_audio_search_window(self):
+        """打开音频搜索窗口"""
+        dialog = AudioSearchWindow(self.project_folder, self.project_info, self.project_name, self.parent, self)
+        dialog.exec_()
+        
+    def modify_art(self):
+        """修改曲绘文件"""
+        dialog = ModifyArtDialog(self.project_folder, self.project_info, self.project_name, self)
+        if dialog.exec_() == QDialog.Accepted:
+            # 刷新窗口
+            self.close()
+            self.parent.open_project(self.project_name)
+        
+    def delete_file(self, file_type):
+        """删除文件"""
+        if file_type == "info":
+            MessageBox("警告", "不能删除信息文件！", self).exec_()
+            return
+            
+        if not MessageBox("确认", "确定要删除这个文件吗？", self).exec_():
+            return
+            
+        try:
+            if file_type == "chart":
+                chart_file = self.project_info.get("Chart", "")
+                if chart_file:
+                    file_path = os.path.join(self.project_folder, chart_file)
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    self.project_info['Chart'] = ""
+                    update_info_txt(self.project_folder, self.project_info)
+            elif file_type == "audio":
+                for f in os.listdir(self.project_folder):
+                    if is_audio_file(f):
+                        os.remove(os.path.join(self.project_folder, f))
+            elif file_type == "art":
+                art_file = f"{self.project_info.get('Path', '')}.png"
+                if self.project_info.get('Path'):
+                    file_path = os.path.join(self.project_folder, art_file)
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+            
+            MessageBox("成功", "文件已删除！", self).exec_()
+            # 刷新窗口
+            self.close()
+            self.parent.open_project(self.project_name)
+        except Exception as e:
+            MessageBox("错误", f"删除文件失败：{str(e)}", self).exec_()
+            
+    def open_project_folder(self):
+        """打开工程文件夹"""
+        try:
+            if os.name == 'nt':  # Windows
+                os.startfile(self.project_folder)
+            elif os.name == 'posix':  # macOS and Linux
+                subprocess.run(['open', self.project_folder])
+        except Exception as e:
+            MessageBox("错误", f"无法打开文件夹：{str(e)}", self).exec_()
+            
+    def pack_project(self):
+        """一键打包工程为zip"""
+        try:
+            zip_filename = f"{self.project_name}.zip"
+            zip_path = os.path.join(self.project_folder, zip_filename)
+            
+            # 定义要打包的核心文件
+            core_files = []
+            
+            # info.txt
+            info_path = os.path.join(self.project_folder, "info.txt")
+            if os.path.exists(info_path):
+                core_files.append(("info.txt", info_path))
+            
+            # 谱面文件
+            if self.project_info.get("Chart"):
+                chart_path = os.path.join(self.project_folder, self.project_info["Chart"])
+                if os.path.exists(chart_path):
+                    core_files.append((self.project_info["Chart"], chart_path))
+            
+            # 音频文件
+            for f in os.listdir(self.project_folder):
+                if is_audio_file(f):
+                    audio_path = os.path.join(self.project_folder, f)
+                    core_files.append((f, audio_path))
+                    break
+            
+            # 曲绘文件
+            if self.project_info.get("Path"):
+                art_file = f"{self.project_info['Path']}.png"
+                art_path = os.path.join(self.project_folder, art_file)
+                if os.path.exists(art_path):
+                    core_files.append((art_file, art_path))
+            
+            if not core_files:
+                MessageBox("警告", "没有找到可打包的文件！", self).exec_()
+                return
+            
+            # 创建zip文件
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                for filename, file_path in core_files:
+                    zipf.write(file_path, filename)
+            
+            MessageBox("成功", f"工程已打包为：{zip_filename}", self).exec_()
+            
+            # 询问是否打开文件夹
+            if MessageBox("打开文件夹", "是否打开工程文件夹查看打包结果？", self).exec_():
+                if os.name == 'nt':  # Windows
+                    os.startfile(self.project_folder)
+                elif os.name == 'posix':  # macOS and Linux
+                    subprocess.run(['open', self.project_folder])
+                    
+        except Exception as e:
+            MessageBox("错误", f"打包失败：{str(e)}", self).exec_()
+
+class ModifyInfoDialog(QDialog):
+    def __init__(self, project_info, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("修改工程信息")
+        self.setFixedSize(400, 300)
+        self.project_info = project_info
+        self.initUI()
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        # 标题
+        title_label = TitleLabel("修改工程信息")
+        layout.addWidget(title_label)
+        
+        # 难度
+        level_label = BodyLabel("难度")
+        layout.addWidget(level_label)
+        
+        self.level_edit = LineEdit()
+        self.level_edit.setText(self.project_info.get("Level", ""))
+        layout.addWidget(self.level_edit)
+        
+        # Composer
+        composer_label = BodyLabel("Composer")
+        layout.addWidget(composer_label)
+        
+        self.composer_edit = LineEdit()
+        self.composer_edit.setText(self.project_info.get("Composer", ""))
+        layout.addWidget(self.composer_edit)
+        
+        # Charter
+        charter_label = BodyLabel("Charter")
+        layout.addWidget(charter_label)
+        
+        self.charter_edit = LineEdit()
+        self.charter_edit.setText(self.project_info.get("Charter", ""))
+        layout.addWidget(self.charter_edit)
+        
+        # 按钮
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        
+        self.cancel_button = PushButton("取消")
+        self.cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.cancel_button)
+        
+        self.save_button = PrimaryPushButton("保存")
+        self.save_button.clicked.connect(self.accept)
+        button_layout.addWidget(self.save_button)
+        
+        layout.addLayout(button_layout)
+
+class ChartSearchWorker(QThread):
+    """谱面搜索后台线程：分析文件夹中的谱面，生成用于匹配的谱面库"""
+    progress = pyqtSignal(int, str)
+    library_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, file_dir, keyword, parent=None):
+        super().__init__(parent)
+        self.file_dir = file_dir
+        self.keyword = keyword
+        
+    def run(self):
+        # SQLite 连接只能在创建它的线程中使用，因此在线程内打开索引
+        index = ChartIndex()
+        try:
+            # 从文件名索引中直接取出符合关键词的谱面
+            chart_files = chart_candidates(self.file_dir, self.keyword)
+            chart_count = len(chart_files)
+            chart_objects_list = []
+            # 限制进度信号的频率，避免界面刷新占用大部分时间
+            reporter = ProgressReporter(chart_count, self.progress.emit)
+            
+            # 分析谱面文件（已索引的文件直接读取，其余文件由进程池并行分析）
+            charts = analyse_charts(chart_files, index, analysis_workers, mode=chart_parser, backend=json_backend)
+            try:
+                for i, (chart_file, chart) in enumerate(charts):
+                    if self.isInterruptionRequested():
+                        return
+                    if chart:
+                        chart_objects_list.append(chart)
+                    reporter.update(os.path.basename(chart_file), failed=0 if chart else 1)
+            finally:
+                charts.close()
+                index.commit()
+                
+            self.library_ready.emit(ChartLibrary(chart_objects_list))
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            index.close()
+
+class ChartSearchWindow(QDialog):
+    def __init__(self, project_folder, project_info, project_name, main_window, parent=None):
+        super().__init__(parent)
+        self.project_folder = project_folder
+        self.project_info = project_info
+        self.project_name = project_name
+        self.main_window = main_window
+        self.parent = parent
+        self.setWindowTitle("谱面搜索")
+        self.setFixedSize(800, 700)  # 调整窗口大小，增加高度
+        self.search_worker = None
+        self.search_cancelled = False
+        # 已分析的谱面库，修改物量、BPM、音频长度时直接在内存中重新排序
+        self.library = None
+        # 当前结果的分页
+        self.result_pages = None
+        self.initUI()
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        # 标题 - 使用较小的字体
+        title_label = SubtitleLabel("谱面搜索")
+        layout.addWidget(title_label)
+        
+        # 谱面文件夹选择
+        folder_label = BodyLabel("谱面文件夹（TextAsset）")
+        layout.addWidget(folder_label)
+        
+        folder_layout = QHBoxLayout()
+        self.folder_edit = LineEdit()
+        self.folder_edit.setPlaceholderText("请选择谱面文件夹")
+        folder_layout.addWidget(self.folder_edit)
+        
+        self.browse_button = PushButton("选取")
+        self.browse_button.clicked.connect(self.select_folder)
+        folder_layout.addWidget(self.browse_button)
+        layout.addLayout(folder_layout)
+        
+        # 筛选条件
+        filter_label = StrongBodyLabel("筛选条件")
+        layout.addWidget(filter_label)
+        
+        filter_layout = QGridLayout()
+        
+        # 关键词
+        keyword_label = BodyLabel("关键词")
+        filter_layout.addWidget(keyword_label, 0, 0)
+        self.keyword_edit = LineEdit()
+        self.keyword_edit.setPlaceholderText("#")
+        filter_layout.addWidget(self.keyword_edit, 0, 1)
+        
+        # 物量
+        number_label = BodyLabel("物量")
+        filter_layout.addWidget(number_label, 0, 2)
+        self.number_edit = LineEdit()
+        filter_layout.addWidget(self.number_edit, 0, 3)
+        
+        # BPM
+        bpm_label = BodyLabel("BPM")
+        filter_layout.addWidget(bpm_label, 1, 0)
+        self.bpm_edit = LineEdit()
+        filter_layout.addWidget(self.bpm_edit, 1, 1)
+        
+        # 音频长度
+        length_label = BodyLabel("音频长度")
+        filter_layout.addWidget(length_label, 1, 2)
+        self.length_edit = LineEdit()
+        filter_layout.addWidget(self.length_edit, 1, 3)
+        
+        # 开始筛选按钮
+        self.search_button = PrimaryPushButton("开始筛选")
+        self.search_button.clicked.connect(self.search_charts)
+        filter_layout.addWidget(self.search_button, 0, 4, 2, 1)
+        
+        # 取消筛选按钮
+        self.cancel_button = PushButton("取消")
+        self.cancel_button.clicked.connect(self.cancel_search)
+        self.cancel_button.setEnabled(False)
+        filter_layout.addWidget(self.cancel_button, 0, 5, 2, 1)
+        
+        layout.addLayout(filter_layout)
+        
+        # 输入停止一段时间后再重新排序，避免每个按键都刷新表格
+        self.rerank_timer = QTimer(self)
+        self.rerank_timer.setSingleShot(True)
+        self.rerank_timer.setInterval(200)
+        self.rerank_timer.timeout.connect(self.rerank)
+        for edit in (self.number_edit, self.bpm_edit, self.length_edit):
+            edit.textChanged.connect(self.on_target_changed)
+        # 文件夹或关键词变化后需要重新分析
+        self.folder_edit.textChanged.connect(self.invalidate_library)
+        self.keyword_edit.textChanged.connect(self.invalidate_library)
+        
+        # 曲目预览区域
+        preview_group = CardWidget()
+        preview_layout = QVBoxLayout(preview_group)
+        preview_layout.setContentsMargins(10, 10, 10, 10)
+        
+        preview_title = StrongBodyLabel("曲目预览")
+        preview_layout.addWidget(preview_title)
+        
+        # 创建一个水平布局来放置曲绘预览和信息
+        preview_h_layout = QHBoxLayout()
+        
+        # 曲绘预览
+        self.preview_label = QLabel()
+        self.preview_label.setFixedSize(160, 90)  # 16:9比例
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setText("暂无预览")
+        self.preview_label.setStyleSheet("border: 1px solid gray;")
+        preview_h_layout.addWidget(self.preview_label)
+        
+        # 曲目信息
+        info_layout = QVBoxLayout()
+        self.chart_name_label = BodyLabel("谱面名称: ")
+        self.composer_label = BodyLabel("作曲者: ")
+        self.charter_label = BodyLabel("谱师: ")
+        self.level_label = BodyLabel("难度: ")
+        info_layout.addWidget(self.chart_name_label)
+        info_layout.addWidget(self.composer_label)
+        info_layout.addWidget(self.charter_label)
+        info_layout.addWidget(self.level_label)
+        preview_h_layout.addLayout(info_layout)
+        
+        preview_layout.addLayout(preview_h_layout)
+        layout.addWidget(preview_group)
+        
+        # 搜索结果
+        result_header_layout = QHBoxLayout()
+        result_label = StrongBodyLabel("搜索结果")
+        result_header_layout.addWidget(result_label)
+        result_header_layout.addStretch()
+        # 结果上限变化后需要重新取结果，每页数量变化只影响之后加载的页
+        result_header_layout.addLayout(create_page_options(self.on_target_changed))
+        self.result_filter_edit = SearchLineEdit()
+        self.result_filter_edit.setPlaceholderText("筛选结果")
+        result_header_layout.addWidget(self.result_filter_edit)
+        layout.addLayout(result_header_layout)
+        
+        # 进度条
+        self.progress_bar = ProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        # 结果表格
+        self.result_model = ObjectTableModel([
+            ('文件路径', lambda chart: chart.fileName, lambda chart: chart.fileName),
+            ('物量', lambda chart: chart.objectNumber, lambda chart: str(chart.objectNumber)),
+            ('BPM', lambda chart: chart.bpm, lambda chart: str(chart.bpm)),
+            ('谱面时长（秒）', lambda chart: chart.audioLength, lambda chart: str(chart.audioLength)),
+            ('匹配度', lambda chart: chart.sortingScore, lambda chart: f"{chart.sortingScore / 30:.2%}"),
+        ], parent=self)
+        self.result_table = create_table_view(self.result_model)
+        self.result_table.selectionModel().selectionChanged.connect(self.on_item_selected)  # 连接选择事件
+        self.result_filter_edit.textChanged.connect(self.result_model.set_filter)
+        layout.addWidget(self.result_table)
+        
+        # 按钮
+        button_layout = QHBoxLayout()
+        
+        self.next_page_button = PushButton("加载下一页")
+        self.next_page_button.clicked.connect(self.load_next_page)
+        self.next_page_button.setEnabled(False)
+        button_layout.addWidget(self.next_page_button)
+        
+        self.add_button = PrimaryPushButton("添加到工程")
+        self.add_button.clicked.connect(self.add_chart)
+        self.add_button.setEnabled(False)
+        button_layout.addWidget(self.add_button)
+        
+        layout.addLayout(button_layout)
+        
+        # 状态栏
+        self.status_label = BodyLabel("就绪")
+        layout.addWidget(self.status_label)
+        
+    def on_item_selected(self):
+        """当选择表格中的项目时更新预览"""
+        chart = selected_object(self.result_table)
+        if chart is None:
+            return
+            
+        # 获取选中行的文件名
+        chart_filename = chart.fileName
+        
+        # 更新曲目信息
+        self.chart_name_label.setText(f"谱面名称: {chart_filename}")
+        self.composer_label.setText(f"作曲者: {self.project_info.get('Composer', '')}")
+        self.charter_label.setText(f"谱师: {self.project_info.get('Charter', '')}")
+        self.level_label.setText(f"难度: {self.project_info.get('Level', '')}")
+        
+        # 尝试加载曲绘预览
+        self.load_chart_preview(chart_filename)
+        
+    def load_chart_preview(self, chart_filename):
+        """加载曲绘预览"""
+        # 从文件名获取路径值（移除.json扩展名）
+        path_value = chart_filename.replace(".json", "")
+        
+        # 构建曲绘文件路径
+        art_file = f"{path_value}.png"
+        art_path = os.path.join(os.path.dirname(self.folder_edit.text()), art_file)
+        
+        # 如果在谱面文件夹中找不到，则尝试在工程文件夹中查找
+        if not os.path.exists(art_path):
+            art_path = os.path.join(self.project_folder, f"{self.project_info.get('Path', '')}.png")
+            
+        # 如果找到了曲绘文件，则加载并显示
+        if os.path.exists(art_path):
+            try:
+                pixmap = QPixmap(art_path)
+                # 缩放图片以适应预览标签
+                pixmap = pixmap.scaled(160, 90, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                self.preview_label.setPixmap(pixmap)
+            except Exception as e:
+                self.preview_label.setText("预览加载失败")
+        else:
+            self.preview_label.setText("暂无预览")
+        
+    def select_folder(self):
+        """选择谱面文件夹"""
+        folder_path = QFileDialog.getExistingDirectory(self, "打开铺面文件夹", self.folder_edit.text())
+        if folder_path:
+            self.folder_edit.setText(folder_path)
+            
+    def parse_targets(self):
+        """解析物量、BPM、音频长度筛选条件，未填写的为 None"""
+        targets = []
+        for edit in (self.number_edit, self.bpm_edit, self.length_edit):
+            text = edit.text().strip()
+            targets.append(int(text) if text else None)
+        return targets
+        
+    def search_charts(self):
+        """搜索谱面"""
+        file_dir = self.folder_edit.text()
+        if not os.path.exists(file_dir):
+            MessageBox("错误", "路径不存在。", self).exec_()
+            return
+            
+        difficulty = self.keyword_edit.text()
+        try:
+            targets = self.parse_targets()
+        except ValueError:
+            MessageBox("错误", "物量、BPM、音频长度必须是整数！", self).exec_()
+            return
+        
+        if all(target is None for target in targets):
+            MessageBox("缺少筛选条件", "请至少填写一个筛选条件！", self).exec_()
+            return
+            
+        # 解析筛选条件
+        if not difficulty:
+            difficulty = "#"
+        
+        # 显示进度条
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText(f"正在分析谱面文件...（{parser_description(chart_parser, json_backend)}）")
+        self.search_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.add_button.setEnabled(False)
+        self.next_page_button.setEnabled(False)
+        self.result_model.set_objects([])
+        self.invalidate_library()
+        
+        # 在后台线程中分析谱面
+        self.search_cancelled = False
+        self.search_worker = ChartSearchWorker(file_dir, difficulty, self)
+        self.search_worker.progress.connect(self.on_search_progress)
+        self.search_worker.library_ready.connect(self.on_library_ready)
+        self.search_worker.failed.connect(self.on_search_failed)
+        self.search_worker.finished.connect(self.on_search_finished)
+        self.search_worker.start()
+        
+    def cancel_search(self):
+        """取消正在进行的搜索"""
+        if self.search_worker is not None:
+            self.search_cancelled = True
+            self.search_worker.requestInterruption()
+            self.cancel_button.setEnabled(False)
+            self.status_label.setText("正在取消搜索...")
+            
+    def on_search_progress(self, progress, text):
+        """更新搜索进度"""
+        self.progress_bar.setValue(progress)
+        self.status_label.setText(text)
+        
+    def on_library_ready(self, library):
+        """谱面分析完成，保存谱面库并计算匹配结果"""
+        self.progress_bar.setValue(100)
+        if len(library) == 0:
+            self.status_label.setText("未找到匹配的谱面文件")
+            return
+        self.library = library
+        self.rerank()
+        
+    def on_target_changed(self):
+        """筛选条件变化时延迟重新排序"""
+        if self.library is not None:
+            self.rerank_timer.start()
+            
+    def invalidate_library(self):
+        """丢弃已分析的谱面库"""
+        self.library = None
+        self.rerank_timer.stop()
+        
+    def rerank(self):
+        """按当前筛选条件对内存中的谱面库重新计算匹配度"""
+        if self.library is None:
+            return
+        try:
+            targets = self.parse_targets()
+        except ValueError:
+            self.status_label.setText("物量、BPM、音频长度必须是整数")
+            return
+        if all(target is None for target in targets):
+            self.result_model.set_objects([])
+            self.add_button.setEnabled(False)
+            self.next_page_button.setEnabled(False)
+            self.status_label.setText("请至少填写一个筛选条件")
+            return
+        self.show_results(self.library.search(*targets, k=result_limit))
+        
+    def show_results(self, sorted_list):
+        """显示匹配结果的第一页"""
+        self.result_pages = ResultPages(sorted_list, page_size)
+        self.result_model.set_objects(self.result_pages.next_page())
+        self.add_button.setEnabled(False)
+        self.next_page_button.setEnabled(self.result_pages.has_more())
+        
+        # 输出结果
+        if len(self.result_pages) == 0:
+            self.status_label.setText("匹配完成。未找到任何匹配项目。")
+        else:
+            self.status_label.setText(f"匹配完成，最佳匹配项为：{sorted_list[0].fileName}（{self.result_pages.describe()}）")
+            # 启用添加按钮
+            self.add_button.setEnabled(True)
+            
+    def load_next_page(self):
+        """从已排好序的结果中继续加载下一页，不重新计算匹配度"""
+        if self.result_pages is None:
+            return
+        self.result_model.append_objects(self.result_pages.next_page())
+        self.next_page_button.setEnabled(self.result_pages.has_more())
+        self.status_label.setText(self.result_pages.describe())
+            
+    def on_search_failed(self, message):
+        """搜索出错"""
+        MessageBox("错误", f"搜索失败：{message}", self).exec_()
+        
+    def on_search_finished(self):
+        """搜索线程结束（完成、出错或取消）"""
+        if self.search_cancelled:
+            self.status_label.setText("搜索已取消")
+        self.search_worker = None
+        self.progress_bar.setVisible(False)
+        self.search_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        
+    def done(self, result):
+        """关闭窗口前停止后台搜索"""
+        if self.search_worker is not None:
+            self.search_worker.requestInterruption()
+            self.search_worker.wait()
+        super().done(result)
+            
+    def add_chart(self):
+        """添加谱面到工程"""
+        chart = selected_object(self.result_table)
+        if chart is None:
+            MessageBox("警告", "请先选择要添加的谱面！", self).exec_()
+            return
+            
+        # 获取选中行的文件名
+        chart_filename = chart.fileName
+        
+        try:
+            # 复制谱面文件到工程文件夹
+            source_path = os.path.join(self.folder_edit.text(), chart_filename)
+            target_filename = f"{self.project_info['Path']}.json"
+            target_path = os.path.join(self.project_folder, target_filename)
+            
+            shutil.copy2(source_path, target_path)
+            
+            # 更新工程信息
+            self.project_info['Chart'] = target_filename
+            update_info_txt(self.project_folder, self.project_info)
+            
+            MessageBox("成功", f"谱面已添加到工程 '{self.project_name}'！", self).exec_()
+            self.accept()  # 关闭对话框
+            # 刷新父窗口
+            self.parent.close()
+            self.main_window.open_project(self.project_name)
+            
+        except Exception as e:
+            MessageBox("错误", f"添加谱面失败：{str(e)}", self).exec_()
+
+class AudioScanWorker(QThread):
+    """音频扫描后台线程：多线程读取音频文件头，分批发送读取到的音频"""
+    progress = pyqtSignal(int, str)
+    batch_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, folder_path, tempo=False, parent=None):
+        super().__init__(parent)
+        self.folder_path = folder_path
+        # 是否估计缓存中尚无 BPM 的音频的节奏
+        self.tempo = tempo
+        
+    def run(self):
+        # SQLite 连接只能在创建它的线程中使用，因此在线程内打开缓存
+        index = AudioIndex()
+        try:
+            audio_paths = [
+                os.path.join(self.folder_path, f) for f in os.listdir(self.folder_path)
+                if is_audio_file(f)
+            ]
+            # 限制刷新频率，两次刷新之间读取到的音频合并成一批发送
+            reporter = ProgressReporter(len(audio_paths), self.progress.emit)
+            audio_objects = []
+            
+            durations = scan_audio(audio_paths, index, tempo=self.tempo)
+            try:
+                for batch in iter_batches(durations):
+                    if self.isInterruptionRequested():
+                        return
+                    failed = 0
+                    for audio_path, duration, bpm in batch:
+                        if duration is None:
+                            failed += 1
+                            continue
+                        audio_file = os.path.basename(audio_path)
+                        # 创建AudioFile对象
+                        audio_objects.append(type('AudioFile', (), {
+                            'file': audio_file,
+                            'fileName': audio_file,
+                            'duration': duration,
+                            'bpm': bpm,
+                            'alignment': None,
+                            'waveform': None,
+                            'sortingScore': 0
+                        })())
+                    if reporter.update(os.path.basename(batch[-1][0]), len(batch), failed):
+                        self.batch_ready.emit(audio_objects)
+                        audio_objects = []
+            finally:
+                durations.close()
+                index.commit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            index.close()
+
+class WaveformWorker(QThread):
+    """波形缩略图后台线程：读取（或从缓存取出）音频的波形，分批发送 [(音频对象, 缩略图字节或 None)]"""
+    batch_ready = pyqtSignal(object)
+    
+    def __init__(self, folder_path, audio_objects, parent=None):
+        super().__init__(parent)
+        self.folder_path = folder_path
+        self.audio_objects = audio_objects
+        
+    def run(self):
+        index = AudioIndex()
+        try:
+            audio_paths = [os.path.join(self.folder_path, audio.fileName) for audio in self.audio_objects]
+            waveforms = scan_waveforms(audio_paths, index)
+            try:
+                position = 0
+                for batch in iter_batches(waveforms, 10):
+                    if self.isInterruptionRequested():
+                        return
+                    objects = self.audio_objects[position:position + len(batch)]
+                    position += len(batch)
+                    self.batch_ready.emit([(audio, waveform) for audio, (_, waveform) in zip(objects, batch)])
+            finally:
+                waveforms.close()
+                index.commit()
+        except Exception as e:
+            print(f"读取波形失败: {e}", file=sys.stderr)
+        finally:
+            index.close()
+
+class AlignWorker(QThread):
+    """谱面对齐后台线程：计算谱面 note 与各候选音频起音的互相关"""
+    aligned = pyqtSignal(object)
+    failed = pyqtSignal(str)
+        
+    def __init__(self, chart_path, audio_paths, parent=None):
+        super().__init__(parent)
+        self.chart_path = chart_path
+        self.audio_paths = audio_paths
+        
+    def run(self):
+        try:
+            alignments = align_audio(self.chart_path, self.audio_paths, json_backend, interrupted=self.isInterruptionRequested)
+            if alignments is not None:
+                self.aligned.emit(alignments)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+class AudioSearchWindow(QDialog):
+    def __init__(self, project_folder, project_info, project_name, main_window, parent=None):
+        super().__init__(parent)
+        self.project_folder = project_folder
+        self.project_info = project_info
+        self.project_name = project_name
+        self.main_window = main_window
+        self.parent = parent
+        self.setWindowTitle("音频搜索")
+        self.setFixedSize(700, 650)
+        self.scan_worker = None
+        self.align_worker = None
+        self.waveform_worker = None
+        # 等待读取波形的音频（波形只为显示出来的结果读取）
+        self.waveform_queue = []
+        self.audio_objects_list = []
+        # 结果所在的文件夹（开始筛选时的文件夹，之后修改输入框不影响当前结果）
+        self.scanned_folder = None
+        # 分析过程中当前的最佳匹配，每批结果只与它合并，不必对全部音频重新排序
+        self.best_audio = []
+        # 分析完成后按时长排序的音频库
+        self.audio_library = None
+        self.target_duration = None
+        self.target_bpm = None
+        # 当前结果的分页
+        self.result_pages = None
+        self.initUI()
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        # 标题
+        title_label = TitleLabel("音频筛选")
+        layout.addWidget(title_label)
+        
+        # 音频文件夹选择
+        folder_label = BodyLabel("音频文件夹（wav/ogg/mp3/flac）")
+        layout.addWidget(folder_label)
+        
+        folder_layout = QHBoxLayout()
+        self.folder_edit = LineEdit()
+        self.folder_edit.setPlaceholderText("请选择音频文件夹")
+        folder_layout.addWidget(self.folder_edit)
+        
+        self.browse_button = PushButton("选取")
+        self.browse_button.clicked.connect(self.select_folder)
+        folder_layout.addWidget(self.browse_button)
+        layout.addLayout(folder_layout)
+        
+        # 音频时长筛选
+        filter_group = CardWidget()
+        filter_layout = QVBoxLayout(filter_group)
+        filter_layout.setContentsMargins(20, 20, 20, 20)
+        
+        filter_title = StrongBodyLabel("筛选条件")
+        filter_layout.addWidget(filter_title)
+        
+        duration_layout = QHBoxLayout()
+        duration_label = BodyLabel("目标音频时长（秒，精确到小数点后两位）")
+        duration_layout.addWidget(duration_label)
+        duration_layout.addStretch()
+        filter_layout.addLayout(duration_layout)
+        
+        input_layout = QHBoxLayout()
+        self.duration_edit = LineEdit()
+        self.duration_edit.setPlaceholderText("请输入目标音频时长")
+        input_layout.addWidget(self.duration_edit)
+        
+        self.search_button = PrimaryPushButton("开始筛选")
+        self.search_button.clicked.connect(self.search_audio)
+        input_layout.addWidget(self.search_button)
+        filter_layout.addLayout(input_layout)
+        
+        # 填写目标 BPM 后才分析 WAV 的节奏（需要读取采样，比只读文件头慢得多），工程谱面的 BPM 只作为提示
+        bpm_layout = QHBoxLayout()
+        bpm_label = BodyLabel("目标 BPM（可选，半速和倍速也视为吻合）")
+        bpm_layout.addWidget(bpm_label)
+        self.bpm_edit = LineEdit()
+        chart_bpm = self.project_chart_bpm()
+        if chart_bpm:
+            self.bpm_edit.setPlaceholderText(f"工程谱面 BPM 为 {chart_bpm:g}，不填写时只按时长匹配")
+        else:
+            self.bpm_edit.setPlaceholderText("不填写时只按时长匹配")
+        bpm_layout.addWidget(self.bpm_edit)
+        filter_layout.addLayout(bpm_layout)
+        
+        layout.addWidget(filter_group)
+        
+        # 搜索结果
+        result_header_layout = QHBoxLayout()
+        result_label = StrongBodyLabel("搜索结果")
+        result_header_layout.addWidget(result_label)
+        result_header_layout.addStretch()
+        result_header_layout.addLayout(create_page_options(self.on_page_options_changed))
+        self.result_filter_edit = SearchLineEdit()
+        self.result_filter_edit.setPlaceholderText("筛选结果")
+        result_header_layout.addWidget(self.result_filter_edit)
+        layout.addLayout(result_header_layout)
+        
+        # 进度条
+        self.progress_bar = ProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        # 结果表格
+        self.result_model = ObjectTableModel([
+            ('文件路径', lambda audio: audio.fileName, lambda audio: audio.fileName),
+            ('波形', lambda audio: 0, lambda audio: "", lambda audio: audio.waveform or None),
+            ('音频时长（秒）', lambda audio: audio.duration, lambda audio: str(audio.duration)),
+            ('BPM', lambda audio: audio.bpm or 0, lambda audio: f"{audio.bpm:g}" if audio.bpm else "-"),
+            ('谱面对齐', lambda audio: audio.alignment[0] if audio.alignment else -1, format_alignment),
+            ('匹配度', lambda audio: audio.sortingScore, lambda audio: f"{audio.sortingScore / 10:.2%}"),
+        ], parent=self)
+        self.result_table = create_table_view(self.result_model)
+        self.result_table.setIconSize(QSize(96, 24))
+        self.result_filter_edit.textChanged.connect(self.result_model.set_filter)
+        layout.addWidget(self.result_table)
+        
+        # 按钮
+        button_layout = QHBoxLayout()
+        
+        self.play_button = PushButton("试听")
+        self.play_button.clicked.connect(self.play_audio)
+        button_layout.addWidget(self.play_button)
+        
+        self.next_page_button = PushButton("加载下一页")
+        self.next_page_button.clicked.connect(self.load_next_page)
+        self.next_page_button.setEnabled(False)
+        button_layout.addWidget(self.next_page_button)
+        
+        self.align_button = PushButton("按谱面对齐")
+        self.align_button.setToolTip(f"将工程谱面的 note 与前 {ALIGN_CANDIDATES} 个结果的起音对齐（仅 WAV）")
+        self.align_button.clicked.connect(self.align_with_chart)
+        self.align_button.setEnabled(False)
+        button_layout.addWidget(self.align_button)
+        
+        self.add_button = PrimaryPushButton("添加到工程")
+        self.add_button.clicked.connect(self.add_audio)
+        self.add_button.setEnabled(False)
+        button_layout.addWidget(self.add_button)
+        
+        layout.addLayout(button_layout)
+        
+        # 状态栏
+        self.status_label = BodyLabel("就绪")
+        layout.addWidget(self.status_label)
+        
+    def project_chart_path(self):
+        """工程中谱面文件的路径，没有谱面时返回 None"""
+        chart_file = self.project_info.get("Chart", "")
+        chart_path = os.path.join(self.project_folder, chart_file)
+        return chart_path if chart_file and os.path.exists(chart_path) else None
+        
+    def project_chart_bpm(self):
+        """读取工程中谱面的 BPM，作为目标 BPM 的默认值；没有谱面时返回 None"""
+        chart_path = self.project_chart_path()
+        if chart_path is None:
+            return None
+        chart = analyseJsonChart(chart_path, chart_parser, json_backend)
+        return chart.bpm if chart is not None else None
+        
+    def select_folder(self):
+        """选择音频文件夹"""
+        folder_path = QFileDialog.getExistingDirectory(self, "选择音频文件夹", self.folder_edit.text())
+        if folder_path:
+            self.folder_edit.setText(folder_path)
+            
+    def search_audio(self):
+        """搜索音频"""
+        folder_path = self.folder_edit.text()
+        if not folder_path or not os.path.exists(folder_path):
+            MessageBox("错误", "请选择有效的音频文件夹！", self).exec_()
+            return
+            
+        target_duration_str = self.duration_edit.text()
+        if not target_duration_str:
+            MessageBox("错误", "请填写目标音频时长！", self).exec_()
+            return
+            
+        try:
+            target_duration = float(target_duration_str)
+        except ValueError:
+            MessageBox("错误", "音频时长必须是数字！", self).exec_()
+            return
+            
+        target_bpm = None
+        if self.bpm_edit.text().strip():
+            try:
+                target_bpm = float(self.bpm_edit.text())
+            except ValueError:
+                MessageBox("错误", "BPM 必须是数字！", self).exec_()
+                return
+            
+        # 显示进度条
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("正在分析音频文件...")
+        self.search_button.setEnabled(False)
+        self.add_button.setEnabled(False)
+        self.next_page_button.setEnabled(False)
+        self.align_button.setEnabled(False)
+        self.result_model.set_objects([])
+        self.waveform_queue = []
+        if self.waveform_worker is not None:
+            # 等上一次的波形线程提交缓存后再开始，否则两个线程的 SQLite 写事务会互相阻塞
+            self.waveform_worker.requestInterruption()
+            self.waveform_worker.wait()
+            self.waveform_worker = None
+        self.audio_objects_list = []
+        self.best_audio = TopK(result_limit)
+        self.audio_library = None
+        self.target_duration = target_duration
+        self.target_bpm = target_bpm
+        self.scanned_folder = folder_path
+        
+        # 在后台线程中分析音频文件，分批刷新结果；给出目标 BPM 时才分析节奏
+        self.scan_worker = AudioScanWorker(folder_path, bool(target_bpm), self)
+        self.scan_worker.progress.connect(self.on_scan_progress)
+        self.scan_worker.batch_ready.connect(self.on_scan_batch)
+        self.scan_worker.failed.connect(self.on_scan_failed)
+        self.scan_worker.finished.connect(self.on_scan_finished)
+        self.scan_worker.start()
+        
+    def on_scan_progress(self, value, message):
+        """更新分析进度"""
+        self.progress_bar.setValue(value)
+        self.status_label.setText(message)
+        
+    def on_scan_batch(self, audio_objects):
+        """收到一批音频后刷新当前的最佳匹配"""
+        self.audio_objects_list.extend(audio_objects)
+        if audio_objects:
+            for audio_obj in audio_objects:
+                audio_obj.sortingScore = audio_score(self.target_duration, audio_obj.duration, self.target_bpm, audio_obj.bpm)
+                self.best_audio.push(audio_obj.sortingScore, audio_obj)
+            self.show_results(self.best_audio.items())
+            
+    def on_scan_failed(self, message):
+        """分析出错"""
+        MessageBox("错误", f"分析音频失败：{message}", self).exec_()
+        
+    def on_scan_finished(self):
+        """分析结束，输出最终匹配结果"""
+        self.scan_worker = None
+        self.progress_bar.setVisible(False)
+        self.search_button.setEnabled(True)
+        if not self.audio_objects_list:
+            self.status_label.setText("未找到匹配的音频文件")
+            return
+        # 按时长排序后用二分查找取出最接近目标时长的音频
+        self.audio_library = AudioLibrary(self.audio_objects_list)
+        self.show_results(self.audio_library.search(self.target_duration, k=result_limit, target_bpm=self.target_bpm), final=True)
+        
+    def on_page_options_changed(self):
+        """结果上限或每页数量变化后，从已分析的音频中重新取结果"""
+        if self.audio_library is not None:
+            for audio in self.audio_objects_list:
+                audio.alignment = None
+            self.show_results(self.audio_library.search(self.target_duration, k=result_limit, target_bpm=self.target_bpm), final=True)
+            
+    def show_results(self, audio_sorted_list, final=False):
+        """显示匹配结果的第一页，final 为 False 时表示分析尚未完成"""
+        self.result_pages = ResultPages(audio_sorted_list, page_size)
+        page = self.result_pages.next_page()
+        self.result_model.set_objects(page)
+        self.next_page_button.setEnabled(final and self.result_pages.has_more())
+        if final:
+            self.load_waveforms(page)
+        
+        # 输出结果
+        if len(self.result_pages) == 0:
+            if final:
+                self.status_label.setText("匹配完成。未找到任何匹配项目。")
+        else:
+            if final:
+                self.status_label.setText(f"匹配完成，最佳匹配项为：{audio_sorted_list[0].fileName}（{self.result_pages.describe()}）")
+            # 启用添加按钮
+            self.add_button.setEnabled(final)
+            self.align_button.setEnabled(final and self.project_chart_path() is not None)
+            
+    def load_next_page(self):
+        """从已排好序的结果中继续加载下一页，不重新计算匹配度"""
+        if self.result_pages is None:
+            return
+        page = self.result_pages.next_page()
+        self.result_model.append_objects(page)
+        self.load_waveforms(page)
+        self.next_page_button.setEnabled(self.result_pages.has_more())
+        self.status_label.setText(self.result_pages.describe())
+        
+    def load_waveforms(self, audio_objects):
+        """在后台读取结果中尚未读取的波形，读取完成后显示在波形列"""
+        self.waveform_queue.extend(
+            audio for audio in audio_objects
+            if audio.waveform is None and audio not in self.waveform_queue
+        )
+        if self.waveform_worker is not None or not self.waveform_queue:
+            return
+        self.waveform_worker = WaveformWorker(self.scanned_folder, self.waveform_queue, self)
+        self.waveform_queue = []
+        self.waveform_worker.batch_ready.connect(self.on_waveforms)
+        self.waveform_worker.finished.connect(self.on_waveforms_finished)
+        self.waveform_worker.start()
+        
+    def on_waveforms(self, batch):
+        """显示一批读取完成的波形；无法读取的音频记为空，不再重复读取"""
+        for audio, waveform in batch:
+            audio.waveform = waveform_pixmap(waveform) if waveform else False
+        self.result_model.refresh()
+        
+    def on_waveforms_finished(self):
+        """继续读取等待中的波形"""
+        if self.sender() is not self.waveform_worker:
+            # 重新筛选时已经结束的旧线程
+            return
+        self.waveform_worker = None
+        self.load_waveforms([])
+            
+    def align_with_chart(self):
+        """把工程谱面与匹配度最高的候选音频对齐，按对齐结果重新计算匹配度"""
+        chart_path = self.project_chart_path()
+        if chart_path is None or not self.result_pages:
+            return
+        results = self.result_pages.results
+        candidates = results[:ALIGN_CANDIDATES]
+        audio_paths = [os.path.join(self.scanned_folder, audio.fileName) for audio in candidates]
+        self.align_button.setEnabled(False)
+        self.search_button.setEnabled(False)
+        self.status_label.setText(f"正在将谱面与前 {len(candidates)} 个候选音频对齐...")
+        
+        self.align_worker = AlignWorker(chart_path, audio_paths, self)
+        self.align_worker.aligned.connect(lambda alignments: self.on_aligned(results, alignments))
+        self.align_worker.failed.connect(self.on_align_failed)
+        self.align_worker.finished.connect(self.on_align_finished)
+        self.align_worker.start()
+        
+    def on_aligned(self, results, alignments):
+        """显示对齐后重新排序的结果，未参与对齐的结果保持原来的匹配度"""
+        self.show_results(apply_alignment(results, alignments), final=True)
+        # 匹配度已按对齐结果折算，不能再次对齐
+        self.align_button.setEnabled(False)
+        aligned = sum(alignment is not None for alignment in alignments)
+        self.status_label.setText(f"已将谱面与 {aligned}/{len(alignments)} 个候选音频对齐（非 WAV 文件保持原匹配度）")
+        
+    def on_align_failed(self, message):
+        """对齐出错"""
+        MessageBox("错误", f"谱面对齐失败：{message}", self).exec_()
+        
+    def on_align_finished(self):
+        self.align_worker = None
+        self.search_button.setEnabled(True)
+        
+    def done(self, result):
+        """关闭窗口前停止后台分析"""
+        if self.scan_worker is not None:
+            self.scan_worker.requestInterruption()
+            self.scan_worker.wait()
+        if self.align_worker is not None:
+            self.align_worker.requestInterruption()
+            self.align_worker.wait()
+        self.waveform_queue = []
+        if self.waveform_worker is not None:
+            self.waveform_worker.requestInterruption()
+            self.waveform_worker.wait()
+        super().done(result)
+        
+    def play_audio(self):
+        """试听音频"""
+        audio_obj = selected_object(self.result_table)
+        if audio_obj is None:
+            MessageBox("警告", "请先选择要试听的音频！", self).exec_()
+            return
+            
+        # 获取选中行的文件名
+        audio_filename = audio_obj.fileName
+        audio_path = os.path.join(self.scanned_folder, audio_filename)
+        
+        try:
+            if os.name == 'nt':  # Windows
+                os.startfile(audio_path)
+            elif os.name == 'posix':  # macOS and Linux
+                subprocess.run(['open', audio_path])
+        except Exception as e:
+            MessageBox("错误", f"无法播放音频：{str(e)}", self).exec_()
+            
+    def add_audio(self):
+        """添加音频到工程"""
+        audio_obj = selected_object(self.result_table)
+        if audio_obj is None:
+            MessageBox("警告", "请先选择要添加的音频！", self).exec_()
+            return
+            
+        # 获取选中行的文件名
+        audio_filename = audio_obj.fileName
+        
+        try:
+            # 删除现有音频文件
+            for f in os.listdir(self.project_folder):
+                if is_audio_file(f):
+                    os.remove(os.path.join(self.project_folder, f))
+            
+            # 复制新文件
+            source_path = os.path.join(self.scanned_folder, audio_filename)
+            shutil.copy2(source_path, self.project_folder)
+            
+            MessageBox("成功", f"音频已添加到工程 '{self.project_name}'！", self).exec_()
+            self.accept()  # 关闭对话框
+            # 刷新父窗口
+            self.parent.close()
+            self.main_window.open_project(self.project_name)
+            
+        except Exception as e:
+            MessageBox("错误", f"添加音频失败：{str(e)}", self).exec_()
+
+class ModifyArtDialog(QDialog):
+    def __init__(self, project_folder, project_info, project_name, parent=None):
+        super().__init__(parent)
+        self.project_folder = project_folder
+        self.project_info = project_info
+        self.project_name = project_name
+        self.parent = parent
+        self.setWindowTitle("修改曲绘")
+        self.setFixedSize(450, 350)
+        self.initUI()
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        # 标题
+        title_label = TitleLabel("修改曲绘")
+        layout.addWidget(title_label)
+        
+        # 字体选择区域
+        font_card = CardWidget()
+        font_layout = QVBoxLayout(font_card)
+        font_layout.setContentsMargins(15, 15, 15, 15)
+        font_layout.setSpacing(10)
+        
+        font_title = StrongBodyLabel("字体选择")
+        font_layout.addWidget(font_title)
+        
+        # 字体选择控件
+        font_select_layout = QHBoxLayout()
+        self.font_edit = LineEdit()
+        self.font_edit.setPlaceholderText("请选择字体文件")
+        font_select_layout.addWidget(self.font_edit)
+        
+        self.font_button = PushButton("浏览")
+        self.font_button.clicked.connect(self.browse_font)
+        font_select_layout.addWidget(self.font_button)
+        font_layout.addLayout(font_select_layout)
+        
+        layout.addWidget(font_card)
+        
+        # 操作按钮区域
+        action_card = CardWidget()
+        action_layout = QVBoxLayout(action_card)
+        action_layout.setContentsMargins(15, 15, 15, 15)
+        action_layout.setSpacing(10)
+        
+        action_title = StrongBodyLabel("操作选项")
+        action_layout.addWidget(action_title)
+        
+        # 重新生成曲绘按钮
+        self.regenerate_button = PrimaryPushButton("重新生成曲绘")
+        self.regenerate_button.clicked.connect(self.regenerate_art)
+        action_layout.addWidget(self.regenerate_button)
+        
+        # 选择本地图片替换按钮
+        self.replace_button = PushButton("选择本地图片替换")
+        self.replace_button.clicked.connect(self.replace_art)
+        action_layout.addWidget(self.replace_button)
+        
+        layout.addWidget(action_card)
+        
+        # 按钮
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        
+        self.cancel_button = PushButton("取消")
+        self.cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.cancel_button)
+        
+        layout.addLayout(button_layout)
+        
+    def browse_font(self):
+        """浏览选择字体文件"""
+        font_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择字体文件",
+            "",
+            "字体文件 (*.ttf *.otf *.ttc);;所有文件 (*.*)"
+        )
+        if font_path:
+            self.font_edit.setText(font_path)
+            
+    def regenerate_art(self):
+        """重新生成曲绘"""
+        font_path = self.font_edit.text().strip()
+            
+        if not font_path:
+            MessageBox("警告", "未设置曲绘字体，无法生成曲绘！", self).exec_()
+        elif create_chart_art(self.project_folder, self.project_info['Name'], self.project_info['Level'], self.project_info['Path'], font_path):
+            MessageBox("成功", "曲绘已重新生成！", self).exec_()
+            self.accept()  # 关闭对话框并刷新父窗口
+        else:
+            MessageBox("错误", "曲绘生成失败！", self).exec_()
+            
+    def replace_art(self):
+        """选择本地图片替换"""
+        image_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择图片文件",
+            "",
+            "图片文件 (*.png *.jpg *.jpeg);;所有文件 (*.*)"
+        )
+        
+        if image_path:
+            try:
+                target_filename = f"{self.project_info['Path']}.png"
+                target_path = os.path.join(self.project_folder, target_filename)
+                shutil.copy2(image_path, target_path)
+                
+                MessageBox("成功", "曲绘已替换！", self).exec_()
+                self.accept()  # 关闭对话框并刷新父窗口
+            except Exception as e:
+                MessageBox("错误", f"替换曲绘失败：{str(e)}", self).exec_()
+
+def main():
+    app = QApplication(sys.argv)
+    # 应用主题
+    setTheme(Theme.LIGHT)
+    
+    # 创建并显示主窗口
+    main_window = MainWindow()
+    startup_timer.mark("主窗口及工程列表加载")
+    # 设置窗口图标
+    # 获取当前脚本所在目录
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    icon_path = os.path.join(script_dir, "icon.ico")
+    if os.path.exists(icon_path):
+        main_window.setWindowIcon(QIcon(icon_path))
+    main_window.show()
+    startup_timer.finish("主窗口显示")
+    
+    sys.exit(app.exec_())
+
+class AboutDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("关于 PhiChartSearch")
+        self.setFixedSize(500, 400)
+        self.initUI()
+        
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        
+        # 标题
+        title_label = TitleLabel("PhiChartSearch")
+        layout.addWidget(title_label)
+        
+        # 版本信息
+        version_label = StrongBodyLabel("版本：v1.0.0")
+        layout.addWidget(version_label)
+        
+        # 技术信息
+        tech_info = BodyLabel("基于 Python 语言\nGUI 界面框架：PyQt5 QFluentWidgets")
+        layout.addWidget(tech_info)
+        
+        # 版权声明标题
+        copyright_title = StrongBodyLabel("版权声明")
+        layout.addWidget(copyright_title)
+        
+        # 版权声明内容
+        copyright_text = "本软件遵循 GPLv3 协议，请遵守开源协议。\n" \
+                         "本项目只用于搜索Phigros的音频文件和谱面文件\n" \
+                         "程序内不包含任何游戏版权保护版权文件\n" \
+                         "请勿传播拆包后文件\n" \
+                         "请勿传播搜索后文件"
+        copyright_label = BodyLabel(copyright_text)
+        layout.addWidget(copyright_label)
+        
+        # 链接按钮区域
+        link_layout = QHBoxLayout()
+        
+        # GitHub按钮
+        self.github_button = PushButton("GitHub")
+        self.github_button.clicked.connect(self.open_github)
+        link_layout.addWidget(self.github_button)
+        
+        # 哔哩哔哩按钮
+        self.bilibili_button = PushButton("哔哩哔哩")
+        self.bilibili_button.clicked.connect(self.open_bilibili)
+        link_layout.addWidget(self.bilibili_button)
+        
+        # 启动耗时按钮
+        self.startup_button = PushButton("启动耗时")
+        self.startup_button.clicked.connect(self.show_startup_report)
+        link_layout.addWidget(self.startup_button)
+        
+        layout.addLayout(link_layout)
+        
+        # 关闭按钮
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        
+        self.close_button = PushButton("关闭")
+        self.close_button.clicked.connect(self.accept)
+        button_layout.addWidget(self.close_button)
+        
+        layout.addLayout(button_layout)
+        
+    def open_github(self):
+        """打开GitHub链接"""
+        QDesktopServices.openUrl(QUrl("https://github.com/catmcbe/PhiChartSearch"))
+        
+    def open_bilibili(self):
+        """打开哔哩哔哩链接"""
+        QDesktopServices.openUrl(QUrl("https://space.bilibili.com/587887115"))
+        
+    def show_startup_report(self):
+        """显示启动耗时统计"""
+        MessageBox("启动耗时", startup_timer.report(), self).exec_()